@@ -0,0 +1 @@
+"""Offline benchmarks for ingestion and search (see benchmarks/README.md)."""
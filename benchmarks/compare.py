@@ -0,0 +1,97 @@
+"""
+Compare two benchmark reports written by run_benchmarks.py.
+
+Usage:
+    python benchmarks/compare.py OLD.json NEW.json [--threshold 0.1]
+
+Prints every shared metric with its relative change and exits with status 1
+if any of them regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Leaf keys where a larger value is better; every other timing/memory key is lower-is-better
+HIGHER_IS_BETTER = ("per_sec",)
+LOWER_IS_BETTER = ("seconds", "mean", "p50", "p95", "p99", "max", "_mb")
+
+# Leaves that describe the run rather than measure it
+IGNORED = ("count", "rows", "rows_added", "documents", "llm_latency_ms", "llm_requests")
+
+
+def flatten(tree: Any, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of a nested report as {"a.b.c": value}."""
+    leaves: Dict[str, float] = {}
+    if isinstance(tree, dict):
+        for key, value in tree.items():
+            leaves.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(tree, (int, float)) and not isinstance(tree, bool):
+        leaves[prefix] = float(tree)
+    return leaves
+
+
+def direction(key: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if the metric is not compared."""
+    leaf = key.rsplit(".", 1)[-1]
+    if leaf in IGNORED:
+        return 0
+    if any(leaf.endswith(suffix) for suffix in HIGHER_IS_BETTER):
+        return 1
+    if any(leaf.endswith(suffix) for suffix in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.1) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compare the scenarios of two reports.
+
+    Args:
+        old: Baseline report
+        new: Candidate report
+        threshold: Relative worsening that counts as a regression (0.1 = 10%)
+
+    Returns:
+        (key, old value, new value, relative change, regressed) for every shared metric
+    """
+    old_values = flatten(old.get("scenarios", {}))
+    new_values = flatten(new.get("scenarios", {}))
+    rows = []
+    for key in sorted(old_values.keys() & new_values.keys()):
+        sign = direction(key)
+        if sign == 0:
+            continue
+        before, after = old_values[key], new_values[key]
+        change = (after - before) / before if before else 0.0
+        rows.append((key, before, after, change, -sign * change > threshold))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the comparison table; exit status 1 on regression."""
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative regression that fails (default 0.1)")
+    args = parser.parse_args(argv)
+
+    old = json.loads(args.old.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    rows = compare(old, new, args.threshold)
+
+    print(f"{'metric':<60} {'old':>12} {'new':>12} {'change':>8}")
+    for key, before, after, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{key:<60} {before:>12.4f} {after:>12.4f} {change:>+7.1%}{flag}")
+
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{old.get('commit', '?')[:10]} -> {new.get('commit', '?')[:10]}: "
+          f"{len(rows)} metrics, {regressions} regressed by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
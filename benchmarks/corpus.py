@@ -0,0 +1,205 @@
+"""
+Synthetic corpus for search benchmarks.
+Expands the real cases/extracted/*_facts.json files to any number of haystack_documents rows.
+
+Rows are deterministic for a given seed and marked with meta.synthetic = true, so they
+can be added incrementally (10k -> 100k -> 1M) and removed without touching real cases.
+Vectors are the real embeddings of the base cases plus small seeded noise, which keeps
+the cluster structure of the real corpus without encoding millions of texts.
+"""
+
+import copy
+import io
+import json
+import logging
+import random
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from benchmarks.fake_openai_server import load_canned_records
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_FILTER = "meta @> '{\"synthetic\": true}'"
+
+# Standard deviation of the per-dimension noise added to base vectors (before re-normalizing)
+VECTOR_NOISE = 0.02
+
+
+def _variant(value: Any, rng: random.Random, pool: Sequence[str]) -> Any:
+    """Occasionally replace a string fact with the same field of another case."""
+    if isinstance(value, str) and pool and rng.random() < 0.3:
+        return rng.choice(pool)
+    return value
+
+
+def field_pools(records: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[str]]:
+    """Every string value of each (tier, field) across the records."""
+    pools: Dict[Tuple[str, str], List[str]] = {}
+    for record in records:
+        for tier, fields in record["facts"].items():
+            if isinstance(fields, dict):
+                for field, value in fields.items():
+                    if isinstance(value, str):
+                        pools.setdefault((tier, field), []).append(value)
+    return pools
+
+
+def synthetic_meta(
+    index: int,
+    records: List[Dict[str, Any]],
+    seed: int = 0,
+    pools: Optional[Dict[Tuple[str, str], List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Build the meta of synthetic row ``index``.
+
+    The row is based on record ``index % len(records)``; about a third of its
+    fact strings are swapped with the same field from other cases of the same
+    tier, so texts (and summaries) differ between rows.
+
+    Args:
+        index: Row number
+        records: Canned records from ``load_canned_records``
+        seed: Corpus seed
+        pools: Output of ``field_pools(records)`` (computed if omitted)
+
+    Returns:
+        meta dict in the shape the ingestion pipeline stores
+    """
+    if pools is None:
+        pools = field_pools(records)
+    rng = random.Random(f"{seed}:{index}")
+    base = records[index % len(records)]
+    facts = copy.deepcopy(base["facts"])
+
+    for tier, fields in facts.items():
+        if not isinstance(fields, dict):
+            continue
+        for field in fields:
+            fields[field] = _variant(fields[field], rng, pools.get((tier, field), []))
+
+    metadata = dict(base["metadata"])
+    metadata["case_title"] = f"{metadata['case_title']} [synthetic {index}]"
+    summary = " ".join(
+        str(value) for tier in facts.values() if isinstance(tier, dict) for value in tier.values() if value
+    )[:1000]
+
+    return {
+        **metadata,
+        "extracted_facts": facts,
+        "facts_summary": summary,
+        "template_id": facts.get("template_id", "legal_case"),
+        "file_hash": f"synthetic-{seed}-{index}",
+        "synthetic": True,
+    }
+
+
+def _copy_field(text: str) -> str:
+    """Escape a value for COPY ... FROM STDIN (text format)."""
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class SyntheticCorpus:
+    """
+    Loads synthetic rows into haystack_documents with COPY.
+
+    Base vectors are computed once with the sentence transformer (the same
+    text builders as ingestion); each row gets a seeded noisy copy of its
+    base case's facts and metadata vectors.
+    """
+
+    def __init__(self, db_pool: Any, model: Any, seed: int = 0, batch_size: int = 5000):
+        """
+        Initialize synthetic corpus.
+
+        Args:
+            db_pool: DatabasePool of the benchmark database
+            model: SentenceTransformer used for the base vectors
+            seed: Corpus seed (same seed, same rows)
+            batch_size: Rows per COPY
+        """
+        self.db_pool = db_pool
+        self.model = model
+        self.seed = seed
+        self.batch_size = batch_size
+        self.records = load_canned_records()
+        self.pools = field_pools(self.records)
+        self._base_vectors: Any = None
+
+    def base_vectors(self) -> Any:
+        """Array of shape (records, 2, dim): facts and metadata embedding of every base record."""
+        if self._base_vectors is None:
+            import numpy as np
+            from pipelines.haystack_custom_nodes import DualEmbedderNode
+
+            texts = [
+                DualEmbedderNode.embedding_texts({**record["metadata"], "extracted_facts": record["facts"]}, "")
+                for record in self.records
+            ]
+            encoded = self.model.encode(
+                [facts for facts, _ in texts] + [metadata for _, metadata in texts],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            count = len(texts)
+            self._base_vectors = np.stack([encoded[:count], encoded[count:]], axis=1)
+        return self._base_vectors
+
+    def count(self) -> int:
+        """Number of synthetic rows currently stored."""
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM haystack_documents WHERE {SYNTHETIC_FILTER}")
+            return cursor.fetchone()[0]
+
+    def rows(self, start: int, stop: int) -> Iterator[str]:
+        """COPY lines (id, content, meta, embedding, embedding_metadata) for rows start..stop-1."""
+        import numpy as np
+
+        base = self.base_vectors()
+        vector_format = "[" + ",".join(["%.6f"] * base.shape[2]) + "]"
+
+        for index in range(start, stop):
+            meta = synthetic_meta(index, self.records, self.seed, self.pools)
+            # Noise seeded per row, so a row is identical however the corpus was grown
+            noise = np.random.default_rng((self.seed, index)).normal(0.0, VECTOR_NOISE, base.shape[1:])
+            vectors = base[index % len(base)] + noise
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            yield "\t".join((
+                meta["file_hash"],
+                _copy_field(meta["facts_summary"]),
+                _copy_field(json.dumps(meta)),
+                vector_format % tuple(vectors[0]),
+                vector_format % tuple(vectors[1]),
+            )) + "\n"
+
+    def grow_to(self, size: int) -> int:
+        """
+        Add synthetic rows until ``size`` exist (rows already loaded are kept).
+
+        Returns:
+            Number of rows added
+        """
+        current = self.count()
+        if current >= size:
+            return 0
+
+        for start in range(current, size, self.batch_size):
+            stop = min(size, start + self.batch_size)
+            buffer = io.StringIO("".join(self.rows(start, stop)))
+            with self.db_pool.cursor() as cursor:
+                cursor.copy_expert(
+                    "COPY haystack_documents (id, content, meta, embedding, embedding_metadata) FROM STDIN",
+                    buffer
+                )
+            logger.info(f"Synthetic corpus: {stop}/{size} rows")
+
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("ANALYZE haystack_documents")
+        return size - current
+
+    def clear(self) -> int:
+        """Delete every synthetic row; returns the number removed."""
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(f"DELETE FROM haystack_documents WHERE {SYNTHETIC_FILTER}")
+            return cursor.rowcount
@@ -0,0 +1,247 @@
+"""
+Local OpenAI-compatible server for offline benchmarks.
+Replays canned metadata/facts JSON built from cases/extracted/*_facts.json with configurable latency.
+
+Usage:
+    python benchmarks/fake_openai_server.py [--port 8099] [--latency-ms 800] [--jitter-ms 200] [--error-rate 0.0]
+
+Point the pipeline at it with OPENAI_BASE_URL=http://127.0.0.1:8099/v1 (any OPENAI_API_KEY works).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FACTS_DIR = REPO_ROOT / "cases" / "extracted"
+
+# Marker of the single-call (metadata + facts) prompt of CombinedExtractorNode
+COMBINED_MARKER = "ADDITIONAL TASK - FACT EXTRACTION"
+FACTS_MARKER = "fact extractor"
+
+
+def load_canned_records(facts_dir: Path = DEFAULT_FACTS_DIR) -> List[Dict[str, Any]]:
+    """
+    Load the extracted facts files as canned (metadata, facts) replies.
+
+    Args:
+        facts_dir: Directory with *_facts.json files
+
+    Returns:
+        List of {"metadata": {...}, "facts": {...}} in file name order
+    """
+    records = []
+    for path in sorted(Path(facts_dir).glob("*_facts.json")):
+        try:
+            facts = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {path.name}: {e}")
+            continue
+        records.append({"metadata": metadata_from_facts(facts, path.stem), "facts": facts})
+
+    if not records:
+        raise FileNotFoundError(f"No *_facts.json files in {facts_dir}")
+    return records
+
+
+def section_from_template(template_id: str) -> str:
+    """'ipc_302' -> 'IPC 302' ('Unknown' for generic templates)."""
+    parts = (template_id or "").split("_", 1)
+    if len(parts) == 2 and parts[0].lower() == "ipc":
+        return f"IPC {parts[1].replace('_', ' ').upper()}"
+    return "Unknown"
+
+
+def metadata_from_facts(facts: Dict[str, Any], fallback_title: str = "Unknown") -> Dict[str, Any]:
+    """Build a metadata reply (the keys of the metadata prompt) from a facts template."""
+    procedural = facts.get("tier_4_procedural") or {}
+    section = section_from_template(facts.get("template_id", ""))
+    return {
+        "case_number": procedural.get("case_number"),
+        "case_title": procedural.get("case_title") or fallback_title.replace("_facts", ""),
+        "court_name": procedural.get("court_name") or "Unknown",
+        "judgment_date": procedural.get("judgment_date") or "Unknown",
+        "appellant_or_petitioner": procedural.get("appellant_or_petitioner"),
+        "respondent": procedural.get("respondent"),
+        "judges_coram": None,
+        "counsel_for_appellant": None,
+        "counsel_for_respondent": None,
+        "sections_invoked": [section] if section != "Unknown" else [],
+        "most_appropriate_section": section,
+        "case_type": "Criminal",
+        "citation": None,
+        "acts_and_sections": section if section != "Unknown" else None,
+    }
+
+
+class FakeOpenAI:
+    """
+    Chooses and times the canned reply for a chat completion request.
+
+    The reply depends only on the prompt (the same document always gets the
+    same record), so runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        latency_ms: float = 800.0,
+        jitter_ms: float = 200.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Initialize the fake backend.
+
+        Args:
+            records: Canned replies from ``load_canned_records``
+            latency_ms: Mean response latency
+            jitter_ms: Uniform +/- jitter around the mean
+            error_rate: Fraction of requests answered with 429 and Retry-After
+            seed: Seed of the latency/error generator
+        """
+        self.records = records
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+            fail = self._random.random() < self.error_rate
+        return delay, fail
+
+    def reply_for(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Return the JSON reply object for a request's messages."""
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        record = self.records[int.from_bytes(digest[:4], "big") % len(self.records)]
+
+        if COMBINED_MARKER in prompt:
+            return {"metadata": record["metadata"], "facts": record["facts"]}
+        if FACTS_MARKER in prompt:
+            return record["facts"]
+        return record["metadata"]
+
+    def complete(self, body: Dict[str, Any]) -> tuple:
+        """
+        Build a chat completion response.
+
+        Returns:
+            (status, payload, headers) after sleeping for the drawn latency
+        """
+        delay, fail = self._draw()
+        time.sleep(delay)
+        if fail:
+            return 429, {"error": {"message": "Rate limit reached (simulated)", "type": "rate_limit_exceeded"}}, {"retry-after-ms": "200"}
+
+        messages = body.get("messages") or []
+        text = json.dumps(self.reply_for(messages))
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+        completion_tokens = len(text) // 4
+        payload = {
+            "id": f"chatcmpl-fake-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        return 200, payload, {}
+
+
+def serve(backend: FakeOpenAI, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve ``backend`` on /v1/chat/completions from a daemon thread.
+
+    Args:
+        backend: FakeOpenAI instance
+        port: TCP port (0 picks a free one)
+        host: Interface to bind
+
+    Returns:
+        The running server (``server_address`` holds the bound port)
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"Unknown path {self.path}"}}, {})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"error": {"message": "Invalid JSON"}}, {})
+                return
+            self._send(*backend.complete(body))
+
+        def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="fake-openai", daemon=True)
+    thread.start()
+    logger.info(f"Fake OpenAI server on http://{host}:{server.server_address[1]}/v1")
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="OpenAI-compatible server replaying canned extraction JSON")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=200.0, help="Uniform +/- jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--facts-dir", type=Path, default=DEFAULT_FACTS_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    backend = FakeOpenAI(load_canned_records(args.facts_dir), args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    server = serve(backend, args.port, args.host)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Offline benchmark suite for ingestion and search.
+
+Runs against a local fake OpenAI server (no API key or network needed) and the
+PostgreSQL database from .env. Use a dedicated database: synthetic rows are marked
+and removed again, but they do share the haystack_documents table while the run lasts.
+
+Scenarios:
+    startup  CLI import time (subprocess) and cold pipeline construction
+    ingest   documents/second through ingest_batch with simulated LLM latency
+    search   vector and full-pipeline search latency at each corpus size
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scenarios startup,ingest,search]
+        [--sizes 10000,100000,1000000] [--ingest-docs 32] [--llm-latency-ms 800]
+        [--queries 200] [--output results.json] [--keep-corpus]
+
+Results are written as JSON (see benchmarks/compare.py to diff two runs).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from benchmarks.fake_openai_server import FakeOpenAI, load_canned_records, serve  # noqa: E402
+from infrastructure.metrics import Histogram  # noqa: E402
+
+logger = logging.getLogger("benchmarks")
+
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Queries run before timing starts (connection setup, plan caching, model warm-up)
+WARMUP_QUERIES = 3
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Count, mean, p50/p95/p99 and max of a list of durations (seconds)."""
+    histogram = Histogram(window=max(1, len(samples)))
+    for sample in samples:
+        histogram.observe(sample)
+    summary = histogram.summary()
+    summary.pop("sum", None)
+    return summary
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_revision() -> Dict[str, Any]:
+    """Commit and dirty flag of the working tree (unknown outside git)."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def configure_environment(workdir: Path, base_url: str) -> None:
+    """
+    Point the pipeline at the fake server and keep every file it writes in ``workdir``.
+
+    Must run before the first Config() is created.
+    """
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["INGEST_JOURNAL_PATH"] = str(workdir / "journal.sqlite3")
+    os.environ["MARKDOWN_OUTPUT_DIR"] = str(workdir / "markdown")
+    os.environ["EXTRACTED_OUTPUT_DIR"] = str(workdir / "extracted")
+    os.environ["DISABLE_LOGGING"] = "true"
+
+
+class Benchmark:
+    """Holds the pipelines and temporary files shared by the scenarios."""
+
+    def __init__(self, workdir: Path, backend: FakeOpenAI, seed: int = 0):
+        self.workdir = workdir
+        self.backend = backend
+        self.seed = seed
+        self.ingestion = None
+        self.similarity = None
+
+    def scenario_startup(self, repeats: int = 3) -> Dict[str, Any]:
+        """CLI import time (fresh interpreter each time) and cold construction of both pipelines."""
+        code = (
+            "import sys, time; sys.path.insert(0, 'src'); start = time.perf_counter(); "
+            "import presentation.cli_app; print(time.perf_counter() - start)"
+        )
+        imports = []
+        for _ in range(repeats):
+            output = subprocess.check_output([sys.executable, "-c", code], cwd=REPO_ROOT, text=True)
+            imports.append(float(output.strip().splitlines()[-1]))
+
+        start = time.perf_counter()
+        self._build_pipelines()
+        build_seconds = time.perf_counter() - start
+
+        return {
+            "cli_import_seconds": summarize(imports),
+            "pipeline_build_seconds": build_seconds,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def _build_pipelines(self) -> None:
+        if self.ingestion is None:
+            from pipelines import HaystackIngestionPipeline, PureHaystackSimilarityPipeline
+
+            self.ingestion = HaystackIngestionPipeline()
+            self.similarity = PureHaystackSimilarityPipeline(self.ingestion)
+
+    def _make_pdfs(self, count: int) -> List[Path]:
+        """Render ``count`` unique PDFs from the cases/markdown texts."""
+        import fitz
+
+        sources = sorted((REPO_ROOT / "cases" / "markdown").glob("*.md"))
+        if not sources:
+            raise FileNotFoundError("No cases/markdown/*.md files to build benchmark PDFs from")
+
+        run_id = f"{time.time_ns():x}"
+        out_dir = self.workdir / "pdfs"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for index in range(count):
+            text = sources[index % len(sources)].read_text(encoding="utf-8", errors="ignore")
+            # A unique first line gives every copy its own hash
+            text = f"Benchmark copy {run_id}-{index}\n\n{text}"
+            doc = fitz.open()
+            for start in range(0, len(text), 3000):
+                page = doc.new_page()
+                page.insert_textbox(fitz.Rect(36, 36, 559, 806), text[start:start + 3000], fontsize=8)
+            path = out_dir / f"bench_{run_id}_{index:05d}.pdf"
+            doc.save(str(path))
+            doc.close()
+            paths.append(path)
+        return paths
+
+    def scenario_ingest(self, documents: int) -> Dict[str, Any]:
+        """Documents/second through the staged batch ingestion (LLM calls answered by the fake server)."""
+        from infrastructure.metrics import MetricsRegistry
+        from utils.helpers import compute_file_hash
+
+        self._build_pipelines()
+        paths = self._make_pdfs(documents)
+        hashes = [compute_file_hash(path) for path in paths]
+
+        metrics = MetricsRegistry()
+        metrics.reset()
+        requests_before = self.backend.requests
+
+        start = time.perf_counter()
+        result = asyncio.run(self.ingestion.ingest_batch(paths))
+        elapsed = time.perf_counter() - start
+
+        snapshot = metrics.snapshot()
+        stages = {
+            entry["labels"]["stage"]: {key: entry[key] for key in ("count", "p50", "p95", "p99")}
+            for entry in snapshot["histograms"] if entry["name"] == "ingest_stage_seconds"
+        }
+        components = {
+            entry["labels"]["component"]: {key: entry[key] for key in ("count", "p50", "p95")}
+            for entry in snapshot["histograms"] if entry["name"] == "component_seconds"
+        }
+
+        with self.ingestion.db_pool.cursor() as cursor:
+            cursor.execute("DELETE FROM haystack_documents WHERE file_hash = ANY(%s)", (hashes,))
+        self.ingestion.duplicate_gate.invalidate(hashes)
+
+        return {
+            "documents": documents,
+            "completed": result.processed,
+            "failed": result.failed,
+            "seconds": elapsed,
+            "docs_per_sec": result.processed / elapsed if elapsed > 0 else 0.0,
+            "llm_requests": self.backend.requests - requests_before,
+            "llm_latency_ms": self.backend.latency_ms,
+            "stages": stages,
+            "components": components,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def scenario_search(self, sizes: Sequence[int], queries: int, pipeline_queries: int, keep_corpus: bool) -> Dict[str, Any]:
+        """Vector-only, full-pipeline and by-document-id search latency at each synthetic corpus size."""
+        import numpy as np
+        from benchmarks.corpus import SyntheticCorpus, VECTOR_NOISE
+
+        self._build_pipelines()
+        pool = self.ingestion.db_pool
+        retriever = self.similarity.retrieval_pipeline.get_component("retriever")
+        corpus = SyntheticCorpus(pool, self.ingestion.dual_embedder.model, seed=self.seed)
+        base = corpus.base_vectors()
+
+        rng = np.random.default_rng(self.seed)
+        vector_queries = []
+        for index in range(queries + WARMUP_QUERIES):
+            vector = base[index % len(base)][0] + rng.normal(0.0, VECTOR_NOISE, base.shape[2])
+            vector_queries.append((vector / np.linalg.norm(vector)).tolist())
+
+        records = load_canned_records()
+        text_queries = [
+            " ".join(str(value) for tier in record["facts"].values() if isinstance(tier, dict) for value in tier.values() if value)
+            for record in random.Random(self.seed).sample(records, len(records))
+        ]
+
+        results = {}
+        try:
+            for size in sorted(sizes):
+                start = time.perf_counter()
+                added = corpus.grow_to(size)
+                load_seconds = time.perf_counter() - start
+
+                vector_samples = []
+                for index, vector in enumerate(vector_queries):
+                    start = time.perf_counter()
+                    retriever.run(query_embedding=vector)
+                    if index >= WARMUP_QUERIES:
+                        vector_samples.append(time.perf_counter() - start)
+
+                pipeline_samples = []
+                for index in range(pipeline_queries + WARMUP_QUERIES):
+                    text = text_queries[index % len(text_queries)]
+                    start = time.perf_counter()
+                    self.similarity.retrieval_pipeline.run({
+                        "text_embedder": {"text": text},
+                        "retriever": {"filters": None},
+                        "ranker": {"query": text}
+                    })
+                    if index >= WARMUP_QUERIES:
+                        pipeline_samples.append(time.perf_counter() - start)
+
+                # "More like this" on a stored case: row load plus retrieval with its stored vector
+                document_samples = []
+                for index in range(pipeline_queries + WARMUP_QUERIES):
+                    document_id = f"synthetic-{self.seed}-{index % size}"
+                    start = time.perf_counter()
+                    asyncio.run(self.similarity.search_by_document_id(document_id))
+                    if index >= WARMUP_QUERIES:
+                        document_samples.append(time.perf_counter() - start)
+
+                results[str(size)] = {
+                    "rows": corpus.count(),
+                    "rows_added": added,
+                    "load_seconds": load_seconds,
+                    "vector_search_seconds": summarize(vector_samples),
+                    "pipeline_search_seconds": summarize(pipeline_samples),
+                    "document_search_seconds": summarize(document_samples),
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+                logger.info(f"Search at {size} rows: p50 {results[str(size)]['vector_search_seconds']['p50'] * 1000:.1f} ms")
+        finally:
+            if not keep_corpus:
+                corpus.clear()
+
+        return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the selected scenarios and write the JSON report."""
+    parser = argparse.ArgumentParser(description="Offline ingestion and search benchmarks")
+    parser.add_argument("--scenarios", default="startup,ingest,search", help="Comma-separated: startup, ingest, search")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Synthetic corpus sizes for the search scenario")
+    parser.add_argument("--queries", type=int, default=200, help="Vector-only queries per corpus size")
+    parser.add_argument("--pipeline-queries", type=int, default=30, help="Full-pipeline queries per corpus size")
+    parser.add_argument("--ingest-docs", type=int, default=32, help="PDFs ingested by the ingest scenario")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0, help="Mean latency of the fake OpenAI server")
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of LLM requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-corpus", action="store_true", help="Leave the synthetic rows in the database")
+    parser.add_argument("--output", type=Path, help="Report path (default: benchmarks/results/<time>_<commit>.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    backend = FakeOpenAI(load_canned_records(), args.llm_latency_ms, args.llm_jitter_ms, args.llm_error_rate, args.seed)
+    server = serve(backend)
+
+    with tempfile.TemporaryDirectory(prefix="casemind-bench-") as tmp:
+        configure_environment(Path(tmp), f"http://127.0.0.1:{server.server_address[1]}/v1")
+        bench = Benchmark(Path(tmp), backend, seed=args.seed)
+
+        from core.config import Config
+        config = Config()
+
+        report: Dict[str, Any] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                "embedding_model": config.embedding_model,
+                "ranker_model": config.ranker_model,
+                "ingest_concurrency": config.ingest_concurrency,
+                "llm_latency_ms": args.llm_latency_ms,
+                "llm_jitter_ms": args.llm_jitter_ms,
+                "llm_error_rate": args.llm_error_rate,
+                "seed": args.seed,
+            },
+            "scenarios": {},
+        }
+
+        try:
+            if "startup" in scenarios:
+                logger.info("Scenario: startup")
+                report["scenarios"]["startup"] = bench.scenario_startup()
+            if "ingest" in scenarios:
+                logger.info(f"Scenario: ingest ({args.ingest_docs} documents)")
+                report["scenarios"]["ingest"] = bench.scenario_ingest(args.ingest_docs)
+            if "search" in scenarios:
+                logger.info(f"Scenario: search (sizes {sizes})")
+                report["scenarios"]["search"] = bench.scenario_search(sizes, args.queries, args.pipeline_queries, args.keep_corpus)
+        finally:
+            server.shutdown()
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = DEFAULT_RESULTS_DIR / f"{stamp}_{report['commit'][:10]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Adaptive (AIMD) concurrency control for page-level OCR providers.
+Concurrency grows while calls succeed and is cut back on 429s and timeouts,
+so throughput follows the provider's real limit instead of a fixed guess.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Error text of rate-limit / overload responses across Gemini, Mistral and HTTP clients
+OVERLOAD_MARKERS = (
+    "429",
+    "503",
+    "quota",
+    "rate limit",
+    "rate_limit",
+    "resource exhausted",
+    "resource_exhausted",
+    "overloaded",
+    "deadline exceeded",
+    "timed out",
+    "timeout",
+)
+
+_RETRY_IN = re.compile(r"retry in ([0-9.]+)s", re.IGNORECASE)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True for errors that mean "slow down" (rate limits, overload, timeouts)."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    text = str(error).lower()
+    return any(marker in text for marker in OVERLOAD_MARKERS)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay the provider asked for, if the error carries one."""
+    retry_after = getattr(error, "retry_after", None)
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+    match = _RETRY_IN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class AdaptiveConcurrencyController:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight calls.
+
+    Every success raises the limit by ``increase / limit`` (about +1 per
+    round of ``limit`` successes); an overload error multiplies it by
+    ``decrease`` and, if the provider sent a retry delay, pauses new calls
+    until it has passed. Overload errors of calls that started before the
+    last decrease do not cut the limit again, so one burst of 429s counts
+    as a single congestion signal.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        name: str = "ocr"
+    ):
+        """
+        Initialize concurrency controller.
+
+        Args:
+            initial: Starting concurrency
+            minimum: Lowest concurrency after back-off
+            maximum: Highest concurrency while ramping up
+            increase: Additive increase per round of successful calls
+            decrease: Multiplicative factor applied on overload
+            max_retries: Retries of a call that failed with an overload error
+            base_backoff: Pause (seconds) after an overload without retry hint, doubled per retry
+            name: Provider name used in log messages
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.name = name
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._epoch = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # A controller can outlive an event loop (asyncio.run per document); rebind to the current one
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[int]:
+        """
+        Hold one concurrency slot for the duration of the block.
+
+        Yields:
+            Epoch of the limit when the slot was granted (pass to ``on_overload``)
+        """
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(condition.wait(), pause)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    break
+                await condition.wait()
+            self.in_flight += 1
+            epoch = self._epoch
+        try:
+            yield epoch
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def on_success(self) -> None:
+        """Additive increase after a successful call (called while the slot is still held)."""
+        previous = int(self.limit)
+        self.limit = min(self.maximum, self.limit + self.increase / max(1.0, self.limit))
+        if int(self.limit) > previous:
+            logger.debug(f"{self.name}: concurrency raised to {int(self.limit)}")
+
+    def on_overload(self, epoch: int, retry_after: Optional[float] = None, attempt: int = 0) -> float:
+        """
+        Multiplicative decrease after a 429 / timeout.
+
+        Args:
+            epoch: Epoch yielded by ``slot`` for the failed call
+            retry_after: Delay requested by the provider
+            attempt: Retry number of the failed call (scales the default back-off)
+
+        Returns:
+            Seconds new calls are held back
+        """
+        if epoch == self._epoch:
+            self._epoch += 1
+            self.limit = max(float(self.minimum), self.limit * self.decrease)
+            logger.warning(f"{self.name}: overloaded, concurrency reduced to {int(self.limit)}")
+
+        delay = retry_after if retry_after is not None else self.base_backoff * (2 ** attempt)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    async def run(self, call: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Run ``call`` under the limit, retrying overload errors.
+
+        Args:
+            call: Returns a fresh awaitable per attempt
+            timeout: Per-attempt timeout in seconds (a timeout counts as overload)
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            The last error if retries are exhausted or the error is not an overload
+        """
+        attempt = 0
+        while True:
+            async with self.slot() as epoch:
+                try:
+                    result = await (asyncio.wait_for(call(), timeout) if timeout else call())
+                except Exception as e:
+                    if not is_overload_error(e):
+                        raise
+                    delay = self.on_overload(epoch, retry_after_seconds(e), attempt)
+                    if attempt >= self.max_retries:
+                        raise
+                    logger.info(f"{self.name}: retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                    attempt += 1
+                    continue
+                # Reported before the slot is released, so waiters see the raised limit
+                self.on_success()
+                return result
+
+
+_shared: Dict[str, AdaptiveConcurrencyController] = {}
+
+
+def shared_controller(provider: str, **settings) -> AdaptiveConcurrencyController:
+    """
+    Controller shared by every extractor of one provider in this process.
+
+    Args:
+        provider: Provider key (e.g. "gemini", "mistral")
+        **settings: AdaptiveConcurrencyController arguments, used on first creation only
+
+    Returns:
+        The provider's controller
+    """
+    if provider not in _shared:
+        _shared[provider] = AdaptiveConcurrencyController(name=provider, **settings)
+    return _shared[provider]
@@ -7,7 +7,7 @@ import os
 import logging
 from pathlib import Path
 import re
-from typing import Optional
+from typing import Iterator, Optional
 
 class PDFToMarkdownConverter:
     """Converts PDF files to markdown format with proper text cleaning."""
@@ -17,32 +17,31 @@ class PDFToMarkdownConverter:
         self.config = config or {}
         self.save_markdown = self.config.get('processing_settings', {}).get('save_markdown_files', False)
         self.markdown_dir = self.config.get('processing_settings', {}).get('markdown_output_dir', 'cases/markdown')
+        # Page-range parallel extraction for long documents (1 worker = serial)
+        self.page_workers = self.config.get('processing_settings', {}).get('page_workers', 1)
+        self.parallel_min_pages = self.config.get('processing_settings', {}).get('parallel_min_pages', 64)
         
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: str, stream: Optional[bytes] = None) -> str:
         """
         Extract text from PDF file using PyMuPDF.
         
         Args:
             pdf_path (str): Path to the PDF file
+            stream (bytes, optional): File content already read by the caller (avoids a second read)
             
         Returns:
             str: Extracted text content
         """
         try:
-            doc = fitz.open(pdf_path)
             text_content = []
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                text = page.get_text()
-                
+            for page_num, text in enumerate(self._page_texts(pdf_path, stream)):
                 # Add page separator for better structure
                 if page_num > 0:
                     text_content.append(f"\n\n--- Page {page_num + 1} ---\n")
                 
                 text_content.append(text)
             
-            doc.close()
             extracted_text = "".join(text_content)
             
             # Save markdown file if enabled
@@ -55,6 +54,35 @@ class PDFToMarkdownConverter:
             self.logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
             raise
     
+    def iter_pages(self, pdf_path: str) -> Iterator[str]:
+        """
+        Stream the cleaned text of a PDF page by page.
+        
+        Only the pages being extracted are held in memory, so this suits
+        very long judgments that are processed incrementally.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+        
+        Yields:
+            str: Cleaned text of each page, in order
+        """
+        for text in self._page_texts(pdf_path):
+            yield self.clean_text(text)
+    
+    def _page_texts(self, pdf_path: str, stream: Optional[bytes] = None) -> Iterator[str]:
+        """Raw text of each page (page ranges in parallel for long documents when available)."""
+        try:
+            from utils.pdf_pages import iter_page_texts
+        except ImportError:
+            # Used outside the CaseMind source tree: read pages serially
+            with (fitz.open(stream=stream, filetype="pdf") if stream is not None else fitz.open(pdf_path)) as doc:
+                for page in doc:
+                    yield page.get_text()
+            return
+        
+        yield from iter_page_texts(pdf_path, workers=self.page_workers, min_pages=self.parallel_min_pages, stream=stream)
+    
     def clean_text(self, text: str) -> str:
         """
         Clean extracted text for better readability.
@@ -0,0 +1,137 @@
+"""
+Per-page routing between the PDF text layer and remote OCR.
+Pages with a usable text layer are read locally; OCR results of the rest are
+cached by page content, so re-runs of a document make no OCR calls.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A page needs at least this many non-whitespace characters to skip OCR
+MIN_TEXT_CHARS = 100
+
+# Above this share of unreadable characters the text layer is treated as broken
+MAX_GARBAGE_RATIO = 0.2
+
+# Unicode categories of characters that never occur in a healthy text layer
+_GARBAGE_CATEGORIES = {"Cc", "Cf", "Co", "Cs", "Cn"}
+
+
+def text_layer_stats(text: str) -> Tuple[int, float]:
+    """
+    Measure the text layer of a page.
+
+    Args:
+        text: Output of ``page.get_text()``
+
+    Returns:
+        (non-whitespace characters, share of them that are unreadable)
+    """
+    chars = 0
+    garbage = 0
+    for char in text:
+        if char.isspace():
+            continue
+        chars += 1
+        if char == "\ufffd" or unicodedata.category(char) in _GARBAGE_CATEGORIES:
+            garbage += 1
+    return chars, (garbage / chars if chars else 0.0)
+
+
+def has_usable_text_layer(
+    text: str,
+    min_chars: int = MIN_TEXT_CHARS,
+    max_garbage_ratio: float = MAX_GARBAGE_RATIO
+) -> bool:
+    """True if the page text is long and clean enough to use without OCR."""
+    chars, garbage_ratio = text_layer_stats(text)
+    return chars >= min_chars and garbage_ratio <= max_garbage_ratio
+
+
+def page_content_hash(parts: Iterable[bytes]) -> str:
+    """
+    Hash the content that determines what a page looks like.
+
+    Args:
+        parts: Page geometry, content streams and raw image streams
+
+    Returns:
+        Hexadecimal SHA-256 digest (the same page in another file hashes the same)
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class OCRPageCache:
+    """
+    SQLite cache of OCR output keyed by page content hash and OCR settings.
+
+    Keys include the strategy, model and prompt version, so switching OCR
+    provider or prompt never returns stale text.
+    """
+
+    def __init__(self, path: str = "cache/ocr_pages.sqlite3"):
+        """
+        Initialize OCR page cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                strategy TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+
+    @staticmethod
+    def make_key(page_hash: str, strategy: str, model: str = "", prompt_version: str = "") -> str:
+        """Cache key of a page for one OCR configuration."""
+        return hashlib.sha256(f"{page_hash}|{strategy}|{model}|{prompt_version}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached OCR text for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM ocr_pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, content: str, strategy: str = "") -> None:
+        """Store the OCR text of a page."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_pages (key, content, strategy, created_at) VALUES (?, ?, ?, ?)",
+                (key, content, strategy, time.time())
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,11 +5,13 @@ Handles raw content extraction from PDFs using various strategies (Gemini, PyMuP
 
 import os
 import re
+import sys
 import asyncio
 import base64
 import logging
 from pathlib import Path
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 import fitz
 import google.generativeai as genai
@@ -22,7 +24,7 @@ except ImportError:
     MISTRAL_AVAILABLE = False
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Any
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional, Any
 
 # Define ImageData dataclass since backend.models.schemas is not available
 @dataclass
@@ -35,10 +37,54 @@ class ImageData:
     equipment_parts: list = field(default_factory=list)
     image_type: Optional[str] = None
 
+
+class DeferredImageData(ImageData):
+    """ImageData whose PNG conversion and base64 encoding run on first access of base64_data."""
+
+    def __init__(self, id: str, page_number: int, file_path: str, xref: int, **kwargs):
+        self.file_path = file_path
+        self.xref = xref
+        self._base64: Optional[str] = None
+        super().__init__(id=id, base64_data=None, page_number=page_number, **kwargs)
+
+    @property
+    def base64_data(self) -> str:
+        if self._base64 is None:
+            self._base64 = _encode_image(self.file_path, self.xref)
+        return self._base64
+
+    @base64_data.setter
+    def base64_data(self, value: Optional[str]) -> None:
+        if value is not None:
+            self._base64 = value
+
+    def __repr__(self) -> str:
+        # Must not trigger encoding (asyncio and loggers repr arguments freely)
+        state = "encoded" if self._base64 is not None else "deferred"
+        return f"DeferredImageData(id={self.id!r}, page_number={self.page_number}, xref={self.xref}, {state})"
+
+
+def _encode_image(file_path: str, xref: int) -> str:
+    """Render image ``xref`` of a PDF as base64 PNG."""
+    doc = fitz.open(file_path)
+    try:
+        pix = fitz.Pixmap(doc, xref)
+
+        # Convert to PNG if not already
+        if pix.n - pix.alpha >= 4:  # CMYK: convert to RGB first
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        return base64.b64encode(pix.tobytes("png")).decode()
+    finally:
+        doc.close()
+
 import argparse
 import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+from adaptive_concurrency import AdaptiveConcurrencyController, shared_controller
+from ocr_routing import OCRPageCache, has_usable_text_layer, page_content_hash
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,6 +96,9 @@ load_dotenv()
 class DocumentContentExtractionStrategy(ABC):
     """Abstract base class defining the interface for document content extraction strategies."""
 
+    # True for strategies that can OCR a single page (usable by HybridContentExtractor)
+    supports_page_ocr = False
+
     @abstractmethod
     async def extract(self, file_path: str) -> Tuple[str, List[ImageData]]:
         """Extract raw content from a document file."""
@@ -75,66 +124,101 @@ class DocumentContentExtractionStrategy(ABC):
         """
         pass
 
-    async def _process_pages_batch_async(
+    async def _process_pages_async(
         self,
-        page_data: List[bytes],
-        max_concurrent: int = 8,
-        batch_size: int = 20,
+        pages: Iterable[Tuple[int, bytes]],
+        max_in_flight: Callable[[], int],
+        process: Optional[Callable[[bytes, int], Awaitable[str]]] = None,
     ) -> List[str]:
-        """Process pages in batches with controlled concurrency.
+        """Process pages as they are produced, streaming them through the provider's concurrency controller.
+
+        Pages are pulled from ``pages`` (usually a lazy generator) only when
+        fewer than ``max_in_flight()`` are being processed, so at most that
+        many page payloads are held in memory however long the document is.
+        The extractor's AdaptiveConcurrencyController decides how many calls
+        actually run, so pages flow continuously instead of in fixed batches
+        separated by sleeps.
 
         Args:
-            page_data: List of PDF page data
-            max_concurrent: Maximum concurrent API calls
-            batch_size: Number of pages to process per batch
+            pages: (0-based page number, single-page PDF data) pairs
+            max_in_flight: Current bound on pages being processed (read before each pull)
+            process: Coroutine run per page (page data, 1-indexed page number);
+                defaults to ``_process_single_page_async``
 
         Returns:
             List of processed page content in correct order
         """
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(max_concurrent)
+        loop = asyncio.get_event_loop()
+        iterator = iter(pages)
+        results: Dict[int, str] = {}
+        in_flight: Set[asyncio.Task] = set()
+        # The generator owns an open fitz document; always advance it from the same thread
+        producer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-split")
+        process = process or self._process_single_page_async
+
+        async def process_page(page_pdf_data, page_num):
+            try:
+                content = await process(page_pdf_data, page_num + 1)
+                results[page_num] = f"## Page {page_num + 1}\n\n{content}"
 
-        # Process pages in batches with controlled concurrency
-        all_content = []
-        total_pages = len(page_data)
+            except Exception as e:
+                logger.error(f"Failed to process page {page_num + 1}: {e}")
+                results[page_num] = f"## Page {page_num + 1}\n\n[Error processing page: {str(e)}]"
 
-        for batch_start in range(0, total_pages, batch_size):
-            batch_end = min(batch_start + batch_size, total_pages)
-            batch = page_data[batch_start:batch_end]
+            if len(results) % 10 == 0:
+                logger.info(f"Processed {len(results)} pages")
 
-            logger.info(
-                f"Processing batch: pages {batch_start + 1}-{batch_end} of {total_pages}"
-            )
+        try:
+            while True:
+                while len(in_flight) >= max(1, max_in_flight()):
+                    _, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                item = await loop.run_in_executor(producer, next, iterator, None)
+                if item is None:
+                    break
+                page_num, page_pdf_data = item
+                in_flight.add(asyncio.ensure_future(process_page(page_pdf_data, page_num)))
+
+            if in_flight:
+                await asyncio.wait(in_flight)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            producer.submit(getattr(iterator, "close", lambda: None))
+            producer.shutdown(wait=False)
+
+        logger.info(f"Processed {len(results)} pages")
+        return [results[page_num] for page_num in sorted(results)]
+
+    def _extract_page_images(
+        self, doc, page_num: int, file_path: str, seen_xrefs: Optional[Set[int]] = None
+    ) -> List[ImageData]:
+        """List the images of one page without encoding them.
+
+        Images are returned as DeferredImageData (PNG/base64 conversion on
+        first access). Images already listed for an earlier page (letterheads,
+        seals shared by xref) are skipped when ``seen_xrefs`` is given.
+        """
+        images = []
+        page = doc.load_page(page_num)
 
-            # Create async tasks for this batch with semaphore control
-            async def process_page_with_semaphore(page_pdf_data, page_num):
-                async with semaphore:
-                    try:
-                        content = await self._process_single_page_async(
-                            page_pdf_data, page_num + 1
-                        )
-                        return f"## Page {page_num + 1}\n\n{content}"
-
-                    except Exception as e:
-                        logger.error(f"Failed to process page {page_num + 1}: {e}")
-                        return f"## Page {page_num + 1}\n\n[Error processing page: {str(e)}]"
-
-            # Create tasks for this batch - preserves order
-            tasks = [
-                process_page_with_semaphore(page_pdf_data, batch_start + j)
-                for j, page_pdf_data in enumerate(batch)
-            ]
-
-            # Wait for batch completion - results maintain order
-            batch_results = await asyncio.gather(*tasks)
-            all_content.extend(batch_results)
-            
-            # Add delay between batches to avoid rate limits (for Gemini)
-            if batch_end < total_pages:
-                logger.info("Waiting 10 seconds before next batch to avoid rate limits...")
-                await asyncio.sleep(10)
+        for img_index, img in enumerate(page.get_images()):
+            xref = img[0]
+            if seen_xrefs is not None:
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+
+            images.append(DeferredImageData(
+                id=f"page_{page_num + 1}_img_{img_index + 1}",
+                page_number=page_num + 1,
+                file_path=file_path,
+                xref=xref,
+                description=None,  # Will be filled by image analyzer
+                equipment_parts=[],
+                image_type=None,
+            ))
 
-        return all_content
+        return images
 
     def _post_process_combined_content(self, all_content: List[str]) -> str:
         """Clean and normalize page content before combining."""
@@ -213,15 +297,21 @@ class PyMuPDFContentExtractor(DocumentContentExtractionStrategy):
 class GeminiContentExtractor(DocumentContentExtractionStrategy):
     """Content extraction strategy using Gemini API with page-by-page processing."""
 
+    supports_page_ocr = True
+
+    # Bump when the page prompt changes (invalidates cached OCR pages)
+    PROMPT_VERSION = "1"
+
     def __init__(
         self,
         model_name: str = "gemini-2.5-flash",
-        max_concurrent: int = 4,  # Reduced to avoid rate limits
-        batch_size: int = 20,  # Reduced batch size
+        max_concurrent: int = 32,  # Upper bound; the controller finds the real limit
+        controller: Optional[AdaptiveConcurrencyController] = None,
     ):
         self.model_name = model_name
         self.max_concurrent = max_concurrent
-        self.batch_size = batch_size
+        # Shared by all Gemini extractors, so concurrent documents respect one provider limit
+        self.controller = controller or shared_controller("gemini", initial=4, maximum=max_concurrent)
 
         if not os.getenv("GEMINI_API_KEY"):
             raise ValueError("GEMINI_API_KEY not found in environment variables")
@@ -230,21 +320,18 @@ class GeminiContentExtractor(DocumentContentExtractionStrategy):
         self.client = genai.GenerativeModel(self.model_name)
 
     async def extract(self, file_path: str, max_pages: Optional[int] = None, page_range: Optional[Tuple[int, int]] = None) -> Tuple[str, List[ImageData]]:
-        """Extract content using Gemini API with batched async processing"""
+        """Extract content using Gemini API with adaptive page concurrency"""
         logger.info(
-            f"Extracting content from {file_path} using Gemini API (batched async, batch_size={self.batch_size}, max_concurrent={self.max_concurrent})"
+            f"Extracting content from {file_path} using Gemini API (adaptive concurrency, current={int(self.controller.limit)}, max={self.controller.maximum})"
         )
 
-        loop = asyncio.get_event_loop()
-
-        # Get page data and extract images in a single pass (optimization)
-        page_data, images = await loop.run_in_executor(
-            None, self._split_pdf_and_extract_images, file_path, max_pages, page_range
-        )
+        # Pages are split lazily; images are listed (deduplicated by xref) as the split reaches them
+        images: List[ImageData] = []
+        pages = self._iter_page_payloads(file_path, images, max_pages, page_range)
 
-        # Process pages using shared batched async method
-        all_content = await self._process_pages_batch_async(
-            page_data, self.max_concurrent, self.batch_size
+        # Hold at most a couple of pages beyond the controller's current concurrency
+        all_content = await self._process_pages_async(
+            pages, lambda: int(self.controller.limit) + 2
         )
 
         # Post-process and combine content using shared method
@@ -255,89 +342,56 @@ class GeminiContentExtractor(DocumentContentExtractionStrategy):
         )
         return combined_content, images
 
-    def _split_pdf_and_extract_images(
-        self, file_path: str, max_pages: Optional[int] = None, page_range: Optional[Tuple[int, int]] = None
-    ) -> Tuple[List[bytes], List[ImageData]]:
-        """Split PDF into pages and extract images in a single pass for efficiency"""
+    def _iter_page_payloads(
+        self,
+        file_path: str,
+        images: List[ImageData],
+        max_pages: Optional[int] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Yield (page number, single-page PDF data) on demand, listing each page's images into ``images``.
+
+        Only the page being yielded is held in memory. Images shared by
+        several pages (same xref) are listed once and encoded only when a
+        consumer reads their base64_data.
+        """
         doc = fitz.open(file_path)
-        page_data_list = []
-        all_images = []
-
-        # Determine number of pages to process
-        total_pages = len(doc)
-        
-        if page_range:
-            from_page, to_page = page_range
-            # Convert to 0-indexed and validate
-            start_idx = from_page - 1
-            end_idx = min(to_page, total_pages)  # to_page is inclusive, so we use it directly with range
-            if start_idx >= total_pages:
-                logger.warning(f"Start page {from_page} exceeds total pages {total_pages}")
-                doc.close()
-                return page_data_list, all_images
-            logger.info(f"Processing pages {from_page}-{end_idx} of {total_pages} pages")
-        elif max_pages:
-            start_idx = 0
-            end_idx = min(max_pages, total_pages)
-            logger.info(f"Processing first {end_idx} of {total_pages} pages")
-        else:
-            start_idx = 0
-            end_idx = total_pages
-            logger.info(f"Processing all {total_pages} pages")
-
-        for page_num in range(start_idx, end_idx):
-            # Split: Create a new PDF with just this page
-            single_page_doc = fitz.open()  # Create empty PDF
-            single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-            page_pdf_data = single_page_doc.tobytes()
-            page_data_list.append(page_pdf_data)
-            single_page_doc.close()
-
-            # Extract images from the same page
-            page = doc.load_page(page_num)
-            image_list = page.get_images()
-
-            for img_index, img in enumerate(image_list):
-                try:
-                    # Get image data
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
-
-                    # Convert to PNG if not already
-                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                        img_data = pix.tobytes("png")
-                    else:  # CMYK: convert to RGB first
-                        pix1 = fitz.Pixmap(fitz.csRGB, pix)
-                        img_data = pix1.tobytes("png")
-                        pix1 = None
-
-                    # Encode to base64
-                    img_base64 = base64.b64encode(img_data).decode()
-
-                    # Create ImageData object
-                    image_data = ImageData(
-                        id=f"page_{page_num + 1}_img_{img_index + 1}",
-                        base64_data=img_base64,
-                        page_number=page_num + 1,
-                        description=None,  # Will be filled by image analyzer
-                        equipment_parts=[],
-                        image_type=None,
-                    )
-                    all_images.append(image_data)
-
-                    pix = None  # Free memory
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to extract image {img_index} from page {page_num + 1}: {e}"
-                    )
-                    continue
-
-        doc.close()
-        logger.info(
-            f"Split PDF into {len(page_data_list)} pages and extracted {len(all_images)} images"
-        )
-        return page_data_list, all_images
+        seen_xrefs: Set[int] = set()
+        try:
+            # Determine number of pages to process
+            total_pages = len(doc)
+
+            if page_range:
+                from_page, to_page = page_range
+                # Convert to 0-indexed and validate
+                start_idx = from_page - 1
+                end_idx = min(to_page, total_pages)  # to_page is inclusive, so we use it directly with range
+                if start_idx >= total_pages:
+                    logger.warning(f"Start page {from_page} exceeds total pages {total_pages}")
+                    return
+                logger.info(f"Processing pages {from_page}-{end_idx} of {total_pages} pages")
+            elif max_pages:
+                start_idx = 0
+                end_idx = min(max_pages, total_pages)
+                logger.info(f"Processing first {end_idx} of {total_pages} pages")
+            else:
+                start_idx = 0
+                end_idx = total_pages
+                logger.info(f"Processing all {total_pages} pages")
+
+            for page_num in range(start_idx, end_idx):
+                # Split: Create a new PDF with just this page
+                single_page_doc = fitz.open()  # Create empty PDF
+                single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                page_pdf_data = single_page_doc.tobytes()
+                single_page_doc.close()
+
+                # List images of the same page (encoding is deferred)
+                images.extend(self._extract_page_images(doc, page_num, file_path, seen_xrefs))
+
+                yield page_num, page_pdf_data
+        finally:
+            doc.close()
 
     def _clean_extraction_artifacts(self, content: str) -> str:
         """Clean up common extraction artifacts"""
@@ -364,7 +418,7 @@ class GeminiContentExtractor(DocumentContentExtractionStrategy):
         return "\n".join(cleaned_lines)
 
     async def _call_gemini_api_for_page(self, page_pdf_data: bytes, page_num: int):
-        """Process a single page with Gemini API with retry logic"""
+        """Process a single page with Gemini API (retried on rate limits by the controller)"""
         page_prompt = f"""
         **Role:** You are an expert OCR and document transcription service specializing in Indian legal documents.
 
@@ -396,54 +450,31 @@ class GeminiContentExtractor(DocumentContentExtractionStrategy):
         **Objective:** The final output should be a complete and accurate Markdown representation of the page, preserving its structure and content as closely as possible.
         """
 
-        max_retries = 3
-        retry_delay = 2
-        
-        for attempt in range(max_retries):
-            try:
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.generate_content(
-                        contents=[
+        loop = asyncio.get_event_loop()
+
+        def generate():
+            return self.client.generate_content(
+                contents=[
+                    {
+                        "parts": [
                             {
-                                "parts": [
-                                    {
-                                        "inline_data": {
-                                            "mime_type": "application/pdf",
-                                            "data": page_pdf_data,
-                                        }
-                                    },
-                                    {"text": page_prompt},
-                                ]
-                            }
-                        ],
-                        generation_config=genai.GenerationConfig(
-                            temperature=0.1,
-                            max_output_tokens=4000,
-                        ),
-                    ),
-                )
-                return response
-                
-            except Exception as e:
-                error_str = str(e)
-                # Check if it's a rate limit error
-                if "429" in error_str or "quota" in error_str.lower():
-                    if attempt < max_retries - 1:
-                        # Extract retry delay from error message if available
-                        import re
-                        delay_match = re.search(r'retry in ([0-9.]+)s', error_str)
-                        if delay_match:
-                            retry_delay = float(delay_match.group(1)) + 1  # Add 1 second buffer
-                        else:
-                            retry_delay = retry_delay * 2  # Exponential backoff
-                        
-                        logger.warning(f"Rate limit hit for page {page_num}, retrying in {retry_delay:.1f}s (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                # Re-raise if not rate limit or max retries exceeded
-                raise
+                                "inline_data": {
+                                    "mime_type": "application/pdf",
+                                    "data": page_pdf_data,
+                                }
+                            },
+                            {"text": page_prompt},
+                        ]
+                    }
+                ],
+                generation_config=genai.GenerationConfig(
+                    temperature=0.1,
+                    max_output_tokens=4000,
+                ),
+            )
+
+        # Rate limits and timeouts are retried by the controller, which also lowers concurrency
+        return await self.controller.run(lambda: loop.run_in_executor(None, generate))
 
     def get_strategy_name(self) -> str:
         return "gemini"
@@ -497,16 +528,171 @@ class GeminiContentExtractor(DocumentContentExtractionStrategy):
             return f"[Error processing page: {str(e)}]"
 
 
+# Concrete Strategy: Hybrid (text layer first, OCR for image-only pages)
+class HybridContentExtractor(DocumentContentExtractionStrategy):
+    """Content extraction that reads the PDF text layer and OCRs only pages without one."""
+
+    # OCR output that must not be cached (the page should be retried next run)
+    UNCACHEABLE_PREFIXES = ("[Error", "[No content", "[No valid content", "[Content blocked")
+
+    def __init__(
+        self,
+        ocr_extractor: Optional[DocumentContentExtractionStrategy] = None,
+        cache: Optional[OCRPageCache] = None,
+        min_chars: int = 100,
+        max_garbage_ratio: float = 0.2,
+    ):
+        """Initialize hybrid extractor.
+
+        Args:
+            ocr_extractor: Page-level OCR strategy for image-only pages (Gemini by default)
+            cache: OCR page cache (cache/ocr_pages.sqlite3 by default)
+            min_chars: Non-whitespace characters a page needs to skip OCR
+            max_garbage_ratio: Highest share of unreadable characters in a usable text layer
+        """
+        self.ocr_extractor = ocr_extractor or GeminiContentExtractor()
+        if not self.ocr_extractor.supports_page_ocr:
+            raise ValueError(
+                f"{self.ocr_extractor.get_strategy_name()} cannot OCR single pages; use a page-level strategy such as Gemini"
+            )
+        self.cache = cache or OCRPageCache()
+        self.min_chars = min_chars
+        self.max_garbage_ratio = max_garbage_ratio
+        self.model_name = f"hybrid+{getattr(self.ocr_extractor, 'model_name', '')}"
+
+    async def extract(self, file_path: str) -> Tuple[str, List[ImageData]]:
+        """Extract content: text layer where usable, cached or fresh OCR elsewhere"""
+        logger.info(f"Extracting content from {file_path} using text layer + {self.ocr_extractor.get_strategy_name()} OCR")
+
+        loop = asyncio.get_event_loop()
+        pages, ocr_jobs, images = await loop.run_in_executor(None, self._route_pages, file_path)
+
+        async def ocr_page(page_pdf_data: bytes, page_num: int) -> str:
+            page_nums, cache_key = ocr_jobs[page_num - 1]
+            try:
+                content = await self.ocr_extractor._process_single_page_async(page_pdf_data, page_num)
+            except Exception as e:
+                logger.error(f"Failed to OCR page {page_num}: {e}")
+                content = f"[Error processing page: {str(e)}]"
+            if not content.lstrip().startswith(self.UNCACHEABLE_PREFIXES):
+                await loop.run_in_executor(
+                    None, self.cache.put, cache_key, content, self.ocr_extractor.get_strategy_name()
+                )
+            for number in page_nums:
+                pages[number] = content
+            return content
+
+        # Pages are split only as the OCR strategy's concurrency controller accepts them
+        controller = getattr(self.ocr_extractor, "controller", None)
+        await self._process_pages_async(
+            self._iter_ocr_payloads(file_path, sorted(ocr_jobs)),
+            lambda: int(controller.limit) + 2 if controller is not None else 4,
+            process=ocr_page,
+        )
+
+        all_content = [f"## Page {page_num + 1}\n\n{content}" for page_num, content in enumerate(pages)]
+        combined_content = self._post_process_combined_content(all_content)
+
+        logger.info(
+            f"Extracted {len(combined_content)} characters from {len(pages)} pages "
+            f"({len(ocr_jobs)} OCR calls, {self.cache.hits} cached OCR pages so far)"
+        )
+        return combined_content, images
+
+    def _route_pages(self, file_path: str) -> Tuple[List[Optional[str]], Dict[int, Tuple[List[int], str]], List[ImageData]]:
+        """Probe every page; return text-layer/cached pages, OCR jobs and the images of all pages
+
+        OCR jobs map the page to OCR (0-based) to every page sharing its
+        content and their cache key. No page is split here: the payloads are
+        produced by ``_iter_ocr_payloads`` as the OCR calls are started.
+        """
+        doc = fitz.open(file_path)
+        pages: List[Optional[str]] = []
+        ocr_jobs: Dict[str, List[int]] = {}
+        images = []
+        seen_xrefs: Set[int] = set()
+        strategy = self.ocr_extractor.get_strategy_name()
+        model = getattr(self.ocr_extractor, "model_name", "")
+        prompt_version = getattr(self.ocr_extractor, "PROMPT_VERSION", "")
+
+        for page_num in range(len(doc)):
+            # Images are listed for every page (text-layer pages carry seals and signatures too)
+            images.extend(self._extract_page_images(doc, page_num, file_path, seen_xrefs))
+            page = doc.load_page(page_num)
+            text = page.get_text()
+            if has_usable_text_layer(text, self.min_chars, self.max_garbage_ratio):
+                pages.append(text)
+                continue
+
+            # Image-only (or broken text layer): OCR, unless this exact page was OCR'd before
+            cache_key = OCRPageCache.make_key(self._page_hash(doc, page), strategy, model, prompt_version)
+            if cache_key in ocr_jobs:
+                # Same content as an earlier page of this document (e.g. blank scans): one OCR call
+                ocr_jobs[cache_key].append(page_num)
+                pages.append(None)
+                continue
+            cached = self.cache.get(cache_key)
+            pages.append(cached)
+            if cached is None:
+                ocr_jobs[cache_key] = [page_num]
+
+        doc.close()
+        unresolved = sum(1 for page in pages if page is None)
+        logger.info(
+            f"Routed {len(pages)} pages: {len(pages) - unresolved} from text layer or OCR cache, "
+            f"{unresolved} to OCR ({len(ocr_jobs)} distinct)"
+        )
+        return pages, {page_nums[0]: (page_nums, cache_key) for cache_key, page_nums in ocr_jobs.items()}, images
+
+    @staticmethod
+    def _iter_ocr_payloads(file_path: str, page_nums: List[int]) -> Iterator[Tuple[int, bytes]]:
+        """Yield (page number, single-page PDF data) for the given pages, one page at a time"""
+        doc = fitz.open(file_path)
+        try:
+            for page_num in page_nums:
+                single_page_doc = fitz.open()
+                single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                page_pdf_data = single_page_doc.tobytes()
+                single_page_doc.close()
+                yield page_num, page_pdf_data
+        finally:
+            doc.close()
+
+    @staticmethod
+    def _page_hash(doc, page) -> str:
+        """Hash of the page's geometry, content streams and raw image data"""
+        parts = [f"{tuple(page.rect)}|{page.rotation}".encode("utf-8"), page.read_contents()]
+        for img in page.get_images():
+            parts.append(doc.xref_stream_raw(img[0]) or b"")
+        return page_content_hash(parts)
+
+    def get_strategy_name(self) -> str:
+        return "hybrid"
+
+    async def _process_single_page_async(
+        self, page_pdf_data: bytes, page_num: int
+    ) -> str:
+        """Single pages are OCR'd by the wrapped strategy"""
+        return await self.ocr_extractor._process_single_page_async(page_pdf_data, page_num)
+
+
 # Concrete Strategy: Mistral
 class MistralContentExtractor(DocumentContentExtractionStrategy):
     """Content extraction strategy using Mistral API with OCR capabilities."""
 
-    def __init__(self, task="ocr", model_name: str = "mistral-large-2"):
+    def __init__(
+        self,
+        task="ocr",
+        model_name: str = "mistral-large-2",
+        controller: Optional[AdaptiveConcurrencyController] = None,
+    ):
         if not MISTRAL_AVAILABLE:
             raise ImportError("mistralai package is not installed. Install it with: pip install mistralai")
         
         self.task = task
         self.model_name = model_name
+        # Shared by all Mistral extractors; documents processed concurrently back off together
+        self.controller = controller or shared_controller("mistral", initial=2, maximum=16)
         if not os.getenv("MISTRAL_API_KEY"):
             raise ValueError("MISTRAL_API_KEY not found in environment variables")
 
@@ -522,16 +708,18 @@ class MistralContentExtractor(DocumentContentExtractionStrategy):
         loop = asyncio.get_event_loop()
 
         # Upload file
-        uploaded_file = await loop.run_in_executor(None, self._upload_file, file_obj)
+        uploaded_file = await self.controller.run(
+            lambda: loop.run_in_executor(None, self._upload_file, file_obj)
+        )
 
         # Get signed URL
-        signed_url = await loop.run_in_executor(
-            None, self._get_signed_url, uploaded_file.id
+        signed_url = await self.controller.run(
+            lambda: loop.run_in_executor(None, self._get_signed_url, uploaded_file.id)
         )
 
         # Process with OCR
-        pdf_response = await loop.run_in_executor(
-            None, self._process_ocr, signed_url.url
+        pdf_response = await self.controller.run(
+            lambda: loop.run_in_executor(None, self._process_ocr, signed_url.url)
         )
 
         # Extract markdown and images
@@ -621,11 +809,14 @@ def main():
     parser.add_argument("--output", type=str, default=None, help="Optional output markdown file path")
     parser.add_argument("--pages", type=int, default=None, help="Number of pages to convert from start (default: all pages)")
     parser.add_argument("--range", type=str, default=None, help="Page range to convert in format 'from-to' (e.g., '5-10'), both inclusive")
+    parser.add_argument("--hybrid", action="store_true", help="Use the PDF text layer where present and OCR only image-only pages")
     args = parser.parse_args()
 
     # Validate that --pages and --range are not used together
     if args.pages and args.range:
         parser.error("Cannot use both --pages and --range arguments together")
+    if args.hybrid and (args.pages or args.range):
+        parser.error("--hybrid processes whole documents; --pages and --range are not supported")
 
     pdf_path = args.pdf_path
     output_path = args.output
@@ -646,11 +837,14 @@ def main():
         except ValueError:
             parser.error("Invalid page range format. Use 'from-to' (e.g., '5-10')")
 
-    # Run extraction using Gemini
-    extractor = GeminiContentExtractor()
+    # Run extraction using Gemini (optionally only for pages without a text layer)
+    extractor = HybridContentExtractor() if args.hybrid else GeminiContentExtractor()
 
     async def run_extraction():
-        markdown_content, images = await extractor.extract(pdf_path, max_pages=args.pages, page_range=page_range)
+        if args.hybrid:
+            markdown_content, images = await extractor.extract(pdf_path)
+        else:
+            markdown_content, images = await extractor.extract(pdf_path, max_pages=args.pages, page_range=page_range)
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(markdown_content)
         print(f"Extraction complete. Markdown saved to: {output_path}")
@@ -16,6 +16,7 @@ from .models import (
     SimilaritySearchResult
 )
 from .exceptions import *
+from .interfaces import IDocumentLoader
 
 __all__ = [
     'Config',
@@ -28,5 +29,6 @@ __all__ = [
     'IngestResult',
     'BatchIngestResult',
     'SimilarCase',
-    'SimilaritySearchResult'
+    'SimilaritySearchResult',
+    'IDocumentLoader'
 ]
@@ -58,21 +58,89 @@ class Config:
             f"{self.db_host}:{self.db_port}/{self.db_name}"
         )
         
+        # Connection pool shared by custom pipeline components
+        self.db_pool_min_connections = int(os.getenv('DB_POOL_MIN_CONNECTIONS', '1'))
+        self.db_pool_max_connections = int(os.getenv('DB_POOL_MAX_CONNECTIONS', '10'))
+        
         # Model configuration
         self.embedding_model = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-mpnet-base-v2')
         self.ranker_model = os.getenv('RANKER_MODEL', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+        self.embedding_batch_size = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+        self.reembed_batch_size = int(os.getenv('REEMBED_BATCH_SIZE', '512'))
         
         # Pipeline configuration
         self.top_k = int(os.getenv('TOP_K_SIMILAR_CASES', '5'))
         self.cross_encoder_threshold = float(os.getenv('CROSS_ENCODER_THRESHOLD', '0.0'))
+        # Query PDFs stay in memory unless persisted (they can still be saved explicitly after the search)
+        self.search_persist_queries = os.getenv('SEARCH_PERSIST_QUERIES', 'false').lower() in ('true', '1', 'yes')
+        self.ingest_concurrency = int(os.getenv('INGEST_CONCURRENCY', '4'))
+        
+        # Staged batch ingestion (parse processes -> LLM workers -> embedder -> bulk writer)
+        self.ingest_parse_workers = int(os.getenv('INGEST_PARSE_WORKERS', str(max(1, (os.cpu_count() or 2) - 1))))
+        self.ingest_queue_size = int(os.getenv('INGEST_QUEUE_SIZE', '8'))
+        self.ingest_write_batch_size = int(os.getenv('INGEST_WRITE_BATCH_SIZE', '32'))
+        self.ingest_batch_wait_seconds = float(os.getenv('INGEST_BATCH_WAIT_SECONDS', '0.5'))
+        
+        # Page-range parallel PDF extraction for long single documents
+        self.pdf_page_workers = int(os.getenv('PDF_PAGE_WORKERS', str(max(1, (os.cpu_count() or 2) - 1))))
+        self.pdf_parallel_min_pages = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '64'))
+        
+        # Watch-folder daemon (src/scripts/ingest_daemon.py)
+        self.ingest_manifest_path = Path(os.getenv('INGEST_MANIFEST_PATH', 'cache/ingest_manifest.sqlite3'))
+        self.ingest_poll_seconds = float(os.getenv('INGEST_POLL_SECONDS', '2'))
+        self.ingest_settle_seconds = float(os.getenv('INGEST_SETTLE_SECONDS', '2'))
+        self.ingest_full_rescan_seconds = float(os.getenv('INGEST_FULL_RESCAN_SECONDS', '3600'))
+        
+        # Duplicate gate: how long a resolved file hash is trusted, and how many are cached
+        self.duplicate_gate_ttl_seconds = float(os.getenv('DUPLICATE_GATE_TTL_SECONDS', '60'))
+        self.duplicate_gate_max_entries = int(os.getenv('DUPLICATE_GATE_MAX_ENTRIES', '100000'))
+        
+        # Fact extraction: texts longer than this are split and extracted chunk by chunk
+        self.fact_single_pass_chars = int(os.getenv('FACT_SINGLE_PASS_CHARS', '6000'))
+        self.fact_chunk_tokens = int(os.getenv('FACT_CHUNK_TOKENS', '4000'))
+        self.metadata_front_matter_chars = int(os.getenv('METADATA_FRONT_MATTER_CHARS', '6000'))
         
         # OpenAI configuration
         self.openai_api_key = os.getenv('OPENAI_API_KEY', file_config.get('openai_api_key', ''))
+        # OpenAI-compatible endpoint (e.g. the benchmark fake server); empty = api.openai.com
+        self.openai_base_url = os.getenv('OPENAI_BASE_URL', '') or None
+        
+        # LLM scheduling (rate limits of the OpenAI account, retries from extraction_settings)
+        extraction_settings = file_config.get('extraction_settings', {})
+        self.llm_requests_per_minute = int(os.getenv('OPENAI_RPM', '500'))
+        self.llm_tokens_per_minute = int(os.getenv('OPENAI_TPM', '30000'))
+        self.llm_max_concurrency = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+        self.llm_rate_headroom = float(os.getenv('LLM_RATE_HEADROOM', '0.9'))
+        self.llm_max_retries = int(os.getenv('LLM_MAX_RETRIES', extraction_settings.get('max_retries', 3)))
+        self.llm_timeout_seconds = float(os.getenv('LLM_TIMEOUT_SECONDS', extraction_settings.get('timeout_seconds', 120)))
+        
+        # Local section pre-classification (single combined LLM call when confident)
+        self.preclassifier_enabled = os.getenv('PRECLASSIFIER_ENABLED', 'true').lower() in ('true', '1', 'yes')
+        self.preclassifier_confidence = float(os.getenv('PRECLASSIFIER_CONFIDENCE', '0.6'))
+        
+        # LLM response cache (replays metadata/fact extraction on re-ingestion)
+        self.llm_cache_enabled = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('true', '1', 'yes')
+        self.llm_cache_path = Path(os.getenv('LLM_CACHE_PATH', 'cache/llm_responses.sqlite3'))
+        self.llm_cache_max_mb = int(os.getenv('LLM_CACHE_MAX_MB', '512'))
+        
+        # Ingestion journal (per-file stages and artifacts for resuming interrupted batches)
+        self.ingest_journal_enabled = os.getenv('INGEST_JOURNAL_ENABLED', 'true').lower() in ('true', '1', 'yes')
+        self.ingest_journal_path = Path(os.getenv('INGEST_JOURNAL_PATH', 'cache/ingestion_journal.sqlite3'))
         
         # Paths
         self.ontology_path = Path(os.getenv('ONTOLOGY_PATH', 'Ontology_schema/ontology_schema.json'))
         self.templates_dir = Path(os.getenv('TEMPLATES_DIR', 'templates'))
         self.cases_dir = Path(os.getenv('CASES_DIR', 'cases'))
+        self.markdown_output_dir = Path(os.getenv('MARKDOWN_OUTPUT_DIR', 'cases/markdown'))
+        self.extracted_output_dir = Path(os.getenv('EXTRACTED_OUTPUT_DIR', 'cases/extracted'))
+        
+        # Startup: build pipelines in a background thread while the menu is shown
+        self.background_warmup = os.getenv('BACKGROUND_WARMUP', 'true').lower() in ('true', '1', 'yes')
+        self.startup_import_budget = float(os.getenv('STARTUP_IMPORT_BUDGET', '1.0'))
+        
+        # Metrics: Prometheus text on /metrics and a JSON snapshot on /metrics.json (0 = not served)
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        self.metrics_host = os.getenv('METRICS_HOST', '127.0.0.1')
         
         # Logging
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
@@ -97,5 +165,6 @@ class Config:
             'ranker_model': self.ranker_model,
             'top_k': self.top_k,
             'cross_encoder_threshold': self.cross_encoder_threshold,
+            'ingest_concurrency': self.ingest_concurrency,
             'embedding_dim': self.embedding_dim,
         }
@@ -0,0 +1,18 @@
+"""
+Abstract interfaces implemented by service adapters.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class IDocumentLoader(ABC):
+    """Loads the text content of a source document."""
+    
+    @abstractmethod
+    def validate(self, file_path: Path) -> bool:
+        """Return True if the file can be loaded."""
+    
+    @abstractmethod
+    def load(self, file_path: Path) -> str:
+        """Return the cleaned text of the document (raises DocumentLoadError on failure)."""
@@ -1,3 +1,29 @@
 """
 Infrastructure layer for database and external integrations.
 """
+
+from .database import DatabasePool, parse_vector_literal, to_vector_literal
+from .duplicate_gate import DuplicateGate
+from .embedding_versions import EmbeddingVersions
+from .ingestion_journal import IngestionJournal
+from .ingest_manifest import IngestManifest
+from .model_registry import ModelRegistry
+from .llm_cache import LLMResponseCache
+from .llm_client import RateLimitedLLMClient, TokenBucket
+from .metrics import MetricsRegistry, serve_metrics
+
+__all__ = [
+    'DatabasePool',
+    'parse_vector_literal',
+    'to_vector_literal',
+    'DuplicateGate',
+    'EmbeddingVersions',
+    'IngestionJournal',
+    'IngestManifest',
+    'ModelRegistry',
+    'LLMResponseCache',
+    'RateLimitedLLMClient',
+    'TokenBucket',
+    'MetricsRegistry',
+    'serve_metrics'
+]
@@ -0,0 +1,163 @@
+"""
+Shared PostgreSQL connection pool for custom pipeline components.
+Wraps psycopg2's ThreadedConnectionPool and adds server-side prepared statements.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def to_vector_literal(values: Sequence[float]) -> str:
+    """Format an embedding as a pgvector text literal ('[0.1,0.2,...]')."""
+    return "[" + ",".join(str(float(v)) for v in values) + "]"
+
+
+def parse_vector_literal(text: Optional[str]) -> Optional[List[float]]:
+    """Parse a pgvector text literal (``embedding::text``) back into floats."""
+    if not text:
+        return None
+    return [float(v) for v in text.strip("[]").split(",")]
+
+
+class DatabasePool:
+    """
+    Thread-safe pool of PostgreSQL connections.
+    
+    Components borrow a connection per call instead of opening a new one, and
+    hot queries are registered once with ``prepare`` and run with
+    ``execute_prepared``, which issues PREPARE lazily on each pooled connection.
+    Callers block while every connection is in use.
+    """
+    
+    def __init__(self, connection_string: str, min_connections: int = 1, max_connections: int = 10):
+        """
+        Initialize connection pool.
+        
+        Args:
+            connection_string: PostgreSQL connection string
+            min_connections: Connections opened up front
+            max_connections: Upper bound on open connections
+        """
+        from psycopg2.pool import ThreadedConnectionPool
+        
+        self.connection_string = connection_string
+        self.max_connections = max_connections
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, connection_string)
+        self._available = threading.BoundedSemaphore(max_connections)
+        self._statements: Dict[str, str] = {}
+        self._prepared: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._metrics = MetricsRegistry()
+        logger.info(f"DatabasePool initialized (min={min_connections}, max={max_connections})")
+    
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of a ``with`` block.
+        
+        The transaction is committed on success and rolled back on error,
+        so connections always go back to the pool idle.
+        """
+        wait_start = time.perf_counter()
+        self._available.acquire()
+        self._metrics.observe("db_pool_wait_seconds", time.perf_counter() - wait_start)
+        conn = None
+        broken = False
+        try:
+            conn = self._pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                broken = bool(conn.closed)
+                if not broken:
+                    conn.rollback()
+                    self._reset_prepared(conn)
+                raise
+        finally:
+            if conn is not None:
+                if broken or conn.closed:
+                    with self._lock:
+                        self._prepared.pop(id(conn), None)
+                    self._pool.putconn(conn, close=True)
+                else:
+                    self._pool.putconn(conn)
+            self._available.release()
+    
+    @contextmanager
+    def cursor(self, cursor_factory: Optional[Any] = None) -> Iterator[Any]:
+        """Borrow a connection and yield a cursor on it."""
+        with self.connection() as conn:
+            cursor = conn.cursor(cursor_factory=cursor_factory)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+    
+    def prepare(self, name: str, sql: str) -> None:
+        """
+        Register a statement to be prepared server-side.
+        
+        Args:
+            name: Statement name (a valid SQL identifier)
+            sql: Statement text using $1, $2, ... placeholders
+        """
+        with self._lock:
+            existing = self._statements.get(name)
+            if existing is not None and existing != sql:
+                raise ValueError(f"Prepared statement '{name}' is already registered with different SQL")
+            self._statements[name] = sql
+    
+    def execute_prepared(self, cursor: Any, name: str, params: Sequence[Any] = ()) -> None:
+        """
+        Execute a registered statement, preparing it on this connection first if needed.
+        
+        Args:
+            cursor: Cursor obtained from ``cursor()`` or ``connection()``
+            name: Name passed to ``prepare``
+            params: Positional parameters for $1, $2, ...
+        """
+        conn_id = id(cursor.connection)
+        with self._lock:
+            sql = self._statements[name]
+            prepared = self._prepared.setdefault(conn_id, set())
+            needs_prepare = name not in prepared
+        
+        if needs_prepare:
+            cursor.execute(f"PREPARE {name} AS {sql}")
+            with self._lock:
+                prepared.add(name)
+        
+        with self._metrics.timer("db_query_seconds", statement=name):
+            if params:
+                placeholders = ", ".join(["%s"] * len(params))
+                cursor.execute(f"EXECUTE {name} ({placeholders})", tuple(params))
+            else:
+                cursor.execute(f"EXECUTE {name}")
+    
+    def _reset_prepared(self, conn: Any) -> None:
+        """Drop every statement prepared on a connection after a failed transaction."""
+        with self._lock:
+            self._prepared.pop(id(conn), None)
+        
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DEALLOCATE ALL")
+            cursor.close()
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to deallocate prepared statements: {e}")
+    
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._pool.closeall()
+        with self._lock:
+            self._prepared.clear()
+        logger.info("DatabasePool closed")
@@ -0,0 +1,141 @@
+"""
+Hash-first duplicate gate.
+Resolves file hashes against haystack_documents before any LLM call is made.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from .database import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateGate:
+    """
+    Short-lived cache of file hashes resolved against the database.
+    
+    Hashes are resolved in bulk with a single query and cached, so the
+    repeated lookups of one ingestion (gate check, duplicate checker node)
+    cost a dictionary probe instead of a round trip. Answers, stored or
+    absent, expire after ``ttl_seconds`` and at most ``max_entries`` are
+    kept, so rows deleted or written by other processes (clear_database.py,
+    the daemon) are seen again after the TTL. Deletes made through this
+    process call ``invalidate``; new documents are registered with ``add``.
+    """
+    
+    def __init__(self, db_pool: DatabasePool, ttl_seconds: float = 60.0, max_entries: int = 100_000):
+        """
+        Initialize duplicate gate.
+        
+        Args:
+            db_pool: Shared DatabasePool
+            ttl_seconds: How long a resolved hash is trusted
+            max_entries: Most hashes cached (oldest dropped first)
+        """
+        self.db_pool = db_pool
+        self.db_pool.prepare(
+            "duplicate_gate_lookup",
+            "SELECT file_hash, id FROM haystack_documents WHERE file_hash = ANY($1)"
+        )
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        # file_hash -> (document id, or None if absent; expiry time)
+        self._entries: OrderedDict[str, Tuple[Optional[str], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info("DuplicateGate initialized")
+    
+    def prefetch(self, file_hashes: Iterable[str], refresh: bool = False) -> Dict[str, str]:
+        """
+        Resolve many file hashes against the database in one round trip.
+        
+        Args:
+            file_hashes: File hashes to resolve
+            refresh: Query every hash, ignoring cached answers (used at the start of a batch)
+        
+        Returns:
+            Mapping of file_hash -> document id for hashes already stored
+        """
+        file_hashes = {h for h in file_hashes if h}
+        
+        resolved: Dict[str, Optional[str]] = {}
+        if not refresh:
+            now = time.monotonic()
+            with self._lock:
+                for h in file_hashes:
+                    entry = self._entries.get(h)
+                    if entry is not None and entry[1] > now:
+                        resolved[h] = entry[0]
+        
+        unresolved = [h for h in file_hashes if h not in resolved]
+        if unresolved:
+            found = self._query(unresolved)
+            for h in unresolved:
+                resolved[h] = found.get(h)
+            self._remember(resolved, unresolved)
+            logger.info(f"Resolved {len(unresolved)} file hashes: {len(found)} already stored")
+        
+        return {h: doc_id for h, doc_id in resolved.items() if doc_id is not None}
+    
+    def lookup(self, file_hash: str) -> Optional[str]:
+        """
+        Return the document id stored for a file hash, or None if it is new.
+        
+        Args:
+            file_hash: SHA-256 hash of the file
+        
+        Returns:
+            Existing document id or None
+        """
+        return self.prefetch([file_hash]).get(file_hash)
+    
+    def contains(self, file_hash: str) -> bool:
+        """Check whether a file hash is already stored."""
+        return self.lookup(file_hash) is not None
+    
+    def add(self, file_hash: str, document_id: str) -> None:
+        """
+        Register a newly stored document.
+        
+        Args:
+            file_hash: SHA-256 hash of the file
+            document_id: ID of the stored document
+        """
+        if not file_hash:
+            return
+        self._remember({file_hash: document_id}, [file_hash])
+    
+    def invalidate(self, file_hashes: Optional[Iterable[str]] = None) -> None:
+        """
+        Forget cached answers after rows were deleted.
+        
+        Args:
+            file_hashes: Hashes to forget (all if omitted)
+        """
+        with self._lock:
+            if file_hashes is None:
+                self._entries.clear()
+                return
+            for h in file_hashes:
+                self._entries.pop(h, None)
+    
+    def _remember(self, resolved: Dict[str, Optional[str]], file_hashes: Iterable[str]) -> None:
+        """Cache the answers for ``file_hashes``, evicting the oldest entries beyond max_entries."""
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for h in file_hashes:
+                self._entries.pop(h, None)
+                self._entries[h] = (resolved.get(h), expires)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _query(self, file_hashes: list) -> Dict[str, str]:
+        """Fetch stored document ids for the given hashes."""
+        with self.db_pool.cursor() as cursor:
+            self.db_pool.execute_prepared(cursor, "duplicate_gate_lookup", (list(file_hashes),))
+            rows = cursor.fetchall()
+        
+        return {file_hash: doc_id for file_hash, doc_id in rows}
@@ -0,0 +1,109 @@
+"""
+Registry of the embedding models behind the stored vectors.
+Ingestion and search read the active model from here; the re-embed command switches it.
+"""
+
+import logging
+from typing import Any, Optional
+
+from .database import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_versions (
+    model TEXT PRIMARY KEY,
+    dimension INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    activated_at TIMESTAMPTZ
+)
+"""
+
+
+class EmbeddingVersions:
+    """
+    Records which sentence-transformer produced the vectors in haystack_documents.
+
+    Exactly one model is 'active' (its vectors live in the embedding and
+    embedding_metadata columns). A model being backfilled by the re-embed
+    command is 'building' (its vectors live in the shadow columns), and
+    models switched away from are 'retired'.
+    """
+
+    def __init__(self, db_pool: DatabasePool):
+        """
+        Initialize embedding version registry.
+
+        Args:
+            db_pool: Shared DatabasePool
+        """
+        self.db_pool = db_pool
+        self.db_pool.prepare(
+            "embedding_versions_active",
+            "SELECT model FROM embedding_versions WHERE status = 'active' LIMIT 1"
+        )
+
+    def ensure(self, default_model: str, dimension: int) -> str:
+        """
+        Create the table if needed and return the active model.
+
+        A database without a recorded model is assumed to hold vectors of
+        ``default_model`` (the configured model that wrote them).
+
+        Args:
+            default_model: Model to record when none is active yet
+            dimension: Vector dimension of ``default_model``
+
+        Returns:
+            Name of the active model
+        """
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_SQL)
+            cursor.execute("""
+                INSERT INTO embedding_versions (model, dimension, status, activated_at)
+                SELECT %s, %s, 'active', now()
+                WHERE NOT EXISTS (SELECT 1 FROM embedding_versions WHERE status = 'active')
+                ON CONFLICT (model) DO NOTHING
+            """, (default_model, dimension))
+
+        return self.active_model() or default_model
+
+    def active_model(self) -> Optional[str]:
+        """Return the model whose vectors are currently searched, or None if unknown."""
+        try:
+            with self.db_pool.cursor() as cursor:
+                self.db_pool.execute_prepared(cursor, "embedding_versions_active")
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Could not read active embedding model: {e}")
+            return None
+        return row[0] if row else None
+
+    def building_model(self, cursor: Any) -> Optional[str]:
+        """Return the model currently being backfilled into the shadow columns."""
+        cursor.execute("SELECT model FROM embedding_versions WHERE status = 'building' LIMIT 1")
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def mark_building(self, cursor: Any, model: str, dimension: int) -> None:
+        """Record ``model`` as the one being backfilled (replacing any other build)."""
+        cursor.execute("DELETE FROM embedding_versions WHERE status = 'building' AND model <> %s", (model,))
+        cursor.execute("""
+            INSERT INTO embedding_versions (model, dimension, status)
+            VALUES (%s, %s, 'building')
+            ON CONFLICT (model) DO UPDATE
+            SET dimension = EXCLUDED.dimension, status = 'building', created_at = now(), activated_at = NULL
+        """, (model, dimension))
+
+    def activate(self, cursor: Any, model: str) -> None:
+        """
+        Make ``model`` the active version and retire the previous one.
+
+        Runs on the caller's cursor so it commits together with the column swap.
+        """
+        cursor.execute("UPDATE embedding_versions SET status = 'retired' WHERE status = 'active'")
+        cursor.execute(
+            "UPDATE embedding_versions SET status = 'active', activated_at = now() WHERE model = %s",
+            (model,)
+        )
@@ -0,0 +1,113 @@
+"""
+Manifest of files seen by the ingest daemon.
+Records (path, size, mtime, hash, status) so only new or changed files are ingested.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ManifestEntry(NamedTuple):
+    """Last known state of a file."""
+    path: str
+    size: int
+    mtime_ns: int
+    file_hash: Optional[str]
+    status: str
+
+
+class IngestManifest:
+    """
+    SQLite-backed manifest keyed by file path.
+
+    A file is part of the delta when it is not in the manifest or its size or
+    mtime changed. Failed files are only retried when they change or when the
+    caller asks for it (e.g. on a periodic full rescan).
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize ingest manifest.
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_manifest (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                file_hash TEXT,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        logger.info(f"IngestManifest opened at {self.path}")
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Return the manifest entry of a path, or None if it was never seen."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, mtime_ns, file_hash, status FROM ingest_manifest WHERE path = ?", (str(path),)
+            ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def needs_ingest(self, path: str, size: int, mtime_ns: int, retry_failed: bool = False) -> bool:
+        """
+        Check whether a file is new, changed, or (with ``retry_failed``) previously failed.
+
+        Args:
+            path: File path
+            size: Current size in bytes
+            mtime_ns: Current modification time in nanoseconds
+            retry_failed: Also return True for unchanged files whose last ingestion failed
+        """
+        entry = self.get(path)
+        if entry is None or entry.size != size or entry.mtime_ns != mtime_ns:
+            return True
+        return retry_failed and entry.status == "failed"
+
+    def record(self, path: str, size: int, mtime_ns: int, file_hash: Optional[str], status: str) -> None:
+        """
+        Store the state of a file after an ingestion attempt.
+
+        Args:
+            path: File path
+            size: Size in bytes when it was hashed
+            mtime_ns: Modification time when it was hashed
+            file_hash: SHA-256 hash (None if hashing failed)
+            status: ProcessingStatus value of the attempt
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ingest_manifest (path, size, mtime_ns, file_hash, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (str(path), size, mtime_ns, file_hash, status, time.time())
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of files per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM ingest_manifest GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,214 @@
+"""
+Durable per-file ingestion journal.
+Records how far each file got through ingestion, with the intermediate artifacts,
+so an interrupted batch resumes every file at its last completed stage.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ingestion stages in order; a file's stage only ever moves forward
+STAGES = ("hashed", "text_extracted", "metadata", "facts", "embedded", "stored")
+
+
+class JournalEntry(NamedTuple):
+    """Journal row of one file."""
+    file_hash: str
+    file_path: str
+    stage: str
+    error: Optional[str]
+    updated_at: float
+
+
+class IngestionJournal:
+    """
+    SQLite-backed journal of ingestion stages keyed by file hash.
+
+    Each completed stage can carry a JSON artifact (extracted text, metadata,
+    facts, embeddings). Artifacts are dropped once the file reaches "stored",
+    because the database then holds everything needed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize ingestion journal.
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Every recorded stage must survive a crash
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_journal (
+                file_hash TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                stage_index INTEGER NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_artifacts (
+                file_hash TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (file_hash, stage)
+            )
+            """
+        )
+        logger.info(f"IngestionJournal opened at {self.path}")
+
+    def record(self, file_hash: str, stage: str, artifact: Any = None, file_path: Optional[str] = None) -> None:
+        """
+        Mark a stage as completed for a file, storing its artifact in the same transaction.
+
+        Recording an earlier stage than the current one is a no-op, so replays
+        never move a file backwards.
+
+        Args:
+            file_hash: SHA-256 hash of the file
+            stage: One of STAGES
+            artifact: JSON-serializable output of the stage (optional)
+            file_path: Source path (required the first time a file is recorded)
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown ingestion stage: {stage}")
+
+        index = STAGES.index(stage)
+        payload = json.dumps(artifact, ensure_ascii=False, default=str) if artifact is not None else None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stage_index, file_path FROM ingestion_journal WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+            if row is not None and row[0] > index:
+                return
+            if row is None and file_path is None:
+                raise ValueError(f"file_path is required to start a journal entry for {file_hash}")
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    """
+                    INSERT INTO ingestion_journal (file_hash, file_path, stage, stage_index, error, updated_at)
+                    VALUES (?, ?, ?, ?, NULL, ?)
+                    ON CONFLICT (file_hash) DO UPDATE
+                    SET file_path = excluded.file_path,
+                        stage = excluded.stage,
+                        stage_index = excluded.stage_index,
+                        error = NULL,
+                        updated_at = excluded.updated_at
+                    """,
+                    (file_hash, file_path or row[1], stage, index, time.time())
+                )
+                if stage == STAGES[-1]:
+                    self._conn.execute("DELETE FROM ingestion_artifacts WHERE file_hash = ?", (file_hash,))
+                elif payload is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO ingestion_artifacts (file_hash, stage, payload) VALUES (?, ?, ?)",
+                        (file_hash, stage, payload)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def record_error(self, file_hash: str, error: str) -> None:
+        """
+        Attach the last error to a file without changing its stage.
+
+        Args:
+            file_hash: SHA-256 hash of the file
+            error: Error message
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ingestion_journal SET error = ?, updated_at = ? WHERE file_hash = ?",
+                (error, time.time(), file_hash)
+            )
+
+    def forget(self, file_hash: str) -> None:
+        """Remove a file and its artifacts from the journal."""
+        with self._lock:
+            self._conn.execute("DELETE FROM ingestion_artifacts WHERE file_hash = ?", (file_hash,))
+            self._conn.execute("DELETE FROM ingestion_journal WHERE file_hash = ?", (file_hash,))
+
+    def stage(self, file_hash: str) -> Optional[str]:
+        """Return the last completed stage of a file, or None if it was never journaled."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stage FROM ingestion_journal WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def reached(self, file_hash: str, stage: str) -> bool:
+        """Check whether a file has completed ``stage`` (or a later one)."""
+        current = self.stage(file_hash)
+        return current is not None and STAGES.index(current) >= STAGES.index(stage)
+
+    def artifact(self, file_hash: str, stage: str) -> Optional[Any]:
+        """
+        Return the stored artifact of a stage, or None if there is none.
+
+        Args:
+            file_hash: SHA-256 hash of the file
+            stage: One of STAGES
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM ingestion_artifacts WHERE file_hash = ? AND stage = ?", (file_hash, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pending(self, include_failed: bool = False) -> List[JournalEntry]:
+        """
+        Return files that started ingestion but were never stored, oldest first.
+
+        Files whose last attempt failed are left out unless ``include_failed``
+        is set: resuming them would fail the same way. Recording a later stage
+        (e.g. when the file is ingested again) clears the error.
+
+        Args:
+            include_failed: Also return files with a recorded error
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT file_hash, file_path, stage, error, updated_at FROM ingestion_journal
+                WHERE stage_index < ? AND (? OR error IS NULL) ORDER BY updated_at ASC
+                """,
+                (len(STAGES) - 1, include_failed)
+            ).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of files at each stage."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, COUNT(*) FROM ingestion_journal GROUP BY stage"
+            ).fetchall()
+        counts = {stage: 0 for stage in STAGES}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+Lets re-ingestion replay metadata and fact extraction without network calls.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of LLM responses keyed by request content.
+
+    Keys are SHA-256 digests of everything that determines a response (input
+    text, prompt version, template id, model and generation kwargs), so a
+    changed prompt or model never returns a stale answer. When the stored
+    responses exceed ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize LLM response cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Upper bound on the total size of cached responses
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                model TEXT,
+                prompt_version TEXT,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_responses_accessed_idx ON llm_responses (accessed_at)"
+        )
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        self._total_bytes = int(row[0])
+        logger.info(f"LLMResponseCache opened at {self.path} ({self._total_bytes} bytes cached)")
+
+    @staticmethod
+    def make_key(
+        text: str,
+        prompt_version: str,
+        model: str,
+        template_id: str = "",
+        generation_kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            text: Document text (or rendered prompt) sent to the model
+            prompt_version: Version tag of the prompt wording
+            model: Model name
+            template_id: Fact template id (empty for metadata extraction)
+            generation_kwargs: Sampling parameters (temperature, max_tokens, ...)
+
+        Returns:
+            Hexadecimal SHA-256 key
+        """
+        payload = json.dumps(
+            {
+                "text": text,
+                "prompt_version": prompt_version,
+                "model": model,
+                "template_id": template_id,
+                "generation_kwargs": generation_kwargs or {}
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for a key, or None on a miss.
+
+        Args:
+            key: Key from ``make_key``
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                MetricsRegistry().inc("llm_cache_lookups_total", result="miss")
+                return None
+
+            self.hits += 1
+            MetricsRegistry().inc("llm_cache_lookups_total", result="hit")
+            self._conn.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def put(self, key: str, response: str, model: str = "", prompt_version: str = "") -> None:
+        """
+        Store a response, evicting least recently used entries if over budget.
+
+        Args:
+            key: Key from ``make_key``
+            response: Raw response text
+            model: Model name (informational)
+            prompt_version: Prompt version (informational)
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning(f"Response of {size} bytes exceeds cache budget, not caching")
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses
+                    (key, response, model, prompt_version, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, response, model, prompt_version, size, now, now)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is at 90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"
+        )
+        victims = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+            evicted += 1
+        rows.close()
+
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", victims)
+        logger.info(f"Evicted {evicted} cached LLM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, size and hit/miss counters."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
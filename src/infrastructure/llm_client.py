@@ -0,0 +1,333 @@
+"""
+Shared rate-limited OpenAI client for the extraction stages.
+Schedules chat completions under requests/min and tokens/min budgets and retries transient failures.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying (rate limits, timeouts, conflicts and server errors)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMResponse(NamedTuple):
+    """Text and bookkeeping of a single chat completion."""
+    text: str
+    model: str
+    finish_reason: Optional[str]
+    usage: Dict[str, int]
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket used on a single event loop.
+
+    ``acquire`` waits (first come, first served) until enough capacity has
+    refilled. ``adjust`` corrects an earlier estimate once the real cost is
+    known and may leave the bucket in debt; ``pause`` blocks all callers,
+    e.g. for a server-provided Retry-After.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            per_minute: Sustained budget per minute (also the burst capacity)
+        """
+        self.capacity = float(per_minute)
+        self.refill_per_second = float(per_minute) / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until ``amount`` tokens are available and take them.
+
+        Args:
+            amount: Tokens needed (clamped to the bucket capacity)
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        amount = min(float(amount), self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.refill_per_second)
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or charge extra (negative) tokens."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + delta)
+
+    def pause(self, seconds: float) -> None:
+        """Block every caller for the next ``seconds``."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server-requested delay from an API error, if any.
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        Seconds to wait, or None if the response carries no Retry-After
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+
+    return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RateLimitedLLMClient:
+    """
+    Rate-limited, retrying wrapper around ``openai.AsyncOpenAI``.
+
+    All requests run on one background event loop, so the request and token
+    buckets are shared by every caller in the process whether they are
+    coroutines (``achat_completion``) or worker threads (``chat_completion``).
+    Budgets are scaled by ``headroom`` to stay just under the account limits.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 30000,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        timeout_seconds: float = 120.0,
+        headroom: float = 0.9,
+        client: Optional[Any] = None,
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize rate-limited client.
+
+        Args:
+            api_key: OpenAI API key
+            requests_per_minute: Account request limit
+            tokens_per_minute: Account token limit
+            max_concurrency: Maximum requests in flight
+            max_retries: Retries after the first attempt for transient errors
+            timeout_seconds: Per-request timeout
+            headroom: Fraction of the limits to actually use
+            client: Pre-built async client (defaults to ``openai.AsyncOpenAI``)
+            base_url: OpenAI-compatible endpoint (None for the official API)
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout_seconds = timeout_seconds
+        self.request_bucket = TokenBucket(max(1, requests_per_minute * headroom))
+        self.token_bucket = TokenBucket(max(1, tokens_per_minute * headroom))
+        self._client = client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._metrics = MetricsRegistry()
+        logger.info(
+            f"RateLimitedLLMClient initialized (rpm={requests_per_minute}, tpm={tokens_per_minute}, "
+            f"concurrency={max_concurrency}, retries={max_retries})"
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="llm-client-loop", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def chat_completion(self, messages: List[Dict[str, str]], model: str, **kwargs: Any) -> LLMResponse:
+        """
+        Blocking chat completion, safe to call from any thread.
+
+        Args:
+            messages: OpenAI-style messages
+            model: Model name
+            **kwargs: Generation kwargs (temperature, max_tokens, response_format, ...)
+
+        Returns:
+            LLMResponse
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete(messages, model, kwargs), self._ensure_loop()
+        )
+        return future.result()
+
+    def chat_completions(
+        self,
+        requests: Sequence[List[Dict[str, str]]],
+        model: str,
+        **kwargs: Any
+    ) -> List[Any]:
+        """
+        Blocking fan-out of several chat completions, scheduled concurrently.
+        
+        Args:
+            requests: One message list per completion
+            model: Model name
+            **kwargs: Generation kwargs shared by every request
+        
+        Returns:
+            LLMResponse (or the raised exception) per request, in input order
+        """
+        loop = self._ensure_loop()
+        futures = [
+            asyncio.run_coroutine_threadsafe(self._complete(messages, model, kwargs), loop)
+            for messages in requests
+        ]
+        
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def achat_completion(self, messages: List[Dict[str, str]], model: str, **kwargs: Any) -> LLMResponse:
+        """
+        Async chat completion, awaitable from any event loop.
+
+        Args:
+            messages: OpenAI-style messages
+            model: Model name
+            **kwargs: Generation kwargs (temperature, max_tokens, response_format, ...)
+
+        Returns:
+            LLMResponse
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete(messages, model, kwargs), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int = 0) -> int:
+        """Rough token cost of a request: prompt characters / 4 plus the completion allowance."""
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in messages)
+        return prompt_chars // 4 + max_tokens
+
+    def _is_retryable(self, error: Exception) -> bool:
+        import openai
+
+        if isinstance(error, (openai.APIConnectionError, asyncio.TimeoutError)):
+            return True
+        return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            # Retries are handled here so they respect the shared buckets
+            self._client = AsyncOpenAI(
+                api_key=self.api_key, base_url=self.base_url, max_retries=0, timeout=self.timeout_seconds
+            )
+        return self._client
+
+    async def _complete(self, messages: List[Dict[str, str]], model: str, kwargs: Dict[str, Any]) -> LLMResponse:
+        """Run one completion on the background loop with rate limiting and retries."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        client = self._get_client()
+        estimate = self.estimate_tokens(messages, kwargs.get("max_tokens") or 0)
+        attempt = 0
+
+        while True:
+            with self._metrics.timer("llm_rate_limit_wait_seconds", model=model):
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimate)
+
+            try:
+                async with self._semaphore:
+                    with self._metrics.timer("llm_request_seconds", model=model):
+                        response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    self._metrics.inc("llm_requests_total", model=model, outcome="error")
+                    logger.error(f"LLM request failed after {attempt + 1} attempt(s): {e}")
+                    raise
+                self._metrics.inc("llm_requests_total", model=model, outcome="retry")
+
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    # The server asked everyone to back off, not just this request
+                    delay = retry_after + random.uniform(0, 0.5)
+                    self.request_bucket.pause(delay)
+                    self.token_bucket.pause(delay)
+                else:
+                    delay = backoff_delay(attempt)
+
+                attempt += 1
+                logger.warning(f"LLM request failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            usage = {}
+            if getattr(response, "usage", None) is not None:
+                usage = {
+                    "prompt_tokens": response.usage.prompt_tokens,
+                    "completion_tokens": response.usage.completion_tokens,
+                    "total_tokens": response.usage.total_tokens
+                }
+                # Settle the reservation against what the request really cost
+                self.token_bucket.adjust(estimate - usage["total_tokens"])
+                self._metrics.inc("llm_tokens_total", usage["prompt_tokens"], model=model, kind="prompt")
+                self._metrics.inc("llm_tokens_total", usage["completion_tokens"], model=model, kind="completion")
+            self._metrics.inc("llm_requests_total", model=model, outcome="ok")
+
+            choice = response.choices[0]
+            return LLMResponse(
+                text=(choice.message.content or "").strip(),
+                model=getattr(response, "model", model),
+                finish_reason=choice.finish_reason,
+                usage=usage
+            )
@@ -0,0 +1,292 @@
+"""
+Process-wide latency, throughput and gauge metrics.
+Exported as Prometheus text or a JSON snapshot, and shown in the CLI Performance menu.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Recent samples kept per histogram for the percentiles
+DEFAULT_WINDOW = 2048
+
+PROMETHEUS_PREFIX = "casemind_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    ]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _nearest_rank(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of sorted values."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(q / 100.0 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+class Histogram:
+    """
+    Distribution of observed values.
+
+    Count, sum and max cover every observation; percentiles are computed
+    over the most recent ``window`` samples, so they follow the current
+    workload rather than the whole process lifetime.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Initialize histogram.
+
+        Args:
+            window: Number of recent samples used for percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (``q`` in 0..100) of the recent samples."""
+        return _nearest_rank(sorted(self._samples), q)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, sum, mean, p50/p95/p99 and max."""
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": _nearest_rank(ordered, 50),
+            "p95": _nearest_rank(ordered, 95),
+            "p99": _nearest_rank(ordered, 99),
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """
+    Singleton registry of histograms, counters and gauges.
+
+    Metrics are identified by name plus keyword labels, e.g.
+    ``observe("component_seconds", 0.4, component="fact_extractor")``.
+    Gauges that are cheaper to read on demand (queue depths) are registered
+    as collectors and evaluated when a snapshot is taken.
+    """
+
+    _instance: Optional['MetricsRegistry'] = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls) -> 'MetricsRegistry':
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance._histograms = {}
+                instance._counters = {}
+                instance._gauges = {}
+                instance._collectors = {}
+                cls._instance = instance
+        return cls._instance
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value (usually seconds) in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(float(value))
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        """Increase a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = float(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the wall-clock duration of a ``with`` block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def register_collector(self, name: str, label: str, collect: Callable[[], Dict[str, float]]) -> None:
+        """
+        Register a gauge family read on demand.
+
+        Args:
+            name: Gauge name
+            label: Label name for the keys returned by ``collect``
+            collect: Returns {label value: gauge value}
+        """
+        with self._lock:
+            self._collectors[name] = (label, collect)
+
+    def unregister_collector(self, name: str) -> None:
+        """Remove a collector registered with ``register_collector``."""
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def _collect_gauges(self) -> Dict[Tuple[str, LabelKey], float]:
+        with self._lock:
+            gauges = dict(self._gauges)
+            collectors = list(self._collectors.items())
+
+        for name, (label, collect) in collectors:
+            try:
+                values = collect()
+            except Exception as e:
+                logger.warning(f"Metrics collector '{name}' failed: {e}")
+                continue
+            for label_value, value in values.items():
+                gauges[(name, ((label, str(label_value)),))] = float(value)
+        return gauges
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Current value of every metric.
+
+        Returns:
+            {"histograms": [...], "counters": [...], "gauges": [...]}, each entry
+            holding name, labels and the values
+        """
+        gauges = self._collect_gauges()
+        with self._lock:
+            histograms = [
+                {"name": name, "labels": dict(labels), **histogram.summary()}
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {
+            "histograms": histograms,
+            "counters": counters,
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(gauges.items())
+            ],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """JSON snapshot of every metric."""
+        return json.dumps({"timestamp": time.time(), **self.snapshot()}, indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format (histograms as summaries)."""
+        gauges = self._collect_gauges()
+        with self._lock:
+            histograms = {key: histogram.summary() for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines: List[str] = []
+
+        def family(values: Dict[Tuple[str, LabelKey], Any], kind: str, write: Callable[[str, LabelKey, Any], None]) -> None:
+            last = None
+            for (name, labels), value in sorted(values.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric != last:
+                    lines.append(f"# TYPE {metric} {kind}")
+                    last = metric
+                write(metric, labels, value)
+
+        def write_summary(metric: str, labels: LabelKey, summary: Dict[str, float]) -> None:
+            for quantile, field in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f"{metric}{_format_labels(labels, ('quantile', quantile))} {summary[field]}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {summary['sum']}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {summary['count']}")
+
+        def write_value(metric: str, labels: LabelKey, value: float) -> None:
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        family(histograms, "summary", write_summary)
+        family(counters, "counter", write_value)
+        family(gauges, "gauge", write_value)
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop every recorded value (collectors stay registered)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> Any:
+    """
+    Serve the registry over HTTP from a daemon thread.
+
+    ``/metrics`` returns Prometheus text and ``/metrics.json`` a JSON snapshot.
+
+    Args:
+        port: TCP port (0 picks a free one)
+        host: Interface to bind
+
+    Returns:
+        The running ThreadingHTTPServer (``server_address`` holds the bound port)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = MetricsRegistry()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+            elif path == "/metrics.json":
+                body, content_type = registry.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    logger.info(f"Metrics served on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,137 @@
+"""
+Process-wide registry of heavy models and shared resources using Singleton pattern.
+Each model is loaded once per process and handed out to every component that needs it.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Singleton registry of shared model and resource instances.
+    
+    Resources are keyed by kind and name (e.g. the embedding model name), so
+    the ingestion and similarity pipelines get the same SentenceTransformer,
+    CrossEncoder and template dictionary instead of loading their own copies.
+    """
+    
+    _instance: Optional['ModelRegistry'] = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls) -> 'ModelRegistry':
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._resources = {}
+                instance._key_locks = {}
+                instance._lock = threading.Lock()
+                cls._instance = instance
+        return cls._instance
+    
+    def get_shared(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the shared instance for a key, creating it on first use.
+        
+        Concurrent callers asking for the same key wait for a single load.
+        
+        Args:
+            key: Resource key
+            factory: Zero-argument callable that builds the resource
+        
+        Returns:
+            Shared resource instance
+        """
+        with self._lock:
+            if key in self._resources:
+                return self._resources[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self._lock:
+                if key in self._resources:
+                    return self._resources[key]
+            
+            resource = factory()
+            
+            with self._lock:
+                self._resources[key] = resource
+            return resource
+    
+    def is_loaded(self, key: Hashable) -> bool:
+        """Check whether a resource has already been created."""
+        with self._lock:
+            return key in self._resources
+    
+    def get_sentence_transformer(self, model_name: str) -> Any:
+        """
+        Get the shared SentenceTransformer for a model name.
+        
+        Args:
+            model_name: Sentence transformer model name
+        
+        Returns:
+            SentenceTransformer instance
+        """
+        def load():
+            from sentence_transformers import SentenceTransformer
+            logger.info(f"Loading sentence transformer: {model_name}")
+            return SentenceTransformer(model_name)
+        
+        return self.get_shared(("sentence_transformer", model_name), load)
+    
+    def get_cross_encoder(self, model_name: str) -> Any:
+        """
+        Get the shared CrossEncoder for a model name.
+        
+        Args:
+            model_name: Cross-encoder model name
+        
+        Returns:
+            CrossEncoder instance
+        """
+        def load():
+            from sentence_transformers import CrossEncoder
+            logger.info(f"Loading cross-encoder: {model_name}")
+            return CrossEncoder(model_name)
+        
+        return self.get_shared(("cross_encoder", model_name), load)
+    
+    def get_templates(self, templates_dir: str) -> Dict[str, dict]:
+        """
+        Get all fact-extraction templates in a directory, loaded once.
+        
+        Args:
+            templates_dir: Path to templates directory
+        
+        Returns:
+            Mapping of template_id -> template data
+        """
+        templates_dir = Path(templates_dir)
+        
+        def load():
+            templates = {}
+            
+            if not templates_dir.exists():
+                logger.warning(f"Templates directory not found: {templates_dir}")
+                return templates
+            
+            for template_file in templates_dir.glob("*.json"):
+                if template_file.name == "templates.json":
+                    continue
+                
+                try:
+                    with open(template_file, 'r', encoding='utf-8') as f:
+                        templates[template_file.stem] = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load template {template_file}: {e}")
+            
+            logger.info(f"Loaded {len(templates)} templates from {templates_dir}")
+            return templates
+        
+        return self.get_shared(("templates", str(templates_dir.resolve())), load)
@@ -4,6 +4,7 @@ Main entry point for the application.
 """
 
 import sys
+import time
 import asyncio
 import logging
 from pathlib import Path
@@ -11,10 +12,33 @@ from pathlib import Path
 # Ensure src is in path
 sys.path.insert(0, str(Path(__file__).parent))
 
+_import_start = time.perf_counter()
+
 from presentation.cli_app import main as cli_main
 from utils.helpers import setup_logging
 from core.config import Config
 
+# Time spent importing the CLI (heavy ML libraries must not be imported here)
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
+
+def check_import_budget(config: Config) -> bool:
+    """
+    Check that importing the CLI stayed within STARTUP_IMPORT_BUDGET seconds.
+    
+    Returns:
+        True if within budget, False otherwise
+    """
+    budget = config.startup_import_budget
+    if IMPORT_SECONDS <= budget:
+        return True
+    
+    # Logging is usually disabled for the CLI, so report on stderr as well
+    message = f"Startup imports took {IMPORT_SECONDS:.2f}s (budget {budget:.2f}s)"
+    logging.getLogger(__name__).warning(message)
+    print(f"Warning: {message}", file=sys.stderr)
+    return False
+
 
 def main():
     """Main application entry point."""
@@ -25,6 +49,7 @@ def main():
     
     logger = logging.getLogger(__name__)
     logger.info("Starting CaseMind application")
+    check_import_budget(config)
     
     # Run CLI application
     try:
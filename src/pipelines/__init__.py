@@ -6,17 +6,37 @@ from .haystack_custom_nodes import (
     DuplicateCheckNode,
     TemplateLoaderNode,
     FactExtractorNode,
-    ThresholdFilterNode
+    ThresholdFilterNode,
+    QueryEmbedderNode,
+    CrossEncoderRankerNode,
+    CachedChatGenerator,
+    RateLimitedChatGenerator,
+    SectionPreClassifierNode,
+    CombinedExtractorNode,
+    FallbackMetadataExtractorNode,
+    PromptCompressorNode,
+    JournalCheckpointNode
 )
 from .haystack_ingestion_pipeline import HaystackIngestionPipeline
+from .ingestion_executor import IngestionExecutor
 from .pure_haystack_similarity_pipeline import PureHaystackSimilarityPipeline
 
 __all__ = [
     'HaystackIngestionPipeline',
     'PureHaystackSimilarityPipeline',
+    'IngestionExecutor',
     'DuplicateCheckNode',
     'TemplateLoaderNode',
     'FactExtractorNode',
-    'ThresholdFilterNode'
+    'ThresholdFilterNode',
+    'QueryEmbedderNode',
+    'CrossEncoderRankerNode',
+    'CachedChatGenerator',
+    'RateLimitedChatGenerator',
+    'SectionPreClassifierNode',
+    'CombinedExtractorNode',
+    'FallbackMetadataExtractorNode',
+    'PromptCompressorNode',
+    'JournalCheckpointNode'
 ]
 
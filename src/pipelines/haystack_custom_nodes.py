@@ -6,15 +6,119 @@ Uses @component decorator following Haystack 2.0 patterns.
 import logging
 import hashlib
 import json
-import openai
+import re
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, NamedTuple, Callable, Tuple
 from haystack import component, Document
+from haystack.dataclasses import ChatMessage
 from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 
+from infrastructure.database import DatabasePool, to_vector_literal
+from infrastructure.duplicate_gate import DuplicateGate
+from infrastructure.ingestion_journal import IngestionJournal
+from infrastructure.model_registry import ModelRegistry
+from infrastructure.llm_cache import LLMResponseCache
+from infrastructure.llm_client import RateLimitedLLMClient
+from infrastructure.metrics import MetricsRegistry
+from utils.chunking import chunk_sections, merge_partial_facts
+from utils.prompt_compression import PromptCompressor
+
 logger = logging.getLogger(__name__)
 
+# doc.meta key of the compressed text written by PromptCompressorNode (LLM input only, never stored)
+COMPRESSED_CONTENT_KEY = "compressed_content"
+
+
+# Shared by the fact-only and the combined (metadata + facts) extraction prompts
+FACT_EXTRACTION_GUIDELINES = """**EXTRACTION GUIDELINES**:
+
+        **TIER 1 - DETERMINATIVE FACTS**: Core facts that determine guilt, liability, or legal outcomes
+        **TIER 2 - MATERIAL FACTS**: Facts that significantly affect rights, duties, or case outcome  
+        **TIER 3 - CONTEXTUAL FACTS**: Environmental and circumstantial details
+        **TIER 4 - PROCEDURAL FACTS**: Court metadata, case details, and procedural information
+        **RESIDUAL DETAILS**: Any other relevant facts not captured above
+        
+        **CRITICAL EXTRACTION RULES**:
+        1. Write each extracted value as a complete, coherent sentence that makes sense on its own
+        2. When concatenated together, all extracted facts should form a readable narrative summary
+        3. Each fact should flow naturally into the next when combined
+        4. Use transitional phrases and connecting words to ensure readability
+        5. Extract facts directly from the case text with narrative coherence
+        6. Be comprehensive and accurate while maintaining story flow
+        7. If a field is not found in the text, use null
+        8. Organize facts according to their legal significance
+        9. Each extracted fact should contribute to a unified case story when all values are joined together"""
+
+# Legal section (normalized, e.g. "ipc_304") -> fact template id
+IPC_TEMPLATE_MAPPINGS = {
+    'ipc_302': 'ipc_302',
+    'ipc_304': 'ipc_304_p2',
+    'ipc_306': 'ipc_306',
+    'ipc_307': 'ipc_307',
+    'ipc_323': 'ipc_323',
+    'ipc_324': 'ipc_324',
+    'ipc_354': 'ipc_354',
+    'ipc_354a': 'ipc_354a',
+    'ipc_363': 'ipc_363',
+    'ipc_376': 'ipc_376',
+    'ipc_379': 'ipc_379',
+    'ipc_380': 'ipc_380',
+    'ipc_392': 'ipc_392',
+    'ipc_394': 'ipc_394',
+    'ipc_395': 'ipc_395',
+    'ipc_397': 'ipc_397',
+    'ipc_498a': 'ipc_498a',
+}
+
+
+# Section mentions such as "Section 302 IPC", "u/s 302/34 I.P.C." or "Sections 376(2) and 506 of the Indian Penal Code"
+_SECTION_NUMBER = r"\d{2,3}(?!\d)(?:[A-Z](?![A-Za-z]))?"
+SECTION_BEFORE_ACT_PATTERN = re.compile(
+    r"(?:sections?|secs?\.?|u/s\.?|s\.)\s*"
+    r"((?:" + _SECTION_NUMBER + r"(?:\s*\([^)]{1,5}\))*\s*(?:,|/|&|and|r/w)?\s*)+)"
+    r"(?:of\s+(?:the\s+)?)?(?:IPC|I\.\s*P\.\s*C\.?|Indian\s+Penal\s+Code)",
+    re.IGNORECASE
+)
+SECTION_AFTER_ACT_PATTERN = re.compile(
+    r"(?:IPC|I\.\s*P\.\s*C\.?)\s*(?:sections?|s\.)?\s*(" + _SECTION_NUMBER + r")",
+    re.IGNORECASE
+)
+
+
+def match_section_to_template(section: str, templates: Dict[str, dict]) -> str:
+    """Match a legal section (e.g. "IPC 302") to a template ID, falling back to 'legal_case'."""
+    section_normalized = section.lower().replace(' ', '_')
+    
+    # Check direct mappings
+    for pattern, template_id in IPC_TEMPLATE_MAPPINGS.items():
+        if pattern in section_normalized:
+            if template_id in templates:
+                return template_id
+    
+    # Fallback to generic template
+    return 'legal_case'
+
+
+def prompt_text(doc: Document) -> str:
+    """Text the LLM stages work on: the compressed content if available, else the full content."""
+    return doc.meta.get(COMPRESSED_CONTENT_KEY) or doc.content or ""
+
+
+def template_cache_id(template_id: str, template: dict) -> str:
+    """Template id plus a digest of its schema, so edited templates miss the LLM cache."""
+    schema = json.dumps(template.get("json_schema", {}), sort_keys=True)
+    digest = hashlib.sha256(schema.encode("utf-8")).hexdigest()[:12]
+    return f"{template_id}@{digest}"
+
+
+class EmbeddedDocument(NamedTuple):
+    """Document paired with its facts and metadata embeddings."""
+    document: Document
+    facts_embedding: Any
+    metadata_embedding: Any
+
 
 @component
 class MarkdownSaverNode:
@@ -147,16 +251,21 @@ class DuplicateCheckNode:
     """
     Haystack component that checks if document already exists in database.
     Uses file hash for duplicate detection.
+    Runs first in the pipeline so duplicates never reach the LLM extractors.
     """
     
-    def __init__(self, document_store: PgvectorDocumentStore):
+    def __init__(self, document_store: PgvectorDocumentStore, duplicate_gate: Optional[DuplicateGate] = None):
         """
         Initialize duplicate checker.
         
         Args:
             document_store: PgvectorDocumentStore instance
+            duplicate_gate: Shared DuplicateGate (created from document_store if omitted)
         """
         self.document_store = document_store
+        self.duplicate_gate = duplicate_gate or DuplicateGate(
+            DatabasePool(str(document_store.connection_string.resolve_value()))
+        )
         logger.info("DuplicateCheckNode initialized")
     
     @component.output_types(documents=List[Document], is_duplicate=bool)
@@ -181,26 +290,8 @@ class DuplicateCheckNode:
             logger.warning("No file_hash in document metadata, cannot check for duplicates")
             return {"documents": documents, "is_duplicate": False}
         
-        # Query document store for existing hash using direct SQL
         try:
-            import psycopg2
-            
-            conn_str = str(self.document_store.connection_string.resolve_value())
-            conn = psycopg2.connect(conn_str)
-            cursor = conn.cursor()
-            
-            # Check if document with this file_hash already exists
-            cursor.execute("""
-                SELECT id FROM haystack_documents 
-                WHERE meta->>'file_hash' = %s
-                LIMIT 1
-            """, (file_hash,))
-            
-            existing = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            if existing:
+            if self.duplicate_gate.contains(file_hash):
                 logger.info(f"Duplicate found with file_hash: {file_hash}")
                 # Return empty documents list to stop pipeline execution
                 return {"documents": [], "is_duplicate": True}
@@ -214,80 +305,76 @@ class DuplicateCheckNode:
 
 
 @component
-class TemplateLoaderNode:
+class JournalCheckpointNode:
     """
-    Haystack component that loads appropriate template based on metadata.
-    Selects template from most_appropriate_section field.
+    Haystack component that records a completed ingestion stage in the journal.
+    Snapshots doc.meta (metadata, facts) so a resumed run can skip the LLM stages.
     """
     
-    def __init__(self, templates_dir: str):
+    def __init__(self, journal: IngestionJournal, stage: str):
         """
-        Initialize template loader.
+        Initialize journal checkpoint.
         
         Args:
-            templates_dir: Path to templates directory
+            journal: Shared IngestionJournal
+            stage: Stage completed by the components before this one
         """
-        self.templates_dir = Path(templates_dir)
-        self.templates = self._load_all_templates()
-        logger.info(f"TemplateLoaderNode initialized with {len(self.templates)} templates")
+        self.journal = journal
+        self.stage = stage
     
-    def _load_all_templates(self) -> Dict[str, dict]:
-        """Load all template JSON files."""
-        templates = {}
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Record the stage for every document with a file hash.
         
-        if not self.templates_dir.exists():
-            logger.warning(f"Templates directory not found: {self.templates_dir}")
-            return templates
+        Args:
+            documents: List of Haystack Documents
         
-        for template_file in self.templates_dir.glob("*.json"):
-            if template_file.name == "templates.json":
+        Returns:
+            dict with documents (unchanged)
+        """
+        for doc in documents:
+            file_hash = doc.meta.get("file_hash")
+            if not file_hash:
                 continue
             
             try:
-                with open(template_file, 'r', encoding='utf-8') as f:
-                    template_data = json.load(f)
-                
-                template_id = template_file.stem
-                templates[template_id] = template_data
-                
+                self.journal.record(
+                    file_hash,
+                    self.stage,
+                    # The compressed text is recomputed on resume, keep it out of the journal
+                    artifact={"meta": {key: value for key, value in doc.meta.items() if key != COMPRESSED_CONTENT_KEY}},
+                    file_path=doc.meta.get("original_file_path", "")
+                )
             except Exception as e:
-                logger.warning(f"Failed to load template {template_file}: {e}")
+                # The journal only saves work on resume, never block ingestion on it
+                logger.warning(f"Failed to journal stage '{self.stage}': {e}")
+        
+        return {"documents": documents}
+
+
+@component
+class TemplateLoaderNode:
+    """
+    Haystack component that loads appropriate template based on metadata.
+    Selects template from most_appropriate_section field.
+    """
+    
+    def __init__(self, templates_dir: str):
+        """
+        Initialize template loader.
         
-        return templates
+        Args:
+            templates_dir: Path to templates directory
+        """
+        self.templates_dir = Path(templates_dir)
+        # Templates are cached process-wide, shared by every loader instance
+        self.templates = ModelRegistry().get_templates(str(self.templates_dir))
+        logger.info(f"TemplateLoaderNode initialized with {len(self.templates)} templates")
     
     def _match_section_to_template(self, section: str) -> str:
         """Match legal section to template ID."""
-        section_normalized = section.lower().replace(' ', '_')
-        
-        # Direct mapping for IPC sections
-        ipc_mappings = {
-            'ipc_302': 'ipc_302',
-            'ipc_304': 'ipc_304_p2',
-            'ipc_306': 'ipc_306',
-            'ipc_307': 'ipc_307',
-            'ipc_323': 'ipc_323',
-            'ipc_324': 'ipc_324',
-            'ipc_354': 'ipc_354',
-            'ipc_354a': 'ipc_354a',
-            'ipc_363': 'ipc_363',
-            'ipc_376': 'ipc_376',
-            'ipc_379': 'ipc_379',
-            'ipc_380': 'ipc_380',
-            'ipc_392': 'ipc_392',
-            'ipc_394': 'ipc_394',
-            'ipc_395': 'ipc_395',
-            'ipc_397': 'ipc_397',
-            'ipc_498a': 'ipc_498a',
-        }
-        
-        # Check direct mappings
-        for pattern, template_id in ipc_mappings.items():
-            if pattern in section_normalized:
-                if template_id in self.templates:
-                    return template_id
-        
-        # Fallback to generic template
-        return 'legal_case'
+        return match_section_to_template(section, self.templates)
     
     @component.output_types(documents=List[Document], template=dict)
     def run(self, documents: List[Document]) -> dict:
@@ -319,6 +406,551 @@ class TemplateLoaderNode:
         return {"documents": documents, "template": template_data}
 
 
+@component
+class PromptCompressorNode:
+    """
+    Haystack component that strips page furniture from document content before any LLM call.
+    Removes "--- Page N ---" markers, running headers/footers and signature boilerplate,
+    and records token counts before/after in doc.meta["prompt_tokens"].
+    
+    doc.content is left intact (it is what the markdown saver writes); the compressed
+    text goes to doc.meta[COMPRESSED_CONTENT_KEY], which only the LLM stages read
+    (through prompt_text) and which is dropped before the document is stored.
+    """
+    
+    def __init__(self, compressor: Optional[PromptCompressor] = None):
+        """
+        Initialize prompt compressor node.
+        
+        Args:
+            compressor: PromptCompressor (default settings if not provided)
+        """
+        self.compressor = compressor or PromptCompressor()
+    
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Compress document content.
+        
+        Args:
+            documents: List of Haystack Documents
+        
+        Returns:
+            dict with documents (compressed text in doc.meta[COMPRESSED_CONTENT_KEY])
+        """
+        for doc in documents:
+            result = self.compressor.compress(doc.content or "")
+            doc.meta[COMPRESSED_CONTENT_KEY] = result.text
+            doc.meta["prompt_tokens"] = {"before": result.tokens_before, "after": result.tokens_after}
+            logger.info(
+                f"Compressed document text: {result.tokens_before} -> {result.tokens_after} tokens "
+                f"({result.reduction:.0%} removed)"
+            )
+        
+        return {"documents": documents}
+
+
+@component
+class SectionPreClassifierNode:
+    """
+    Haystack component that picks a fact template locally, before any LLM call.
+    Counts IPC section mentions (regex), maps them to templates via IPC_TEMPLATE_MAPPINGS
+    and the ontology section map, and boosts candidates whose ontology terms appear in the text.
+    """
+    
+    def __init__(
+        self,
+        templates: Dict[str, dict],
+        section_to_node_map: Optional[Dict[str, List[str]]] = None,
+        term_to_node_map: Optional[Dict[str, List[str]]] = None,
+        confidence_threshold: float = 0.6,
+        min_mentions: int = 2,
+        header_chars: int = 3000,
+        enabled: bool = True
+    ):
+        """
+        Initialize section pre-classifier.
+        
+        Args:
+            templates: Loaded templates (template_id -> template data)
+            section_to_node_map: OntologyMatcher section map ("IPC 302" -> node ids)
+            term_to_node_map: OntologyMatcher term map (term -> node ids)
+            confidence_threshold: Minimum share of the top template's score to be confident
+            min_mentions: Minimum section mentions backing the top template
+            header_chars: Leading characters (title, charges) whose mentions count double
+            enabled: If False, documents pass through and always take the two-call path
+        """
+        self.templates = templates
+        self.section_to_node_map = section_to_node_map or {}
+        self.term_to_node_map = term_to_node_map or {}
+        self.confidence_threshold = confidence_threshold
+        self.min_mentions = min_mentions
+        self.header_chars = header_chars
+        self.enabled = enabled
+        logger.info(f"SectionPreClassifierNode initialized (threshold={confidence_threshold}, enabled={enabled})")
+    
+    @staticmethod
+    def find_sections(text: str) -> List[str]:
+        """Return every IPC section mentioned in the text, in order (e.g. ["IPC 302", "IPC 34"])."""
+        sections = []
+        
+        for match in SECTION_BEFORE_ACT_PATTERN.finditer(text):
+            numbers = re.sub(r"\([^)]*\)", " ", match.group(1))
+            sections.extend(f"IPC {number.upper()}" for number in re.findall(_SECTION_NUMBER, numbers))
+        
+        for match in SECTION_AFTER_ACT_PATTERN.finditer(text):
+            sections.append(f"IPC {match.group(1).upper()}")
+        
+        return sections
+    
+    def _section_template(self, section: str) -> Optional[str]:
+        """Map a normalized section ("IPC 304") to a template id, if one exists."""
+        key = section.lower().replace(' ', '_')
+        template_id = IPC_TEMPLATE_MAPPINGS.get(key)
+        if template_id in self.templates:
+            return template_id
+        
+        for node_id in self.section_to_node_map.get(section, []):
+            if node_id in self.templates:
+                return node_id
+        
+        return key if key in self.templates else None
+    
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Score candidate templates for a document.
+        
+        Returns:
+            dict with template_id (or None), confidence, mentions and ranked candidates
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        mentions: Dict[str, int] = defaultdict(int)
+        
+        header = text[:self.header_chars]
+        for weight, part in ((2.0, header), (1.0, text[self.header_chars:])):
+            for section in self.find_sections(part):
+                template_id = self._section_template(section)
+                if template_id:
+                    scores[template_id] += weight
+                    mentions[template_id] += 1
+        
+        # Ontology example terms only reinforce templates already backed by a section
+        text_lower = text.lower()
+        for term, node_ids in self.term_to_node_map.items():
+            if term and term in text_lower:
+                for node_id in node_ids:
+                    if node_id in scores:
+                        scores[node_id] += 1.0
+        
+        if not scores:
+            return {"template_id": None, "confidence": 0.0, "mentions": 0, "candidates": []}
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        top_id, top_score = ranked[0]
+        return {
+            "template_id": top_id,
+            "confidence": top_score / sum(scores.values()),
+            "mentions": mentions[top_id],
+            "candidates": [template_id for template_id, _ in ranked]
+        }
+    
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Pre-classify documents.
+        
+        Confident documents get meta["preclassified_template_id"]; the others
+        keep the two-call (metadata, then facts) path.
+        
+        Args:
+            documents: List of Haystack Documents
+        
+        Returns:
+            dict with documents
+        """
+        if not self.enabled:
+            return {"documents": documents}
+        
+        for doc in documents:
+            result = self.classify(prompt_text(doc))
+            confident = (
+                result["template_id"] is not None
+                and result["confidence"] >= self.confidence_threshold
+                and result["mentions"] >= self.min_mentions
+            )
+            
+            doc.meta["preclassification_confidence"] = round(result["confidence"], 3)
+            if confident:
+                doc.meta["preclassified_template_id"] = result["template_id"]
+            
+            logger.info(
+                f"Pre-classified as {result['template_id']} "
+                f"(confidence={result['confidence']:.2f}, mentions={result['mentions']}, "
+                f"{'combined' if confident else 'two-call'} path)"
+            )
+        
+        return {"documents": documents}
+
+
+@component
+class CombinedExtractorNode:
+    """
+    Haystack component that extracts metadata and template facts in one LLM call.
+    Runs only for documents the SectionPreClassifierNode was confident about and
+    that fit in a single fact-extraction pass; longer judgments are left to the
+    front-matter metadata call and the chunked fact extraction. The facts are kept
+    only if the returned most_appropriate_section maps to the same template.
+    """
+    
+    # Bump whenever the combined prompt wording changes so cached responses are not reused
+    PROMPT_VERSION = "combined-v2"
+    
+    def __init__(
+        self,
+        llm_client: RateLimitedLLMClient,
+        templates: Dict[str, dict],
+        metadata_instructions: str,
+        expected_keys: List[str],
+        model: str = "gpt-4o-2024-08-06",
+        cache: Optional[LLMResponseCache] = None,
+        max_chars: int = 6000
+    ):
+        """
+        Initialize combined extractor.
+        
+        Args:
+            llm_client: Shared rate-limited client
+            templates: Loaded templates (template_id -> template data)
+            metadata_instructions: Static part of the metadata prompt (everything but the document)
+            expected_keys: Metadata keys to copy into doc.meta
+            model: OpenAI model to use
+            cache: Optional LLM response cache
+            max_chars: Longest text sent in one combined call (FactExtractorNode's single-pass limit)
+        """
+        self.llm_client = llm_client
+        self.templates = templates
+        self.metadata_instructions = metadata_instructions
+        self.expected_keys = expected_keys
+        self.model = model
+        self.cache = cache
+        self.max_chars = max_chars
+        self.generation_kwargs = {
+            "temperature": 0.5,
+            "max_tokens": 3000,
+            "response_format": {"type": "json_object"}
+        }
+        logger.info(f"CombinedExtractorNode initialized with model: {model}")
+    
+    def _create_combined_prompt(self, doc: Document, template: dict) -> str:
+        """
+        Metadata and fact instructions, then the template schema, then the document.
+        Static text comes first so the provider can cache the prompt prefix.
+        """
+        schema_str = json.dumps(template.get("json_schema", {}).get("schema", {}), indent=2)
+        
+        return f"""{self.metadata_instructions}
+
+ADDITIONAL TASK - FACT EXTRACTION:
+In the same response, also extract structured facts from the document according to the template below.
+
+{FACT_EXTRACTION_GUIDELINES}
+
+OUTPUT FORMAT (replaces the format requested above):
+Return a single JSON object with exactly two keys:
+- "metadata": the metadata object with the keys listed above
+- "facts": the extracted facts as a JSON object matching the template schema exactly
+
+Template: {template.get("label", "Legal Case")}
+Template Schema:
+{schema_str}
+
+Legal Document Text:
+{prompt_text(doc)}"""
+
+    def _extract(self, doc: Document, template_id: str, template: dict) -> dict:
+        """Run (or replay from cache) the combined call for one document."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = LLMResponseCache.make_key(
+                prompt_text(doc),
+                self.PROMPT_VERSION,
+                self.model,
+                template_id=template_cache_id(template_id, template),
+                generation_kwargs=self.generation_kwargs
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Combined extraction served from LLM response cache")
+                return json.loads(cached)
+        
+        response = self.llm_client.chat_completion(
+            [
+                {"role": "system", "content": "You are a legal document analyzer. Always return valid JSON."},
+                {"role": "user", "content": self._create_combined_prompt(doc, template)}
+            ],
+            self.model,
+            **self.generation_kwargs
+        )
+        result = json.loads(response.text)
+        
+        if not isinstance(result.get("metadata"), dict) or not isinstance(result.get("facts"), dict):
+            raise ValueError("Combined response is missing 'metadata' or 'facts'")
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, response.text, model=self.model, prompt_version=self.PROMPT_VERSION)
+        return result
+    
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Extract metadata and facts for pre-classified documents.
+        
+        Args:
+            documents: List of Haystack Documents
+        
+        Returns:
+            dict with documents (failures are left for the two-call path)
+        """
+        for doc in documents:
+            # Metadata restored from the ingestion journal
+            if doc.meta.get("metadata_source"):
+                continue
+            
+            template_id = doc.meta.get("preclassified_template_id")
+            if not template_id or template_id not in self.templates:
+                continue
+            
+            # Long judgments go through the front-matter metadata call and chunked fact extraction
+            text_length = len(prompt_text(doc))
+            if text_length > self.max_chars:
+                logger.info(f"Document too long for a combined call ({text_length} chars), using two calls")
+                continue
+            
+            template = self.templates[template_id]
+            try:
+                result = self._extract(doc, template_id, template)
+            except Exception as e:
+                logger.warning(f"Combined extraction failed, falling back to two calls: {e}")
+                continue
+            
+            metadata = result["metadata"]
+            for key in self.expected_keys:
+                if key in metadata:
+                    doc.meta[key] = metadata[key]
+            doc.meta["metadata_source"] = "combined"
+            
+            # Keep the facts only if the LLM agrees with the local classification
+            section = metadata.get("most_appropriate_section") or "Unknown"
+            if match_section_to_template(section, self.templates) != template_id:
+                logger.info(f"LLM chose {section}, not {template_id}; facts will be re-extracted")
+                continue
+            
+            doc.meta["extracted_facts"] = result["facts"]
+            doc.meta["facts_summary"] = FactExtractorNode.generate_facts_summary(result["facts"])
+            doc.meta["extraction_mode"] = "combined"
+        
+        return {"documents": documents}
+
+
+@component
+class FallbackMetadataExtractorNode:
+    """
+    Haystack component that runs LLMMetadataExtractor only where metadata is still missing.
+    Documents whose metadata came from the combined call (or the ingestion journal) pass
+    through untouched; the rest get metadata_source="llm". With a
+    compressor, the extractor only sees the front matter; the metadata is copied back
+    onto the original (full-text) documents.
+    """
+    
+    def __init__(self, extractor: Any, compressor: Optional[PromptCompressor] = None):
+        """
+        Initialize fallback metadata extractor.
+        
+        Args:
+            extractor: LLMMetadataExtractor used for the remaining documents
+            compressor: Optional compressor whose front_matter() is sent instead of the full text
+        """
+        self.extractor = extractor
+        self.compressor = compressor
+    
+    def warm_up(self):
+        """Warm up the wrapped extractor."""
+        if hasattr(self.extractor, "warm_up"):
+            self.extractor.warm_up()
+    
+    @component.output_types(documents=List[Document], failed_documents=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Extract metadata for documents that do not have it yet.
+        
+        Args:
+            documents: List of Haystack Documents
+        
+        Returns:
+            dict with documents and failed_documents (input order preserved)
+        """
+        pending = [doc for doc in documents if not doc.meta.get("metadata_source")]
+        if not pending:
+            return {"documents": documents, "failed_documents": []}
+        
+        # Same id and meta, shorter content; metadata is copied back below
+        if self.compressor is not None:
+            inputs = [
+                Document(id=doc.id, content=self.compressor.front_matter(prompt_text(doc)), meta=dict(doc.meta))
+                for doc in pending
+            ]
+        else:
+            inputs = [Document(id=doc.id, content=prompt_text(doc), meta=dict(doc.meta)) for doc in pending]
+        
+        result = self.extractor.run(documents=inputs)
+        extracted = {doc.id: doc for doc in result.get("documents", [])}
+        failed_ids = {doc.id for doc in result.get("failed_documents", [])}
+        
+        output = []
+        failed = []
+        for doc in documents:
+            if doc.meta.get("metadata_source"):
+                output.append(doc)
+            elif doc.id in failed_ids:
+                failed.append(doc)
+            else:
+                if doc.id in extracted:
+                    doc.meta.update(extracted[doc.id].meta)
+                doc.meta["metadata_source"] = "llm"
+                output.append(doc)
+        
+        return {"documents": output, "failed_documents": failed}
+
+
+@component
+class RateLimitedChatGenerator:
+    """
+    Haystack chat generator backed by the shared RateLimitedLLMClient.
+    Drop-in replacement for OpenAIChatGenerator inside LLMMetadataExtractor.
+    """
+    
+    def __init__(
+        self,
+        llm_client: RateLimitedLLMClient,
+        model: str = "gpt-4o-2024-08-06",
+        generation_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize rate-limited chat generator.
+        
+        Args:
+            llm_client: Shared rate-limited client
+            model: OpenAI model to use
+            generation_kwargs: Default generation kwargs
+        """
+        self.llm_client = llm_client
+        self.model = model
+        self.generation_kwargs = generation_kwargs or {}
+        logger.info(f"RateLimitedChatGenerator initialized with model: {model}")
+    
+    @component.output_types(replies=List[ChatMessage])
+    def run(self, messages: List[ChatMessage], generation_kwargs: Optional[Dict[str, Any]] = None) -> dict:
+        """
+        Generate a reply for the given messages.
+        
+        Args:
+            messages: Chat messages
+            generation_kwargs: Per-call overrides of the generation kwargs
+        
+        Returns:
+            dict with replies
+        """
+        response = self.llm_client.chat_completion(
+            [{"role": message.role.value, "content": message.text} for message in messages],
+            self.model,
+            **{**self.generation_kwargs, **(generation_kwargs or {})}
+        )
+        
+        reply = ChatMessage.from_assistant(
+            response.text,
+            meta={"model": response.model, "finish_reason": response.finish_reason, "usage": response.usage}
+        )
+        return {"replies": [reply]}
+
+
+@component
+class CachedChatGenerator:
+    """
+    Haystack chat generator that serves replies from an LLMResponseCache.
+    Wraps another chat generator (e.g. OpenAIChatGenerator) and only calls it on a miss,
+    so it can be handed to LLMMetadataExtractor in place of the wrapped generator.
+    """
+    
+    def __init__(
+        self,
+        generator: Any,
+        cache: LLMResponseCache,
+        prompt_version: str,
+        model: str,
+        generation_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize cached chat generator.
+        
+        Args:
+            generator: Chat generator used on cache misses
+            cache: LLM response cache
+            prompt_version: Version tag of the prompt wording
+            model: Model name used by the wrapped generator (part of the cache key)
+            generation_kwargs: Generation kwargs of the wrapped generator (part of the cache key)
+        """
+        self.generator = generator
+        self.cache = cache
+        self.prompt_version = prompt_version
+        self.model = model
+        self.generation_kwargs = generation_kwargs or {}
+        logger.info(f"CachedChatGenerator initialized (prompt version: {prompt_version})")
+    
+    def warm_up(self):
+        """Warm up the wrapped generator."""
+        if hasattr(self.generator, "warm_up"):
+            self.generator.warm_up()
+    
+    @component.output_types(replies=List[ChatMessage])
+    def run(self, messages: List[ChatMessage], generation_kwargs: Optional[Dict[str, Any]] = None) -> dict:
+        """
+        Return cached replies for these messages, calling the wrapped generator on a miss.
+        
+        Args:
+            messages: Chat messages (the rendered prompt includes the document text)
+            generation_kwargs: Per-call overrides of the generation kwargs
+        
+        Returns:
+            dict with replies
+        """
+        effective_kwargs = {**self.generation_kwargs, **(generation_kwargs or {})}
+        text = "\n".join(f"{message.role.value}: {message.text}" for message in messages)
+        cache_key = LLMResponseCache.make_key(
+            text,
+            self.prompt_version,
+            self.model,
+            generation_kwargs=effective_kwargs
+        )
+        
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Metadata served from LLM response cache")
+            return {"replies": [ChatMessage.from_assistant(cached, meta={"model": self.model, "cached": True})]}
+        
+        result = self.generator.run(messages=messages, generation_kwargs=generation_kwargs)
+        replies = result.get("replies", [])
+        
+        # Only complete JSON replies are cached; failures are retried next time
+        if replies and replies[0].text:
+            try:
+                json.loads(replies[0].text)
+                self.cache.put(cache_key, replies[0].text, model=self.model, prompt_version=self.prompt_version)
+            except json.JSONDecodeError:
+                logger.warning("Reply is not valid JSON, not caching")
+        
+        return result
+
+
 @component
 class FactExtractorNode:
     """
@@ -326,57 +958,167 @@ class FactExtractorNode:
     Extracts facts based on template schema.
     """
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-2024-08-06"):
+    # Bump whenever the prompt wording changes so cached responses are not reused
+    PROMPT_VERSION = "facts-v2"
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-2024-08-06",
+        cache: Optional[LLMResponseCache] = None,
+        llm_client: Optional[RateLimitedLLMClient] = None,
+        section_splitter: Optional[Callable[[str], List[Tuple[str, str]]]] = None,
+        chunk_tokens: int = 4000,
+        max_chars: int = 6000
+    ):
         """
         Initialize fact extractor.
         
         Args:
             api_key: OpenAI API key
             model: OpenAI model to use
+            cache: Optional LLM response cache consulted before calling OpenAI
+            llm_client: Shared rate-limited client (a private one is created if not provided)
+            section_splitter: Returns (section_title, content) pairs for a text; enables
+                chunked extraction for texts longer than max_chars
+            chunk_tokens: Token budget per chunk in chunked mode
+            max_chars: Longest text extracted in a single call (longer texts are
+                chunked if a splitter is set, truncated otherwise)
         """
         self.api_key = api_key
         self.model = model
-        self.client = openai.OpenAI(api_key=api_key)
+        self.cache = cache
+        self.llm_client = llm_client or RateLimitedLLMClient(api_key)
+        self.section_splitter = section_splitter
+        self.chunk_tokens = chunk_tokens
+        self.max_chars = max_chars
+        self.generation_kwargs = {
+            "temperature": 0.5,
+            "max_tokens": 2000,
+            "response_format": {"type": "json_object"}
+        }
         logger.info(f"FactExtractorNode initialized with model: {model}")
     
-    def _create_fact_extraction_prompt(self, text: str, template: dict) -> str:
-        """Create prompt for fact extraction."""
+    def _create_fact_extraction_prompt(self, text: str, template: dict, part: Optional[Tuple[int, int]] = None) -> str:
+        """Create prompt for fact extraction (optionally for one part of a chunked judgment)."""
         template_label = template.get("label", "Legal Case")
         schema = template.get("json_schema", {}).get("schema", {})
         schema_str = json.dumps(schema, indent=2)
         
+        text_label = "Legal Case Text:"
+        if part is not None:
+            text_label = (
+                f"Legal Case Text (part {part[0]} of {part[1]} of the judgment; extract only facts "
+                f"stated in this part and use null for everything else):"
+            )
+        
+        # Static instructions first, then the per-template schema, then the document,
+        # so the shared prefix can be served from the provider's prompt cache
         prompt = f"""You are a legal document analyzer. Extract structured facts from the given legal case text according to the provided template schema.
 
+        {FACT_EXTRACTION_GUIDELINES}
+        
+        Return the extracted facts as a JSON object matching the schema exactly.
+        
         Template: {template_label}
         Template Schema:
         {schema_str}
 
-        **EXTRACTION GUIDELINES**:
-
-        **TIER 1 - DETERMINATIVE FACTS**: Core facts that determine guilt, liability, or legal outcomes
-        **TIER 2 - MATERIAL FACTS**: Facts that significantly affect rights, duties, or case outcome  
-        **TIER 3 - CONTEXTUAL FACTS**: Environmental and circumstantial details
-        **TIER 4 - PROCEDURAL FACTS**: Court metadata, case details, and procedural information
-        **RESIDUAL DETAILS**: Any other relevant facts not captured above
-
-        **CRITICAL EXTRACTION RULES**:
-        1. Write each extracted value as a complete, coherent sentence that makes sense on its own
-        2. When concatenated together, all extracted facts should form a readable narrative summary
-        3. Each fact should flow naturally into the next when combined
-        4. Use transitional phrases and connecting words to ensure readability
-        5. Extract facts directly from the case text with narrative coherence
-        6. Be comprehensive and accurate while maintaining story flow
-        7. If a field is not found in the text, use null
-        8. Organize facts according to their legal significance
-        9. Each extracted fact should contribute to a unified case story when all values are joined together
-
-        Legal Case Text:
-        {text}
-
-        Return the extracted facts as a JSON object matching the schema exactly."""
+        {text_label}
+        {text}"""
                 
         return prompt
     
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are a legal document fact extractor. Always return valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _cache_key(self, doc: Document, text: str, template: dict, prompt_version: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return LLMResponseCache.make_key(
+            text,
+            prompt_version,
+            self.model,
+            template_id=template_cache_id(doc.meta.get("template_id", ""), template),
+            generation_kwargs=self.generation_kwargs
+        )
+    
+    def _extract_single(self, doc: Document, text: str, template: dict) -> dict:
+        """Extract facts from the whole text in one call (served from cache when possible)."""
+        cache_key = self._cache_key(doc, text, template, self.PROMPT_VERSION)
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info("Facts served from LLM response cache")
+            return json.loads(cached)
+        
+        prompt = self._create_fact_extraction_prompt(text, template)
+        
+        logger.info("Calling OpenAI API for fact extraction...")
+        
+        # Call OpenAI API with structured output (rate-limited, retried on 429/5xx)
+        response = self.llm_client.chat_completion(self._messages(prompt), self.model, **self.generation_kwargs)
+        
+        # Parse response (only valid JSON is cached)
+        facts = json.loads(response.text)
+        if cache_key is not None:
+            self.cache.put(cache_key, response.text, model=self.model, prompt_version=self.PROMPT_VERSION)
+        return facts
+    
+    def _extract_chunked(self, doc: Document, text: str, template: dict) -> dict:
+        """
+        Map-reduce extraction: split along section boundaries into token-bounded
+        chunks, extract each chunk concurrently, merge the partial templates in order.
+        """
+        chunks = chunk_sections(self.section_splitter(text), self.chunk_tokens)
+        total = len(chunks)
+        prompt_version = f"{self.PROMPT_VERSION}/chunked"
+        
+        partials: List[Optional[dict]] = [None] * total
+        cache_keys = []
+        pending = []
+        for index, chunk in enumerate(chunks):
+            cache_key = self._cache_key(doc, f"[part {index + 1}/{total}]\n{chunk}", template, prompt_version)
+            cache_keys.append(cache_key)
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                partials[index] = json.loads(cached)
+            else:
+                pending.append(index)
+        
+        logger.info(f"Extracting facts from {total} chunks ({total - len(pending)} cached)")
+        
+        responses = self.llm_client.chat_completions(
+            [
+                self._messages(self._create_fact_extraction_prompt(chunks[i], template, part=(i + 1, total)))
+                for i in pending
+            ],
+            self.model,
+            **self.generation_kwargs
+        )
+        
+        failed = 0
+        for index, response in zip(pending, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                partials[index] = json.loads(response.text)
+                if cache_keys[index] is not None:
+                    self.cache.put(cache_keys[index], response.text, model=self.model, prompt_version=prompt_version)
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Fact extraction failed for chunk {index + 1}/{total}: {e}")
+        
+        if failed == total:
+            raise RuntimeError(f"Fact extraction failed for all {total} chunks")
+        
+        doc.meta["fact_chunks"] = total
+        if failed:
+            doc.meta["fact_chunks_failed"] = failed
+        return merge_partial_facts([partial for partial in partials if partial is not None])
+    
     @component.output_types(documents=List[Document], success=bool)
     def run(self, documents: List[Document], template: dict) -> dict:
         """
@@ -393,38 +1135,27 @@ class FactExtractorNode:
             return {"documents": documents, "success": False}
         
         doc = documents[0]
-        text = doc.content
         
-        # Truncate text if too long
-        max_chars = 6000
-        if len(text) > max_chars:
-            logger.warning(f"Text truncated from {len(text)} to {max_chars} characters")
-            text = text[:max_chars] + "\n... [truncated]"
+        # Facts already came back with the metadata in a single combined call, or from the journal
+        if doc.meta.get("extracted_facts"):
+            logger.info(f"Facts already extracted ({doc.meta.get('extraction_mode', 'journal')}), skipping")
+            return {"documents": [doc], "success": True}
+        
+        text = prompt_text(doc)
         
         try:
-            # Build prompt
-            prompt = self._create_fact_extraction_prompt(text, template)
-            
-            logger.info("Calling OpenAI API for fact extraction...")
-            
-            # Call OpenAI API with structured output
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a legal document fact extractor. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse response
-            response_text = response.choices[0].message.content.strip()
-            facts = json.loads(response_text)
+            if len(text) > self.max_chars and self.section_splitter is not None:
+                # Long judgment: extract every chunk concurrently and merge
+                facts = self._extract_chunked(doc, text, template)
+            else:
+                # Truncate text if too long
+                if len(text) > self.max_chars:
+                    logger.warning(f"Text truncated from {len(text)} to {self.max_chars} characters")
+                    text = text[:self.max_chars] + "\n... [truncated]"
+                facts = self._extract_single(doc, text, template)
             
             # Generate facts summary
-            facts_summary = self._generate_facts_summary(facts)
+            facts_summary = self.generate_facts_summary(facts)
             
             # Add to document metadata
             doc.meta["extracted_facts"] = facts
@@ -444,7 +1175,8 @@ class FactExtractorNode:
             doc.meta["extraction_error"] = str(e)
             return {"documents": [], "success": False}
     
-    def _generate_facts_summary(self, facts: dict) -> str:
+    @staticmethod
+    def generate_facts_summary(facts: dict) -> str:
         """Generate human-readable summary from extracted facts by concatenating all non-null values."""
         summary_parts = []
         
@@ -505,6 +1237,115 @@ class ThresholdFilterNode:
         return {"documents": filtered}
 
 
+@component
+class QueryEmbedderNode:
+    """
+    Haystack component that embeds a query text with the shared sentence transformer.
+    Uses the same model instance as DualEmbedderNode (via ModelRegistry).
+    """
+    
+    def __init__(self, model: str = "sentence-transformers/all-mpnet-base-v2"):
+        """
+        Initialize query embedder.
+        
+        Args:
+            model: Sentence transformer model name
+        """
+        self.model_name = model
+        self.model = ModelRegistry().get_sentence_transformer(model)
+        logger.info(f"QueryEmbedderNode initialized with model: {model}")
+    
+    def use_model(self, model: str) -> None:
+        """Switch to another (shared) sentence transformer, e.g. after a re-embed."""
+        if model == self.model_name:
+            return
+        self.model = ModelRegistry().get_sentence_transformer(model)
+        self.model_name = model
+        logger.info(f"QueryEmbedderNode switched to model: {model}")
+    
+    @component.output_types(embedding=List[float])
+    def run(self, text: str) -> dict:
+        """
+        Embed query text.
+        
+        Args:
+            text: Query text
+        
+        Returns:
+            dict with embedding
+        """
+        embedding = self.model.encode(text, convert_to_numpy=True, show_progress_bar=False)
+        return {"embedding": embedding.tolist()}
+
+
+@component
+class CrossEncoderRankerNode:
+    """
+    Haystack component that re-ranks documents with a shared cross-encoder.
+    Sets doc.score to the cross-encoder score and keeps the top_k documents.
+    
+    Like TransformersSimilarityRanker (scale_score=True), scores are passed
+    through a sigmoid, so they stay in [0, 1] whatever activation the model
+    or sentence-transformers version applies by default.
+    """
+    
+    def __init__(
+        self,
+        model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        top_k: int = 10,
+        scale_score: bool = True
+    ):
+        """
+        Initialize cross-encoder ranker.
+        
+        Args:
+            model: Cross-encoder model name
+            top_k: Number of documents to keep after re-ranking
+            scale_score: Apply a sigmoid to the raw logits (scores in [0, 1])
+        """
+        self.model_name = model
+        self.model = ModelRegistry().get_cross_encoder(model)
+        self.top_k = top_k
+        self.scale_score = scale_score
+        logger.info(f"CrossEncoderRankerNode initialized with model: {model}, top_k={top_k}")
+    
+    @component.output_types(documents=List[Document])
+    def run(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> dict:
+        """
+        Re-rank documents against the query.
+        
+        Args:
+            query: Query text
+            documents: Retrieved documents
+            top_k: Override for the number of documents to keep
+        
+        Returns:
+            dict with re-ranked documents (highest score first)
+        """
+        if not documents:
+            return {"documents": []}
+        
+        top_k = top_k or self.top_k
+        scores = self._predict([(query, doc.content or "") for doc in documents])
+        
+        for doc, score in zip(documents, scores):
+            doc.score = float(score)
+        
+        ranked = sorted(documents, key=lambda d: d.score, reverse=True)
+        return {"documents": ranked[:top_k]}
+    
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score (query, passage) pairs, with the activation set explicitly."""
+        import torch
+        
+        activation = torch.nn.Sigmoid() if self.scale_score else torch.nn.Identity()
+        try:
+            return self.model.predict(pairs, activation_fn=activation, show_progress_bar=False)
+        except TypeError:
+            # sentence-transformers < 4 calls the argument activation_fct
+            return self.model.predict(pairs, activation_fct=activation, show_progress_bar=False)
+
+
 @component
 class DualEmbedderNode:
     """
@@ -513,24 +1354,46 @@ class DualEmbedderNode:
     2. Metadata embedding (from concatenated metadata fields)
     
     Also handles storing both embeddings to PostgreSQL.
+    All documents of a call are encoded in one batched encode() and
+    written with a single bulk upsert.
     """
     
-    def __init__(self, document_store: PgvectorDocumentStore, model: str = "sentence-transformers/all-mpnet-base-v2"):
+    def __init__(
+        self,
+        document_store: PgvectorDocumentStore,
+        model: str = "sentence-transformers/all-mpnet-base-v2",
+        db_pool: Optional[DatabasePool] = None,
+        batch_size: int = 32,
+        journal: Optional[IngestionJournal] = None
+    ):
         """
         Initialize dual embedder.
         
         Args:
             document_store: PgvectorDocumentStore instance
             model: Sentence transformer model name
+            db_pool: Shared DatabasePool (created from document_store if omitted)
+            batch_size: Encoder batch size
+            journal: Optional IngestionJournal recording the embedded and stored stages
         """
-        from sentence_transformers import SentenceTransformer
-        
         self.document_store = document_store
+        self.db_pool = db_pool or DatabasePool(str(document_store.connection_string.resolve_value()))
         self.model_name = model
-        self.model = SentenceTransformer(model)
+        self.model = ModelRegistry().get_sentence_transformer(model)
+        self.batch_size = batch_size
+        self.journal = journal
         logger.info(f"DualEmbedderNode initialized with model: {model}")
     
-    def _format_template_as_text(self, facts: dict) -> str:
+    def use_model(self, model: str) -> None:
+        """Switch to another (shared) sentence transformer, e.g. after a re-embed."""
+        if model == self.model_name:
+            return
+        self.model = ModelRegistry().get_sentence_transformer(model)
+        self.model_name = model
+        logger.info(f"DualEmbedderNode switched to model: {model}")
+    
+    @staticmethod
+    def _format_template_as_text(facts: dict) -> str:
         """
         Format the entire extracted facts template as text for embedding.
         Includes all fields and values from the filled template.
@@ -552,7 +1415,8 @@ class DualEmbedderNode:
         extract_all_text(facts)
         return " | ".join(parts) if parts else ""
     
-    def _format_metadata_as_text(self, meta: dict) -> str:
+    @staticmethod
+    def _format_metadata_as_text(meta: dict) -> str:
         """
         Format metadata fields as concatenated text for embedding.
         """
@@ -576,45 +1440,60 @@ class DualEmbedderNode:
         
         return " ".join(metadata_fields)
     
-    @component.output_types(documents=List[Document])
-    def run(self, documents: List[Document]) -> dict:
+    @classmethod
+    def embedding_texts(cls, meta: dict, content: str) -> Tuple[str, str]:
         """
-        Create dual embeddings and store to database.
+        Build the texts that are embedded for a document.
+        
+        Only stored fields are used (extracted_facts and metadata in meta), so
+        stored rows can be re-embedded without any LLM call.
         
         Args:
-            documents: List of Haystack Documents with extracted facts
+            meta: Document meta
+            content: Fallback text when no facts were extracted
+        
+        Returns:
+            (facts_text, metadata_text)
+        """
+        facts_text = cls._format_template_as_text(meta.get("extracted_facts") or {})
+        if not facts_text:
+            logger.warning("No facts text to embed, using content")
+            facts_text = content or ""
+        return facts_text, cls._format_metadata_as_text(meta)
+    
+    def embed_documents(self, documents: List[Document]) -> List[EmbeddedDocument]:
+        """
+        Create facts and metadata embeddings for many documents at once.
+        
+        Facts and metadata texts of every document are encoded together in a
+        single batched encode() call. doc.content is set to the facts summary
+        and doc.embedding to the facts embedding (the 'embedding' column).
+        
+        Args:
+            documents: Haystack Documents with extracted facts
             
         Returns:
-            dict with documents (embeddings stored in DB)
+            List of EmbeddedDocument in input order
         """
         if not documents:
-            return {"documents": []}
+            return []
         
-        doc = documents[0]
+        facts_texts = []
+        metadata_texts = []
         
-        try:
-            # Extract facts and metadata
-            extracted_facts = doc.meta.get("extracted_facts", {})
+        for doc in documents:
+            # LLM input only: not stored with the document
+            doc.meta.pop(COMPRESSED_CONTENT_KEY, None)
             facts_summary = doc.meta.get("facts_summary", "")
             
-            # 1. Create facts embedding (from full template)
-            facts_text = self._format_template_as_text(extracted_facts)
-            if not facts_text:
-                logger.warning("No facts text to embed, using content")
-                facts_text = doc.content
-            
-            facts_embedding = self.model.encode(facts_text, convert_to_numpy=True)
-            logger.info(f"Created facts embedding from full template (dim: {len(facts_embedding)})")
-            
-            # 2. Create metadata embedding
-            metadata_text = self._format_metadata_as_text(doc.meta)
-            metadata_embedding = self.model.encode(metadata_text, convert_to_numpy=True)
-            logger.info(f"Created metadata embedding (dim: {len(metadata_embedding)})")
+            # 1. Facts text (from full template) and 2. metadata text
+            facts_text, metadata_text = self.embedding_texts(doc.meta, doc.content)
+            facts_texts.append(facts_text)
+            metadata_texts.append(metadata_text)
             
             # 3. Update doc.content to facts_summary for display/retrieval purposes
             if facts_summary and len(facts_summary.strip()) > 0:
                 doc.content = facts_summary
-                logger.info(f"Set doc.content to facts_summary ({len(facts_summary)} chars)")
             elif facts_text:
                 # Fallback: use formatted facts text if summary is empty
                 doc.content = facts_text[:1000]  # Limit to reasonable length
@@ -622,44 +1501,155 @@ class DualEmbedderNode:
             else:
                 doc.content = "No facts extracted"
                 logger.warning("Both facts_summary and facts_text are empty")
+        
+        # One encode call for all facts and metadata texts
+        with MetricsRegistry().timer("embedding_encode_seconds", model=self.model_name):
+            embeddings = self.model.encode(
+                facts_texts + metadata_texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+        count = len(documents)
+        MetricsRegistry().inc("embedded_documents_total", count)
+        logger.info(f"Created {count} facts and {count} metadata embeddings (dim: {embeddings.shape[1]})")
+        
+        for i, doc in enumerate(documents):
+            doc.embedding = embeddings[i].tolist()
+        
+        return [
+            EmbeddedDocument(doc, embeddings[i], embeddings[count + i])
+            for i, doc in enumerate(documents)
+        ]
+    
+    def store_documents(self, embedded: List[EmbeddedDocument]) -> List[str]:
+        """
+        Write documents with both embeddings in one bulk upsert.
+        
+        Haystack's writer only handles the 'embedding' column, so custom SQL is used.
+        A document whose file_hash is already stored under another id (e.g. the
+        same file ingested concurrently by the CLI and the daemon) is not written;
+        its id is returned so the caller can report it as a duplicate instead of
+        failing on the unique file_hash index.
+        
+        Args:
+            embedded: Output of embed_documents
+        
+        Returns:
+            IDs of the documents skipped as duplicates
+        """
+        if not embedded:
+            return []
+        
+        from psycopg2 import errors
+        from psycopg2.extras import Json, execute_values
+        
+        # ON CONFLICT cannot touch the same row twice in one statement, keep the last copy;
+        # a file_hash repeated under another id within the batch is a duplicate too
+        rows = {}
+        hash_owner = {}
+        duplicates = []
+        for item in embedded:
+            doc = item.document
+            file_hash = doc.meta.get("file_hash")
+            if file_hash and hash_owner.setdefault(file_hash, doc.id) != doc.id:
+                duplicates.append(doc.id)
+                continue
+            rows[doc.id] = (
+                doc.id, doc.content, Json(doc.meta),
+                to_vector_literal(item.facts_embedding), to_vector_literal(item.metadata_embedding)
+            )
+        
+        if not rows:
+            return duplicates
+        
+        for attempt in range(2):
+            try:
+                with self.db_pool.cursor() as cursor, MetricsRegistry().timer("db_query_seconds", statement="upsert_documents"):
+                    written = execute_values(cursor, """
+                        INSERT INTO haystack_documents (id, content, meta, embedding, embedding_metadata)
+                        SELECT v.id, v.content, v.meta, v.embedding, v.embedding_metadata
+                        FROM (VALUES %s) AS v (id, content, meta, embedding, embedding_metadata)
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM haystack_documents d
+                            WHERE d.file_hash = v.meta->>'file_hash' AND d.id <> v.id
+                        )
+                        ON CONFLICT (id) DO UPDATE
+                        SET content = EXCLUDED.content,
+                            meta = EXCLUDED.meta,
+                            embedding = EXCLUDED.embedding,
+                            embedding_metadata = EXCLUDED.embedding_metadata
+                        RETURNING id
+                    """, list(rows.values()), template="(%s, %s, %s::jsonb, %s::vector, %s::vector)",
+                        page_size=len(rows), fetch=True)
+                break
+            except errors.UniqueViolation:
+                # A concurrent transaction committed the same file_hash after our snapshot; it is visible now
+                if attempt:
+                    raise
+                logger.warning("file_hash conflict with a concurrent write, retrying")
+        
+        written_ids = {row[0] for row in written}
+        duplicates.extend(doc_id for doc_id in rows if doc_id not in written_ids)
+        if duplicates:
+            logger.info(f"Skipped {len(duplicates)} documents already stored under another id")
+        logger.info(f"Stored {len(written_ids)} documents with dual embeddings")
+        return duplicates
+    
+    def record_stage(self, embedded: List[EmbeddedDocument], stage: str) -> None:
+        """Record the embedded (with vectors) or stored stage for each document."""
+        if self.journal is None:
+            return
+        
+        for item in embedded:
+            doc = item.document
+            file_hash = doc.meta.get("file_hash")
+            if not file_hash:
+                continue
             
-            # 4. Store both embeddings to PostgreSQL
-            # Haystack's writer only handles the 'embedding' column, so we need custom SQL
-            import psycopg2
-            from psycopg2.extras import Json
-            import numpy as np
-            
-            conn_str = str(self.document_store.connection_string.resolve_value())
-            conn = psycopg2.connect(conn_str)
-            cursor = conn.cursor()
-            
-            # Prepare document data
-            doc_id = doc.id
-            content = doc.content
-            meta_json = Json(doc.meta)
-            
-            # Insert/Update with both embeddings
-            cursor.execute("""
-                INSERT INTO haystack_documents (id, content, meta, embedding, embedding_metadata)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (id) DO UPDATE
-                SET content = EXCLUDED.content,
-                    meta = EXCLUDED.meta,
-                    embedding = EXCLUDED.embedding,
-                    embedding_metadata = EXCLUDED.embedding_metadata;
-            """, (doc_id, content, meta_json, facts_embedding.tolist(), metadata_embedding.tolist()))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            logger.info(f"Successfully stored document with dual embeddings: {doc_id}")
+            artifact = None
+            if stage == "embedded":
+                artifact = {
+                    "id": doc.id,
+                    "content": doc.content,
+                    "meta": doc.meta,
+                    "embedding_model": self.model_name,
+                    "facts_embedding": [float(x) for x in item.facts_embedding],
+                    "metadata_embedding": [float(x) for x in item.metadata_embedding]
+                }
+            try:
+                self.journal.record(file_hash, stage, artifact=artifact, file_path=doc.meta.get("original_file_path", ""))
+            except Exception as e:
+                logger.warning(f"Failed to journal stage '{stage}': {e}")
+    
+    @component.output_types(documents=List[Document], duplicates=List[Document])
+    def run(self, documents: List[Document]) -> dict:
+        """
+        Create dual embeddings and store to database.
+        
+        Args:
+            documents: List of Haystack Documents with extracted facts
             
-            return {"documents": [doc]}
+        Returns:
+            dict with documents (embeddings stored in DB) and duplicates
+            (files already stored under another id, not written)
+        """
+        if not documents:
+            return {"documents": [], "duplicates": []}
+        
+        try:
+            embedded = self.embed_documents(documents)
+            self.record_stage(embedded, "embedded")
+            skipped = set(self.store_documents(embedded))
+            self.record_stage(embedded, "stored")
+            return {
+                "documents": [item.document for item in embedded if item.document.id not in skipped],
+                "duplicates": [item.document for item in embedded if item.document.id in skipped]
+            }
             
         except Exception as e:
             logger.error(f"Failed to create dual embeddings: {e}")
-            return {"documents": []}
+            return {"documents": [], "duplicates": []}
 
 
 @component
@@ -669,16 +1659,30 @@ class FactsEmbeddingRetriever:
     This is the default search mode - searching based on case facts.
     """
     
-    def __init__(self, document_store: PgvectorDocumentStore, top_k: int = 10):
+    def __init__(self, document_store: PgvectorDocumentStore, top_k: int = 10, db_pool: Optional[DatabasePool] = None):
         """
         Initialize facts embedding retriever.
         
         Args:
             document_store: PgvectorDocumentStore instance
             top_k: Number of documents to retrieve
+            db_pool: Shared DatabasePool (created from document_store if omitted)
         """
         self.document_store = document_store
+        self.db_pool = db_pool or DatabasePool(str(document_store.connection_string.resolve_value()))
         self.top_k = top_k
+        
+        # Ordering by distance (not by 1 - distance) lets pgvector use the HNSW index.
+        # $2 is an optional document id to exclude (the query document itself).
+        self.db_pool.prepare("facts_embedding_search", """
+            SELECT id, content, meta,
+                   1 - (embedding <=> $1::vector) AS score
+            FROM haystack_documents
+            WHERE embedding IS NOT NULL
+              AND ($2::text IS NULL OR id <> $2::text)
+            ORDER BY embedding <=> $1::vector
+            LIMIT $3
+        """)
         logger.info(f"FactsEmbeddingRetriever initialized with top_k={top_k}")
     
     @component.output_types(documents=List[Document])
@@ -694,41 +1698,21 @@ class FactsEmbeddingRetriever:
             dict with retrieved documents
         """
         try:
-            import psycopg2
             from psycopg2.extras import RealDictCursor
             
-            conn_str = str(self.document_store.connection_string.resolve_value())
-            conn = psycopg2.connect(conn_str)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
             # Query using facts embedding (standard 'embedding' column)
-            # Note: We search on 'embedding' which contains facts embedding
-            query_vector = query_embedding
-            
-            # Build SQL query
-            sql = """
-                SELECT id, content, meta, 
-                       1 - (embedding <=> %s::vector) AS score
-                FROM haystack_documents
-                WHERE embedding IS NOT NULL
-            """
-            
-            params = [query_vector]
-            
-            # Add filters if provided (simplified - you may need more complex filter handling)
-            if filters:
-                # Handle basic 'id' filter
-                if 'field' in filters and filters['field'] == 'id':
-                    operator = filters.get('operator', '!=')
-                    value = filters.get('value')
-                    if operator == '!=':
-                        sql += " AND id != %s"
-                        params.append(value)
-            
-            sql += f" ORDER BY score DESC LIMIT {self.top_k}"
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            query_vector = to_vector_literal(query_embedding)
+            
+            # Only the 'id !=' filter is supported (used to exclude the query document)
+            exclude_id = None
+            if filters and filters.get('field') == 'id' and filters.get('operator', '!=') == '!=':
+                exclude_id = filters.get('value')
+            
+            with self.db_pool.cursor(cursor_factory=RealDictCursor) as cursor:
+                self.db_pool.execute_prepared(
+                    cursor, "facts_embedding_search", (query_vector, exclude_id, self.top_k)
+                )
+                rows = cursor.fetchall()
             
             # Convert to Haystack Documents
             documents = []
@@ -743,9 +1727,6 @@ class FactsEmbeddingRetriever:
                 doc.meta['score'] = float(row['score'])
                 documents.append(doc)
             
-            cursor.close()
-            conn.close()
-            
             logger.info(f"Retrieved {len(documents)} documents using facts embedding")
             return {"documents": documents}
             
@@ -3,33 +3,60 @@ Pure Haystack-based ingestion pipeline using native components.
 No wrappers - uses Haystack's LLMMetadataExtractor, embedders, and document store directly.
 """
 
+import asyncio
+import functools
 import logging
-import hashlib
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple, Union
 from datetime import datetime
 
 from haystack import Pipeline, Document
 from haystack.components.extractors import LLMMetadataExtractor
-from haystack.components.generators.chat import OpenAIChatGenerator
 from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 from haystack.utils import Secret
 
 from core.config import Config
-from core.models import IngestResult, ProcessingStatus, CaseMetadata
+from core.models import IngestResult, BatchIngestResult, ProcessingStatus, CaseMetadata
+from infrastructure.database import DatabasePool, parse_vector_literal
+from infrastructure.duplicate_gate import DuplicateGate
+from infrastructure.embedding_versions import EmbeddingVersions
+from infrastructure.ingestion_journal import IngestionJournal
+from infrastructure.llm_cache import LLMResponseCache
+from infrastructure.llm_client import RateLimitedLLMClient
+from infrastructure.model_registry import ModelRegistry
 from pipelines.haystack_custom_nodes import (
     MarkdownSaverNode, TemplateSaverNode, DuplicateCheckNode, 
-    TemplateLoaderNode, FactExtractorNode, DualEmbedderNode
+    TemplateLoaderNode, FactExtractorNode, DualEmbedderNode, CachedChatGenerator,
+    RateLimitedChatGenerator, SectionPreClassifierNode, CombinedExtractorNode,
+    FallbackMetadataExtractorNode, PromptCompressorNode, JournalCheckpointNode, EmbeddedDocument
 )
+from pipelines.ingestion_executor import IngestionExecutor
+from pipelines.metrics_tracer import enable_component_metrics
+from utils.helpers import compute_file_hash, read_file_with_hash
+from utils.prompt_compression import PromptCompressor
 
 # Import PDF to Markdown converter
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'raw_code', 'bg_creation'))
 from convert_pdf_to_md import PDFToMarkdownConverter
+from ontology_matcher import OntologyMatcher
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the metadata prompt wording changes so cached responses are not reused
+METADATA_PROMPT_VERSION = "metadata-v2"
+
+METADATA_EXPECTED_KEYS = [
+    "case_number", "case_title", "court_name", "judgment_date",
+    "appellant_or_petitioner", "respondent", "judges_coram",
+    "counsel_for_appellant", "counsel_for_respondent",
+    "sections_invoked", "most_appropriate_section",
+    "case_type", "citation", "acts_and_sections"
+]
+
 
 class HaystackIngestionPipeline:
     """
@@ -37,25 +64,71 @@ class HaystackIngestionPipeline:
     Uses native Haystack components without wrappers.
     """
     
-    def __init__(self):
-        """Initialize the Haystack ingestion pipeline."""
+    def __init__(self, db_pool: Optional[DatabasePool] = None):
+        """
+        Initialize the Haystack ingestion pipeline.
+        
+        Args:
+            db_pool: Shared DatabasePool (created from config if not provided)
+        """
         self.config = Config()
-        self.pipeline = Pipeline()
+        
+        # Time every Haystack component run (Performance menu / metrics endpoint)
+        enable_component_metrics()
         
         # Initialize PDF converter
         config_dict = {
             'processing_settings': {
                 'save_markdown_files': True,
-                'markdown_output_dir': 'cases/markdown'
+                'markdown_output_dir': str(self.config.markdown_output_dir),
+                'page_workers': self.config.pdf_page_workers,
+                'parallel_min_pages': self.config.pdf_parallel_min_pages
             }
         }
         self.pdf_converter = PDFToMarkdownConverter(config_dict)
         
-        # Initialize document store
+        # Initialize document store and the connection pool shared by custom nodes
         self.document_store = self._init_document_store()
+        self.db_pool = db_pool or DatabasePool(
+            self.config.db_connection_string,
+            min_connections=self.config.db_pool_min_connections,
+            max_connections=self.config.db_pool_max_connections
+        )
+        # Stored rows are loaded with their facts vector, so searches query with it instead of embedding text
+        self.db_pool.prepare(
+            "ingestion_load_by_file_hash",
+            "SELECT id, content, meta, embedding::text AS embedding FROM haystack_documents WHERE file_hash = $1 LIMIT 1"
+        )
+        self.db_pool.prepare(
+            "ingestion_load_by_id",
+            "SELECT id, content, meta, embedding::text AS embedding FROM haystack_documents WHERE id = $1"
+        )
+        
+        # Hash-first duplicate gate (checked before any LLM call)
+        self.duplicate_gate = DuplicateGate(
+            self.db_pool,
+            ttl_seconds=self.config.duplicate_gate_ttl_seconds,
+            max_entries=self.config.duplicate_gate_max_entries
+        )
+        
+        # Embedding model of the stored vectors (switched by src/scripts/reembed.py)
+        self.embedding_versions = EmbeddingVersions(self.db_pool)
+        self.embedding_model = self._init_embedding_model()
         
-        # Build the pipeline
-        self._build_pipeline()
+        # On-disk LLM response cache, shared by every pipeline using the same file
+        self.llm_cache = self._init_llm_cache()
+        
+        # Per-file stage journal, so interrupted batches resume where each file stopped
+        self.journal = self._init_journal()
+        
+        # Rate-limited OpenAI client shared by both extraction stages (and all pipelines)
+        self.llm_client = ModelRegistry().get_shared("llm_client", self._create_llm_client)
+        
+        # Build the pipeline (the embedder-less variant for the staged executor is built lazily)
+        self.pipeline = self._build_pipeline()
+        self._extraction_pipeline: Optional[Pipeline] = None
+        self._query_pipeline: Optional[Pipeline] = None
+        self._extraction_pipeline_lock = threading.Lock()
         
         logger.info("HaystackIngestionPipeline initialized")
     
@@ -86,12 +159,78 @@ class HaystackIngestionPipeline:
         logger.info("PgvectorDocumentStore initialized")
         return store
     
-    def _create_metadata_prompt(self) -> str:
-        """Create prompt for metadata extraction."""
-        prompt = """Analyze the following Indian legal case document and extract comprehensive metadata.
-
-Legal Document Text:
-{{ document.content }}
+    def _init_embedding_model(self) -> str:
+        """Return the active embedding model (the configured one if the database has none yet)."""
+        try:
+            model = self.embedding_versions.ensure(self.config.embedding_model, self.config.embedding_dim)
+        except Exception as e:
+            logger.warning(f"Could not read embedding versions, using configured model: {e}")
+            return self.config.embedding_model
+        
+        if model != self.config.embedding_model:
+            logger.warning(
+                f"Stored vectors were built with {model}; using it instead of EMBEDDING_MODEL={self.config.embedding_model}"
+            )
+        return model
+    
+    def sync_embedding_model(self) -> str:
+        """
+        Follow a model switch made by the re-embed command while this process runs.
+        
+        Returns:
+            Name of the active embedding model
+        """
+        active = self.embedding_versions.active_model()
+        if active and active != self.embedding_model:
+            logger.info(f"Active embedding model changed to {active}")
+            self.embedding_model = active
+            self.dual_embedder.use_model(active)
+        return self.embedding_model
+    
+    def _init_llm_cache(self) -> Optional[LLMResponseCache]:
+        """Open the shared LLM response cache (None if disabled)."""
+        if not self.config.llm_cache_enabled:
+            return None
+        
+        cache_path = str(self.config.llm_cache_path.resolve())
+        return ModelRegistry().get_shared(
+            ("llm_cache", cache_path),
+            lambda: LLMResponseCache(cache_path, max_bytes=self.config.llm_cache_max_mb * 1024 * 1024)
+        )
+    
+    def _init_journal(self) -> Optional[IngestionJournal]:
+        """Open the shared ingestion journal (None if disabled)."""
+        if not self.config.ingest_journal_enabled:
+            return None
+        
+        journal_path = str(self.config.ingest_journal_path.resolve())
+        return ModelRegistry().get_shared(("ingestion_journal", journal_path), lambda: IngestionJournal(journal_path))
+    
+    def _create_llm_client(self) -> RateLimitedLLMClient:
+        """Create the rate-limited OpenAI client from config."""
+        return RateLimitedLLMClient(
+            api_key=self.config.openai_api_key,
+            requests_per_minute=self.config.llm_requests_per_minute,
+            tokens_per_minute=self.config.llm_tokens_per_minute,
+            max_concurrency=self.config.llm_max_concurrency,
+            max_retries=self.config.llm_max_retries,
+            timeout_seconds=self.config.llm_timeout_seconds,
+            headroom=self.config.llm_rate_headroom,
+            base_url=self.config.openai_base_url
+        )
+    
+    def _load_ontology_maps(self) -> tuple:
+        """Load OntologyMatcher section/term maps for the pre-classifier (empty if unavailable)."""
+        try:
+            matcher = OntologyMatcher(str(self.config.ontology_path))
+            return matcher.section_to_node_map, matcher.term_to_node_map
+        except Exception as e:
+            logger.warning(f"Ontology maps unavailable, pre-classifying by sections only: {e}")
+            return {}, {}
+    
+    def _create_metadata_instructions(self) -> str:
+        """Static part of the metadata prompt (shared with the combined extraction prompt)."""
+        instructions = """Analyze the following Indian legal case document and extract comprehensive metadata.
 
 Extract the following metadata with high accuracy:
 1. Case identification details (number, title, court)
@@ -133,90 +272,181 @@ Return a JSON object with these exact keys:
 
 Use "Unknown" for missing required fields (case_title, court_name, judgment_date, most_appropriate_section).
 Use null for optional fields if not found.
+"""
+        return instructions
+    
+    def _create_metadata_prompt(self) -> str:
+        """Create prompt for metadata extraction (document last, so the instruction prefix can be cached)."""
+        prompt = self._create_metadata_instructions() + """
+Legal Document Text:
+{{ document.content }}
 """
         return prompt
     
-    def _build_pipeline(self):
-        """Build the Haystack pipeline with all components."""
+    def _build_pipeline(self, include_embedder: bool = True, checkpoints: bool = True) -> Pipeline:
+        """
+        Build the Haystack pipeline with all components.
+        
+        Args:
+            include_embedder: Whether to end with the dual embedder; without it the
+                pipeline stops after the template saver (used by the staged executor)
+            checkpoints: Whether to journal the metadata and facts stages
+                (off for query documents, which must never be resumed into the corpus)
+        """
+        pipeline = Pipeline()
         
         # 1. Metadata Extractor
         metadata_prompt = self._create_metadata_prompt()
-        chat_generator = OpenAIChatGenerator(
-            api_key=Secret.from_token(self.config.openai_api_key),
-            model="gpt-4o-2024-08-06",
-            generation_kwargs={
-                "response_format": {"type": "json_object"},
-                "temperature": 0.5,
-                "max_tokens": 1024
-            }
+        metadata_model = "gpt-4o-2024-08-06"
+        metadata_generation_kwargs = {
+            "response_format": {"type": "json_object"},
+            "temperature": 0.5,
+            "max_tokens": 1024
+        }
+        chat_generator = RateLimitedChatGenerator(
+            llm_client=self.llm_client,
+            model=metadata_model,
+            generation_kwargs=metadata_generation_kwargs
+        )
+        if self.llm_cache is not None:
+            chat_generator = CachedChatGenerator(
+                generator=chat_generator,
+                cache=self.llm_cache,
+                prompt_version=METADATA_PROMPT_VERSION,
+                model=metadata_model,
+                generation_kwargs=metadata_generation_kwargs
+            )
+        
+        # Runs only for documents the combined call did not cover, on their front matter
+        prompt_compressor = PromptCompressor(front_matter_chars=self.config.metadata_front_matter_chars)
+        metadata_extractor = FallbackMetadataExtractorNode(
+            LLMMetadataExtractor(
+                chat_generator=chat_generator,
+                prompt=metadata_prompt,
+                expected_keys=METADATA_EXPECTED_KEYS,
+                raise_on_failure=False
+            ),
+            compressor=prompt_compressor
         )
         
-        metadata_extractor = LLMMetadataExtractor(
-            chat_generator=chat_generator,
-            prompt=metadata_prompt,
-            expected_keys=[
-                "case_number", "case_title", "court_name", "judgment_date",
-                "appellant_or_petitioner", "respondent", "judges_coram",
-                "counsel_for_appellant", "counsel_for_respondent",
-                "sections_invoked", "most_appropriate_section",
-                "case_type", "citation", "acts_and_sections"
-            ],
-            raise_on_failure=False
+        # 1a. Strips page markers, running headers/footers and boilerplate before any LLM call
+        text_compressor = PromptCompressorNode(prompt_compressor)
+        
+        # 1b. Local pre-classifier + combined metadata/facts call for confident documents
+        templates = ModelRegistry().get_templates(str(self.config.templates_dir))
+        section_to_node_map, term_to_node_map = self._load_ontology_maps()
+        section_classifier = SectionPreClassifierNode(
+            templates=templates,
+            section_to_node_map=section_to_node_map,
+            term_to_node_map=term_to_node_map,
+            confidence_threshold=self.config.preclassifier_confidence,
+            enabled=self.config.preclassifier_enabled
+        )
+        combined_extractor = CombinedExtractorNode(
+            llm_client=self.llm_client,
+            templates=templates,
+            metadata_instructions=self._create_metadata_instructions(),
+            expected_keys=METADATA_EXPECTED_KEYS,
+            model=metadata_model,
+            cache=self.llm_cache,
+            max_chars=self.config.fact_single_pass_chars
         )
         
         # 2. Markdown Saver
-        markdown_saver = MarkdownSaverNode(output_dir="cases/markdown")
+        markdown_saver = MarkdownSaverNode(output_dir=str(self.config.markdown_output_dir))
         
         # 3. Duplicate Checker
-        duplicate_checker = DuplicateCheckNode(document_store=self.document_store)
+        duplicate_checker = DuplicateCheckNode(
+            document_store=self.document_store,
+            duplicate_gate=self.duplicate_gate
+        )
         
         # 4. Template Loader
         template_loader = TemplateLoaderNode(templates_dir=str(self.config.templates_dir))
         
         # 5. Fact Extractor
-        fact_extractor = FactExtractorNode(api_key=self.config.openai_api_key)
+        fact_extractor = FactExtractorNode(
+            api_key=self.config.openai_api_key,
+            cache=self.llm_cache,
+            llm_client=self.llm_client,
+            section_splitter=self.pdf_converter._identify_sections,
+            chunk_tokens=self.config.fact_chunk_tokens,
+            max_chars=self.config.fact_single_pass_chars
+        )
         
         # 6. Template Saver
-        template_saver = TemplateSaverNode(output_dir="cases/extracted")
-        
-        # 7. Dual Embedder (creates facts + metadata embeddings and stores to DB)
-        dual_embedder = DualEmbedderNode(
-            document_store=self.document_store,
-            model="sentence-transformers/all-mpnet-base-v2"
-        )
+        template_saver = TemplateSaverNode(output_dir=str(self.config.extracted_output_dir))
         
         # Add components to pipeline
-        self.pipeline.add_component("metadata_extractor", metadata_extractor)
-        self.pipeline.add_component("markdown_saver", markdown_saver)
-        self.pipeline.add_component("duplicate_checker", duplicate_checker)
-        self.pipeline.add_component("template_loader", template_loader)
-        self.pipeline.add_component("fact_extractor", fact_extractor)
-        self.pipeline.add_component("template_saver", template_saver)
-        self.pipeline.add_component("dual_embedder", dual_embedder)
-        
-        # Connect components
-        self.pipeline.connect("metadata_extractor.documents", "markdown_saver.documents")
-        self.pipeline.connect("markdown_saver.documents", "duplicate_checker.documents")
-        self.pipeline.connect("duplicate_checker.documents", "template_loader.documents")
-        self.pipeline.connect("template_loader.documents", "fact_extractor.documents")
-        self.pipeline.connect("template_loader.template", "fact_extractor.template")
-        self.pipeline.connect("fact_extractor.documents", "template_saver.documents")
-        self.pipeline.connect("template_saver.documents", "dual_embedder.documents")
+        pipeline.add_component("duplicate_checker", duplicate_checker)
+        pipeline.add_component("text_compressor", text_compressor)
+        pipeline.add_component("section_classifier", section_classifier)
+        pipeline.add_component("combined_extractor", combined_extractor)
+        pipeline.add_component("metadata_extractor", metadata_extractor)
+        pipeline.add_component("markdown_saver", markdown_saver)
+        pipeline.add_component("template_loader", template_loader)
+        pipeline.add_component("fact_extractor", fact_extractor)
+        pipeline.add_component("template_saver", template_saver)
+        
+        # Connect components (duplicate check runs before any LLM call)
+        pipeline.connect("duplicate_checker.documents", "text_compressor.documents")
+        pipeline.connect("text_compressor.documents", "section_classifier.documents")
+        pipeline.connect("section_classifier.documents", "combined_extractor.documents")
+        pipeline.connect("combined_extractor.documents", "metadata_extractor.documents")
+        pipeline.connect("markdown_saver.documents", "template_loader.documents")
+        pipeline.connect("template_loader.documents", "fact_extractor.documents")
+        pipeline.connect("template_loader.template", "fact_extractor.template")
+        
+        if checkpoints and self.journal is not None:
+            # Checkpoint the paid-for LLM output right after each extraction stage
+            pipeline.add_component("metadata_checkpoint", JournalCheckpointNode(self.journal, "metadata"))
+            pipeline.add_component("facts_checkpoint", JournalCheckpointNode(self.journal, "facts"))
+            pipeline.connect("metadata_extractor.documents", "metadata_checkpoint.documents")
+            pipeline.connect("metadata_checkpoint.documents", "markdown_saver.documents")
+            pipeline.connect("fact_extractor.documents", "facts_checkpoint.documents")
+            pipeline.connect("facts_checkpoint.documents", "template_saver.documents")
+        else:
+            pipeline.connect("metadata_extractor.documents", "markdown_saver.documents")
+            pipeline.connect("fact_extractor.documents", "template_saver.documents")
+        
+        if include_embedder:
+            # 7. Dual Embedder (creates facts + metadata embeddings and stores to DB)
+            self.dual_embedder = DualEmbedderNode(
+                document_store=self.document_store,
+                model=self.embedding_model,
+                db_pool=self.db_pool,
+                batch_size=self.config.embedding_batch_size,
+                journal=self.journal
+            )
+            pipeline.add_component("dual_embedder", self.dual_embedder)
+            pipeline.connect("template_saver.documents", "dual_embedder.documents")
         
         logger.info("Pipeline built successfully")
+        return pipeline
+    
+    def _get_extraction_pipeline(self) -> Pipeline:
+        """Pipeline without the dual embedder, built on first use by the staged executor."""
+        with self._extraction_pipeline_lock:
+            if self._extraction_pipeline is None:
+                self._extraction_pipeline = self._build_pipeline(include_embedder=False)
+            return self._extraction_pipeline
     
-    def _compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA-256 hash of file."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+    def _get_query_pipeline(self) -> Pipeline:
+        """Extraction pipeline without journal checkpoints, built on first use by ephemeral queries."""
+        if self.journal is None:
+            return self._get_extraction_pipeline()
+        with self._extraction_pipeline_lock:
+            if self._query_pipeline is None:
+                self._query_pipeline = self._build_pipeline(include_embedder=False, checkpoints=False)
+            return self._query_pipeline
     
     async def ingest_single(self, file_path: Path, display_summary: bool = True) -> IngestResult:
         """
         Ingest a single PDF file through the Haystack pipeline.
         
+        The pipeline itself is blocking (PDF parsing, OpenAI calls, embedding),
+        so it runs in a worker thread to keep the event loop responsive.
+        
         Args:
             file_path: Path to PDF file
             display_summary: Whether to display summary (for CLI)
@@ -224,184 +454,603 @@ Use null for optional fields if not found.
         Returns:
             IngestResult with processing details
         """
-        file_path = Path(file_path)
-        logger.info(f"Starting ingestion for: {file_path.name}")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sync_embedding_model)
+        return await loop.run_in_executor(None, self._ingest_single_sync, Path(file_path))
+    
+    async def analyze_single(self, file_path: Path) -> Tuple[IngestResult, Optional[EmbeddedDocument]]:
+        """
+        Extract and embed a PDF in memory without adding it to the corpus.
+        
+        Used for ephemeral search queries: nothing is written to the database
+        or the ingestion journal. The returned EmbeddedDocument can be stored
+        later with ``save_document``.
+        
+        Args:
+            file_path: Path to PDF file
+        
+        Returns:
+            (IngestResult, EmbeddedDocument); the IngestResult has PENDING status and
+            carries both vectors. Stored duplicates and failures come without a document.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sync_embedding_model)
+        return await loop.run_in_executor(None, self._analyze_single_sync, Path(file_path))
+    
+    def _analyze_single_sync(self, file_path: Path) -> Tuple[IngestResult, Optional[EmbeddedDocument]]:
+        """Run the blocking steps of ``analyze_single`` for one file."""
+        logger.info(f"Analyzing query document: {file_path.name}")
+        file_hash = None
         
         try:
-            # Step 1: Convert PDF to Markdown
-            logger.info(f"Converting PDF to markdown: {file_path.name}")
-            raw_text = self.pdf_converter.extract_text_from_pdf(str(file_path))
-            markdown_text = self.pdf_converter.clean_text(raw_text)
+            content, file_hash = read_file_with_hash(file_path)
             
-            # Step 2: Compute file hash
-            file_hash = self._compute_file_hash(file_path)
+            # A stored document is searched with its stored data
+            if self.duplicate_gate.contains(file_hash):
+                logger.info("Query document is already stored, retrieving existing data from database")
+                return self.load_duplicate_result(file_hash), None
             
-            # Step 3: Create Haystack Document
-            doc = Document(
-                content=markdown_text,
-                meta={
-                    "original_filename": file_path.name,
-                    "original_file_path": str(file_path),
-                    "file_hash": file_hash,
-                    "ingestion_timestamp": datetime.now().isoformat(),
-                    "ingestion_method": "haystack_pipeline"
-                }
-            )
+            raw_text = self.pdf_converter.extract_text_from_pdf(str(file_path), stream=content)
+            doc = self._new_document(file_path, file_hash, self.pdf_converter.clean_text(raw_text))
             
-            # Step 4: Run pipeline
-            logger.info("Running Haystack pipeline...")
-            result = self.pipeline.run({"metadata_extractor": {"documents": [doc]}})
+            extracted = self.extract_document(doc, file_hash, checkpoints=False)
+            if isinstance(extracted, IngestResult):
+                return extracted, None
             
-            # Debug: Log all result keys
-            logger.info(f"Pipeline result keys: {list(result.keys())}")
-            for key in result.keys():
-                output = result[key]
-                if isinstance(output, dict):
-                    logger.info(f"  {key}: {list(output.keys())}")
+            embedded = self.dual_embedder.embed_documents([extracted])[0]
+            result = self._document_result(embedded.document, ProcessingStatus.PENDING)
+            result.embedding_metadata = embedded.metadata_embedding
+            return result, embedded
+        
+        except Exception as e:
+            logger.error(f"Unexpected error during analysis of {file_path.name}: {e}")
+            return self.failed_result(file_hash, str(e)), None
+    
+    def save_document(self, embedded: EmbeddedDocument, embedding_model: Optional[str] = None) -> IngestResult:
+        """
+        Store a document produced by ``analyze_single`` (explicit "save to corpus").
+        
+        Args:
+            embedded: Document with its in-memory vectors
+            embedding_model: Model the vectors were built with (re-embedded if the active model differs)
+        
+        Returns:
+            IngestResult with COMPLETED status, or the stored copy if the file was saved meanwhile
+        """
+        self.sync_embedding_model()
+        file_hash = embedded.document.meta.get("file_hash", "")
+        if file_hash and self.duplicate_gate.contains(file_hash):
+            return self.load_duplicate_result(file_hash)
+        
+        try:
+            if embedding_model and embedding_model != self.embedding_model:
+                embedded = self.dual_embedder.embed_documents([embedded.document])[0]
+            duplicates = self.dual_embedder.store_documents([embedded])
+            self.dual_embedder.record_stage([embedded], "stored")
+        except Exception as e:
+            logger.error(f"Failed to store query document: {e}")
+            return self.failed_result(file_hash, str(e))
+        
+        if duplicates:
+            return self.load_duplicate_result(file_hash)
+        return self.completed_result(embedded.document, file_hash)
+    
+    async def ingest_batch(
+        self,
+        paths: Iterable[Path],
+        concurrency: Optional[int] = None,
+        progress_callback: Optional[Callable[[Path, IngestResult], None]] = None,
+        file_hashes: Optional[Dict[Path, str]] = None
+    ) -> BatchIngestResult:
+        """
+        Ingest many PDF files through the staged IngestionExecutor.
+        
+        Parsing (process pool), LLM extraction (``concurrency`` files at once),
+        embedding and database writes run as separate stages, so each resource
+        stays busy while the others work on different files.
+        
+        Args:
+            paths: PDF files to ingest
+            concurrency: Files in the LLM stage at once (defaults to config.ingest_concurrency)
+            progress_callback: Optional callable invoked with (path, result) as each file finishes
+            file_hashes: Hashes the caller already computed, by path (the rest are hashed here)
+        
+        Returns:
+            BatchIngestResult with per-status counts, case IDs and errors
+        """
+        paths = [Path(p) for p in paths]
+        precomputed = {Path(p): h for p, h in (file_hashes or {}).items()}
+        concurrency = max(1, concurrency or self.config.ingest_concurrency)
+        
+        batch_result = BatchIngestResult(
+            total_files=len(paths),
+            processed=0,
+            skipped_duplicates=0,
+            failed=0
+        )
+        
+        if not paths:
+            return batch_result
+        
+        logger.info(f"Starting batch ingestion of {len(paths)} files (concurrency={concurrency})")
+        
+        def record(path: Path, result: IngestResult) -> None:
+            if result.status == ProcessingStatus.COMPLETED:
+                batch_result.processed += 1
+                batch_result.case_ids.append(result.case_id)
+            elif result.status == ProcessingStatus.SKIPPED_DUPLICATE:
+                batch_result.skipped_duplicates += 1
+            else:
+                batch_result.failed += 1
+                batch_result.errors.append(f"{path.name}: {result.error_message}")
             
-            # Extract results
-            duplicate_status = result.get("duplicate_checker", {}).get("is_duplicate", False)
+            if progress_callback:
+                progress_callback(path, result)
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sync_embedding_model)
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest-hash") as executor:
             
-            if duplicate_status:
-                logger.warning("Document is a duplicate, retrieving existing data from database")
-                
-                # Retrieve existing document from database
-                try:
-                    import psycopg2
-                    from psycopg2.extras import RealDictCursor
-                    
-                    conn_str = f"postgresql://{self.config.db_user}:{self.config.db_password}@{self.config.db_host}:{self.config.db_port}/{self.config.db_name}"
-                    conn = psycopg2.connect(conn_str)
-                    cursor = conn.cursor(cursor_factory=RealDictCursor)
-                    
-                    cursor.execute("""
-                        SELECT id, content, meta 
-                        FROM haystack_documents 
-                        WHERE meta->>'file_hash' = %s
-                        LIMIT 1
-                    """, (file_hash,))
-                    
-                    existing = cursor.fetchone()
-                    cursor.close()
-                    conn.close()
-                    
-                    if existing:
-                        meta = existing['meta'] or {}
-                        metadata = CaseMetadata(
-                            case_title=meta.get("case_title", "Unknown"),
-                            court_name=meta.get("court_name", "Unknown"),
-                            judgment_date=meta.get("judgment_date", "Unknown"),
-                            sections_invoked=meta.get("sections_invoked", []),
-                            most_appropriate_section=meta.get("most_appropriate_section", "Unknown"),
-                            case_id=existing['id']
-                        )
-                        
-                        return IngestResult(
-                            case_id=existing['id'],
-                            document_id=existing['id'],
-                            status=ProcessingStatus.SKIPPED_DUPLICATE,
-                            metadata=metadata,
-                            facts_summary=existing['content'] or "",
-                            embedding_facts=None,
-                            embedding_metadata=None,
-                            error_message=None
-                        )
-                    
-                except Exception as e:
-                    logger.error(f"Failed to retrieve duplicate document: {e}")
-                
-                # Fallback if database retrieval fails
-                return IngestResult(
-                    case_id="",
-                    document_id="",
+            # Hash every file up front and resolve all hashes in one round trip,
+            # so duplicates are skipped before any parsing or LLM call
+            async def resolve_hash(path: Path) -> str:
+                if path in precomputed:
+                    return precomputed[path]
+                return await loop.run_in_executor(executor, compute_file_hash, path)
+            
+            file_hashes = await asyncio.gather(*(resolve_hash(path) for path in paths), return_exceptions=True)
+            known = await loop.run_in_executor(
+                executor, functools.partial(
+                    self.duplicate_gate.prefetch, [h for h in file_hashes if isinstance(h, str)], refresh=True
+                )
+            )
+        logger.info(f"Duplicate gate: {len(known)} of {len(paths)} files already stored")
+        
+        jobs = []
+        seen_hashes = set()
+        for path, file_hash in zip(paths, file_hashes):
+            if not isinstance(file_hash, str):
+                record(path, self.failed_result(None, str(file_hash)))
+            elif file_hash in known or file_hash in seen_hashes:
+                # Files already stored, or repeated within this batch, are skipped outright
+                record(path, IngestResult(
+                    case_id=known.get(file_hash, ""),
+                    document_id=known.get(file_hash, ""),
                     status=ProcessingStatus.SKIPPED_DUPLICATE,
                     metadata=None,
                     facts_summary="",
                     embedding_facts=None,
                     embedding_metadata=None,
-                    error_message="Duplicate document"
-                )
+                    error_message=None
+                ))
+            else:
+                seen_hashes.add(file_hash)
+                jobs.append((path, file_hash))
+        
+        staged = IngestionExecutor(
+            self,
+            parse_workers=self.config.ingest_parse_workers,
+            llm_workers=concurrency,
+            embed_batch_size=self.config.embedding_batch_size,
+            write_batch_size=self.config.ingest_write_batch_size,
+            queue_size=self.config.ingest_queue_size,
+            batch_wait_seconds=self.config.ingest_batch_wait_seconds
+        )
+        await staged.run(jobs, record)
+        
+        logger.info(
+            f"Batch ingestion finished: {batch_result.processed} completed, "
+            f"{batch_result.skipped_duplicates} duplicates, {batch_result.failed} failed"
+        )
+        return batch_result
+    
+    def _ingest_single_sync(self, file_path: Path, file_hash: Optional[str] = None) -> IngestResult:
+        """
+        Run the blocking ingestion steps for one file.
+        
+        The file is read once: its bytes are hashed and, unless the hash
+        is already stored (duplicates return without any parsing or LLM
+        calls), parsed from the same buffer. Files the journal has seen
+        before resume after their last completed stage.
+        
+        Args:
+            file_path: Path to PDF file
+            file_hash: Precomputed SHA-256 hash (computed here if omitted)
+        """
+        logger.info(f"Starting ingestion for: {file_path.name}")
+        
+        try:
+            # Step 1: Read the file once, hash the buffer and check for duplicates
+            content = None
+            if file_hash is None:
+                content, file_hash = read_file_with_hash(file_path)
             
-            # Check if fact extraction was successful
-            fact_success = result.get("fact_extractor", {}).get("success", False)
+            if self.duplicate_gate.contains(file_hash):
+                logger.warning("Document is a duplicate, retrieving existing data from database")
+                return self.load_duplicate_result(file_hash)
             
-            if not fact_success:
-                logger.error("Fact extraction failed, document not ingested")
-                return IngestResult(
-                    case_id="",
-                    document_id="",
-                    status=ProcessingStatus.FAILED,
-                    metadata=None,
-                    facts_summary="",
-                    embedding_facts=None,
-                    embedding_metadata=None,
-                    error_message="Fact extraction failed"
-                )
+            # Step 2: Resume from the journal where possible
+            resumed = self.resume_point(file_path, file_hash)
+            if isinstance(resumed, EmbeddedDocument):
+                duplicates = self.dual_embedder.store_documents([resumed])
+                self.dual_embedder.record_stage([resumed], "stored")
+                if duplicates:
+                    return self.load_duplicate_result(file_hash)
+                return self.completed_result(resumed.document, file_hash)
+            
+            doc = resumed
+            if doc is None:
+                # Step 3: Convert PDF to Markdown
+                logger.info(f"Converting PDF to markdown: {file_path.name}")
+                raw_text = self.pdf_converter.extract_text_from_pdf(str(file_path), stream=content)
+                markdown_text = self.pdf_converter.clean_text(raw_text)
+                
+                # Step 4: Create Haystack Document
+                doc = self.create_document(file_path, file_hash, markdown_text)
+            
+            # Step 5: Run pipeline
+            logger.info("Running Haystack pipeline...")
+            result = self.pipeline.run({"duplicate_checker": {"documents": [doc]}})
+            
+            outcome = self._check_extraction(result, file_hash)
+            if outcome is not None:
+                return outcome
+            
+            # Stored meanwhile under another id (e.g. by the daemon): report it as a duplicate
+            if result.get("dual_embedder", {}).get("duplicates"):
+                logger.warning("Document was stored concurrently, retrieving existing data from database")
+                return self.load_duplicate_result(file_hash)
             
             # Check if dual embedding was successful
             dual_embedder_docs = result.get("dual_embedder", {}).get("documents", [])
             
             if not dual_embedder_docs or len(dual_embedder_docs) == 0:
                 logger.error("Dual embedding failed, document not stored")
-                return IngestResult(
-                    case_id="",
-                    document_id="",
-                    status=ProcessingStatus.FAILED,
-                    metadata=None,
-                    facts_summary="",
-                    embedding_facts=None,
-                    embedding_metadata=None,
-                    error_message="Dual embedding failed"
-                )
+                return self.failed_result(file_hash, "Dual embedding failed")
             
             # Get the embedded document (which has all metadata)
-            embedded_doc = dual_embedder_docs[0]
-            
-            # Get facts summary from embedded document (DualEmbedderNode sets doc.content to facts_summary)
-            facts_summary = embedded_doc.content if embedded_doc.content else ""
-            
-            # Also try to get from metadata if content is empty
-            if not facts_summary or len(facts_summary.strip()) == 0:
-                facts_summary = embedded_doc.meta.get("facts_summary", "")
+            return self.completed_result(dual_embedder_docs[0], file_hash)
+                
+        except Exception as e:
+            logger.error(f"Unexpected error during ingestion of {file_path.name}: {e}")
+            return self.failed_result(file_hash, str(e))
+    
+    def resume_point(self, file_path: Path, file_hash: str) -> Union[None, Document, EmbeddedDocument]:
+        """
+        Find where ingestion of a file should (re)start.
+        
+        Args:
+            file_path: Path to PDF file
+            file_hash: SHA-256 hash of the file
+        
+        Returns:
+            EmbeddedDocument if only the database write is missing, a Document
+            (extracted text plus any journaled metadata/facts) if the PDF was
+            already parsed, or None if the file must be parsed from scratch
+        """
+        stage = self.journal.stage(file_hash) if self.journal is not None else None
+        if stage == "stored":
+            # Journaled as stored but no longer in the database: start over
+            self.journal.forget(file_hash)
+            stage = None
+        
+        if stage is not None:
+            logger.info(f"Resuming {file_path.name} after stage '{stage}'")
+            if stage == "embedded":
+                artifact = self.journal.artifact(file_hash, "embedded")
+                # Vectors journaled before a model switch are recomputed
+                if artifact is not None and artifact.get("embedding_model", self.embedding_model) == self.embedding_model:
+                    doc = Document(
+                        id=artifact["id"], content=artifact["content"], meta=artifact["meta"],
+                        embedding=artifact["facts_embedding"]
+                    )
+                    return EmbeddedDocument(doc, artifact["facts_embedding"], artifact["metadata_embedding"])
             
-            logger.info(f"Retrieved facts summary ({len(facts_summary)} chars)")
+            doc = self._resume_document(file_hash)
+            if doc is not None:
+                return doc
+        
+        self._journal(file_hash, "hashed", file_path=file_path)
+        return None
+    
+    def create_document(self, file_path: Path, file_hash: str, markdown_text: str) -> Document:
+        """
+        Wrap freshly extracted text in a Haystack Document and journal it.
+        
+        Args:
+            file_path: Path to PDF file
+            file_hash: SHA-256 hash of the file
+            markdown_text: Cleaned text of the PDF
+        """
+        doc = self._new_document(file_path, file_hash, markdown_text)
+        self._journal(
+            file_hash, "text_extracted", file_path=file_path,
+            artifact={"id": doc.id, "content": doc.content, "meta": doc.meta}
+        )
+        return doc
+    
+    @staticmethod
+    def _new_document(file_path: Path, file_hash: str, markdown_text: str) -> Document:
+        """Haystack Document for freshly extracted text (not journaled)."""
+        return Document(
+            content=markdown_text,
+            meta={
+                "original_filename": file_path.name,
+                "original_file_path": str(file_path),
+                "file_hash": file_hash,
+                "ingestion_timestamp": datetime.now().isoformat(),
+                "ingestion_method": "haystack_pipeline"
+            }
+        )
+    
+    def extract_document(self, doc: Document, file_hash: str, checkpoints: bool = True) -> Union[Document, IngestResult]:
+        """
+        Run the LLM stages (everything but embedding) for one document.
+        
+        Args:
+            doc: Document from create_document or resume_point
+            file_hash: SHA-256 hash of the file
+            checkpoints: Whether to journal the metadata and facts stages
+        
+        Returns:
+            Document with metadata and facts, or the IngestResult of a duplicate or failure
+        """
+        pipeline = self._get_extraction_pipeline() if checkpoints else self._get_query_pipeline()
+        result = pipeline.run({"duplicate_checker": {"documents": [doc]}})
+        
+        outcome = self._check_extraction(result, file_hash)
+        if outcome is not None:
+            return outcome
+        
+        documents = result.get("template_saver", {}).get("documents", [])
+        if not documents:
+            return self.failed_result(file_hash, "Fact extraction failed")
+        return documents[0]
+    
+    def _check_extraction(self, result: Dict[str, Any], file_hash: str) -> Optional[IngestResult]:
+        """Return the IngestResult for a duplicate or failed extraction, None if extraction succeeded."""
+        # Debug: Log all result keys
+        logger.info(f"Pipeline result keys: {list(result.keys())}")
+        for key in result.keys():
+            output = result[key]
+            if isinstance(output, dict):
+                logger.info(f"  {key}: {list(output.keys())}")
+        
+        # Extract results
+        duplicate_status = result.get("duplicate_checker", {}).get("is_duplicate", False)
+        
+        if duplicate_status:
+            logger.warning("Document is a duplicate, retrieving existing data from database")
+            return self.load_duplicate_result(file_hash)
+        
+        # Check if fact extraction was successful
+        fact_success = result.get("fact_extractor", {}).get("success", False)
+        
+        if not fact_success:
+            logger.error("Fact extraction failed, document not ingested")
+            return self.failed_result(file_hash, "Fact extraction failed")
+        
+        return None
+    
+    def failed_result(self, file_hash: Optional[str], error_message: str) -> IngestResult:
+        """
+        Build a FAILED IngestResult and record the error in the journal.
+        
+        Args:
+            file_hash: SHA-256 hash of the file (None if hashing failed)
+            error_message: Error message
+        """
+        if file_hash:
+            self._journal_error(file_hash, error_message)
+        return IngestResult(
+            case_id="",
+            document_id="",
+            status=ProcessingStatus.FAILED,
+            metadata=None,
+            facts_summary="",
+            embedding_facts=None,
+            embedding_metadata=None,
+            error_message=error_message
+        )
+    
+    def completed_result(self, embedded_doc: Document, file_hash: str) -> IngestResult:
+        """
+        Build the IngestResult of a stored document and register its hash.
+        
+        Args:
+            embedded_doc: Document as written by the dual embedder
+            file_hash: SHA-256 hash of the source file
+        """
+        result = self._document_result(embedded_doc, ProcessingStatus.COMPLETED)
+        
+        self.duplicate_gate.add(file_hash, embedded_doc.id)
+        logger.info(f"Successfully ingested case: {result.case_id}")
+        return result
+    
+    @staticmethod
+    def _document_result(embedded_doc: Document, status: ProcessingStatus) -> IngestResult:
+        """
+        Build an IngestResult from an embedded document.
+        
+        Args:
+            embedded_doc: Document as returned by the dual embedder
+            status: Status of the result
+        """
+        # Get facts summary from embedded document (DualEmbedderNode sets doc.content to facts_summary)
+        facts_summary = embedded_doc.content if embedded_doc.content else ""
+        
+        # Also try to get from metadata if content is empty
+        if not facts_summary or len(facts_summary.strip()) == 0:
+            facts_summary = embedded_doc.meta.get("facts_summary", "")
+        
+        logger.info(f"Retrieved facts summary ({len(facts_summary)} chars)")
+        
+        # Extract metadata from the embedded document
+        case_id = embedded_doc.meta.get("case_id", embedded_doc.id)
+        metadata = CaseMetadata(
+            case_title=embedded_doc.meta.get("case_title", "Unknown"),
+            court_name=embedded_doc.meta.get("court_name", "Unknown"),
+            judgment_date=embedded_doc.meta.get("judgment_date", "Unknown"),
+            sections_invoked=embedded_doc.meta.get("sections_invoked", []),
+            most_appropriate_section=embedded_doc.meta.get("most_appropriate_section", "Unknown"),
+            case_id=case_id
+        )
+        
+        return IngestResult(
+            case_id=case_id,
+            document_id=embedded_doc.id,
+            status=status,
+            metadata=metadata,
+            facts_summary=facts_summary,
+            embedding_facts=embedded_doc.embedding,  # Also stored in DB 'embedding' column
+            embedding_metadata=None,  # Stored in DB 'embedding_metadata' column
+            error_message=None
+        )
+    
+    def _journal(self, file_hash: str, stage: str, file_path: Path, artifact: Any = None) -> None:
+        """Record a completed stage (no-op without a journal; journal errors never fail ingestion)."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.record(file_hash, stage, artifact=artifact, file_path=str(file_path))
+        except Exception as e:
+            logger.warning(f"Failed to journal stage '{stage}': {e}")
+    
+    def _journal_error(self, file_hash: str, error: str) -> None:
+        """Attach the last error to a journaled file."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.record_error(file_hash, error)
+        except Exception as e:
+            logger.warning(f"Failed to journal error: {e}")
+    
+    def _journal_forget(self, file_hash: str) -> None:
+        """Drop a file from the journal (it will never be stored under this entry)."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.forget(file_hash)
+        except Exception as e:
+            logger.warning(f"Failed to drop journal entry: {e}")
+    
+    def _resume_document(self, file_hash: str) -> Optional[Document]:
+        """
+        Rebuild a document from the journal: extracted text plus the latest metadata/facts snapshot.
+        
+        The pipeline then skips every stage whose output is already in doc.meta.
+        
+        Args:
+            file_hash: SHA-256 hash of the file
+        
+        Returns:
+            Document, or None if the extracted text was never journaled
+        """
+        text = self.journal.artifact(file_hash, "text_extracted")
+        if text is None:
+            return None
+        
+        doc = Document(id=text["id"], content=text["content"], meta=text["meta"])
+        for stage in ("facts", "metadata"):
+            snapshot = self.journal.artifact(file_hash, stage)
+            if snapshot is not None:
+                doc.meta.update(snapshot["meta"])
+                break
+        return doc
+    
+    def pending_files(self) -> List[Path]:
+        """Files whose ingestion was interrupted in an earlier run (failed files are not retried)."""
+        if self.journal is None:
+            return []
+        return [
+            Path(entry.file_path) for entry in self.journal.pending()
+            if Path(entry.file_path).exists()
+        ]
+    
+    def load_duplicate_result(self, file_hash: str) -> IngestResult:
+        """
+        Build an IngestResult for a file that is already stored.
+        
+        Args:
+            file_hash: SHA-256 hash of the duplicate file
+        
+        Returns:
+            IngestResult with SKIPPED_DUPLICATE status and the stored metadata
+        """
+        # Nothing left to resume: the file is already in the database
+        self._journal_forget(file_hash)
+        
+        # Retrieve existing document from database
+        try:
+            from psycopg2.extras import RealDictCursor
             
-            # Extract metadata from the embedded document
-            case_id = embedded_doc.meta.get("case_id", embedded_doc.id)
-            metadata = CaseMetadata(
-                case_title=embedded_doc.meta.get("case_title", "Unknown"),
-                court_name=embedded_doc.meta.get("court_name", "Unknown"),
-                judgment_date=embedded_doc.meta.get("judgment_date", "Unknown"),
-                sections_invoked=embedded_doc.meta.get("sections_invoked", []),
-                most_appropriate_section=embedded_doc.meta.get("most_appropriate_section", "Unknown"),
-                case_id=case_id
-            )
+            with self.db_pool.cursor(cursor_factory=RealDictCursor) as cursor:
+                self.db_pool.execute_prepared(cursor, "ingestion_load_by_file_hash", (file_hash,))
+                existing = cursor.fetchone()
             
-            logger.info(f"Successfully ingested case: {case_id}")
+            if existing:
+                return self._stored_result(existing, ProcessingStatus.SKIPPED_DUPLICATE)
             
-            return IngestResult(
-                case_id=case_id,
-                document_id=embedded_doc.id,
-                status=ProcessingStatus.COMPLETED,
-                metadata=metadata,
-                facts_summary=facts_summary,
-                embedding_facts=None,  # Stored in DB 'embedding' column
-                embedding_metadata=None,  # Stored in DB 'embedding_metadata' column
-                error_message=None
-            )
-                
+            # Deleted since the gate saw it: do not keep reporting it as stored
+            self.duplicate_gate.invalidate([file_hash])
+        
         except Exception as e:
-            logger.error(f"Unexpected error during ingestion of {file_path.name}: {e}")
-            return IngestResult(
-                case_id="",
-                document_id="",
-                status=ProcessingStatus.FAILED,
-                metadata=None,
-                facts_summary="",
-                embedding_facts=None,
-                embedding_metadata=None,
-                error_message=str(e)
-            )
+            logger.error(f"Failed to retrieve duplicate document: {e}")
+        
+        # Fallback if database retrieval fails
+        return IngestResult(
+            case_id="",
+            document_id="",
+            status=ProcessingStatus.SKIPPED_DUPLICATE,
+            metadata=None,
+            facts_summary="",
+            embedding_facts=None,
+            embedding_metadata=None,
+            error_message="Duplicate document"
+        )
+    
+    def load_document(self, document_id: str) -> Optional[IngestResult]:
+        """
+        Load an already-indexed document without running ingestion.
+        
+        Args:
+            document_id: ID of the stored document
+        
+        Returns:
+            IngestResult with COMPLETED status and the stored facts vector, or None if not found
+        """
+        from psycopg2.extras import RealDictCursor
+        
+        with self.db_pool.cursor(cursor_factory=RealDictCursor) as cursor:
+            self.db_pool.execute_prepared(cursor, "ingestion_load_by_id", (document_id,))
+            row = cursor.fetchone()
+        
+        return self._stored_result(row, ProcessingStatus.COMPLETED) if row else None
+    
+    @staticmethod
+    def _stored_result(row: Dict[str, Any], status: ProcessingStatus) -> IngestResult:
+        """Build an IngestResult from a haystack_documents row (id, content, meta, embedding)."""
+        meta = row['meta'] or {}
+        metadata = CaseMetadata(
+            case_title=meta.get("case_title", "Unknown"),
+            court_name=meta.get("court_name", "Unknown"),
+            judgment_date=meta.get("judgment_date", "Unknown"),
+            sections_invoked=meta.get("sections_invoked", []),
+            most_appropriate_section=meta.get("most_appropriate_section", "Unknown"),
+            case_id=row['id']
+        )
+        
+        return IngestResult(
+            case_id=row['id'],
+            document_id=row['id'],
+            status=status,
+            metadata=metadata,
+            facts_summary=row['content'] or "",
+            embedding_facts=parse_vector_literal(row.get('embedding')),
+            embedding_metadata=None,
+            error_message=None
+        )
     
     def visualize_pipeline(self) -> str:
         """Get pipeline visualization."""
@@ -0,0 +1,311 @@
+"""
+Staged producer/consumer executor for batch ingestion.
+PDF parsing, LLM extraction, embedding and database writes run as separate
+stages with their own workers, connected by bounded queues.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from haystack import Document
+
+from core.models import IngestResult, ProcessingStatus
+from infrastructure.metrics import MetricsRegistry
+from pipelines.haystack_custom_nodes import EmbeddedDocument
+from utils.pdf_parsing import parse_pdf
+
+if TYPE_CHECKING:
+    from pipelines.haystack_ingestion_pipeline import HaystackIngestionPipeline
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class _Job:
+    """One file moving through the stages."""
+    path: Path
+    file_hash: str
+    document: Optional[Document] = None
+    embedded: Optional[EmbeddedDocument] = None
+
+
+class IngestionExecutor:
+    """
+    Runs batch ingestion as four stages connected by bounded queues:
+
+    1. parse: PyMuPDF extraction and cleaning in a process pool (CPU, GIL-bound)
+    2. extract: metadata/fact LLM calls, ``llm_workers`` files at a time (network-bound)
+    3. embed: one worker encoding micro-batches with the shared SentenceTransformer
+    4. write: one worker storing micro-batches with a single bulk upsert each
+
+    A full queue blocks the stage feeding it, so at most ``queue_size`` files
+    wait between any two stages and memory stays flat however large the batch.
+    """
+
+    def __init__(
+        self,
+        pipeline: 'HaystackIngestionPipeline',
+        parse_workers: int = 2,
+        llm_workers: int = 4,
+        embed_batch_size: int = 32,
+        write_batch_size: int = 32,
+        queue_size: int = 8,
+        batch_wait_seconds: float = 0.5
+    ):
+        """
+        Initialize ingestion executor.
+
+        Args:
+            pipeline: Ingestion pipeline providing the per-stage operations
+            parse_workers: Processes parsing PDFs
+            llm_workers: Files in the LLM extraction stage at once
+            embed_batch_size: Maximum documents per encode() call
+            write_batch_size: Maximum documents per bulk upsert
+            queue_size: Capacity of each inter-stage queue
+            batch_wait_seconds: How long the embed/write workers wait to fill a micro-batch
+        """
+        self.pipeline = pipeline
+        self.parse_workers = max(1, parse_workers)
+        self.llm_workers = max(1, llm_workers)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.write_batch_size = max(1, write_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.batch_wait_seconds = batch_wait_seconds
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self.metrics = MetricsRegistry()
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Current number of files waiting in front of each stage."""
+        return {stage: queue.qsize() for stage, queue in self._queues.items()}
+
+    async def run(
+        self,
+        jobs: Sequence[Tuple[Path, str]],
+        on_result: Callable[[Path, IngestResult], None]
+    ) -> None:
+        """
+        Ingest files through the stages.
+
+        Args:
+            jobs: (path, file_hash) of every file to ingest (duplicates already removed)
+            on_result: Called with (path, result) as each file finishes or fails
+        """
+        if not jobs:
+            return
+
+        loop = asyncio.get_running_loop()
+        parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        extract_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        embed_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._queues = {"parse": parse_queue, "extract": extract_queue, "embed": embed_queue, "write": write_queue}
+        self.metrics.register_collector("ingest_queue_depth", "stage", self.queue_depths)
+
+        dual_embedder = self.pipeline.dual_embedder
+        converter_config = self.pipeline.pdf_converter.config
+
+        # finish/fail/complete never raise: a dead worker would leave the queues full and the batch hanging
+        def finish(path: Path, result: IngestResult) -> None:
+            self.metrics.inc("ingest_files_total", status=result.status.value)
+            try:
+                on_result(path, result)
+            except Exception as e:
+                logger.error(f"Result callback failed for {path.name}: {e}")
+
+        def fail(job: _Job, error: Any) -> None:
+            logger.error(f"Failed to ingest {job.path.name}: {error}")
+            try:
+                result = self.pipeline.failed_result(job.file_hash, str(error))
+            except Exception as e:
+                logger.error(f"Failed to record the failure of {job.path.name}: {e}")
+                result = IngestResult(
+                    case_id="",
+                    document_id="",
+                    status=ProcessingStatus.FAILED,
+                    metadata=None,
+                    facts_summary="",
+                    embedding_facts=None,
+                    embedding_metadata=None,
+                    error_message=str(error)
+                )
+            finish(job.path, result)
+
+        def complete(job: _Job) -> None:
+            try:
+                result = self.pipeline.completed_result(job.embedded.document, job.file_hash)
+            except Exception as e:
+                fail(job, e)
+                return
+            finish(job.path, result)
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as process_pool, \
+                ThreadPoolExecutor(max_workers=self.llm_workers + 2, thread_name_prefix="ingest") as thread_pool:
+
+            def in_thread(func: Callable, *args: Any) -> asyncio.Future:
+                return loop.run_in_executor(thread_pool, func, *args)
+
+            async def feed() -> None:
+                # Files the journal already carried past parsing (or embedding) skip those stages
+                for path, file_hash in jobs:
+                    job = _Job(path, file_hash)
+                    try:
+                        resumed = await in_thread(self.pipeline.resume_point, path, file_hash)
+                    except Exception as e:
+                        fail(job, e)
+                        continue
+
+                    if isinstance(resumed, EmbeddedDocument):
+                        job.embedded = resumed
+                        await write_queue.put(job)
+                    elif resumed is not None:
+                        job.document = resumed
+                        await extract_queue.put(job)
+                    else:
+                        await parse_queue.put(job)
+
+            async def parse_worker() -> None:
+                while True:
+                    job = await parse_queue.get()
+                    if job is _DONE:
+                        return
+                    try:
+                        with self.metrics.timer("ingest_stage_seconds", stage="parse"):
+                            text = await loop.run_in_executor(process_pool, parse_pdf, str(job.path), converter_config)
+                        job.document = await in_thread(self.pipeline.create_document, job.path, job.file_hash, text)
+                    except Exception as e:
+                        fail(job, e)
+                        continue
+                    await extract_queue.put(job)
+
+            async def extract_worker() -> None:
+                while True:
+                    job = await extract_queue.get()
+                    if job is _DONE:
+                        return
+                    try:
+                        with self.metrics.timer("ingest_stage_seconds", stage="extract"):
+                            outcome = await in_thread(self.pipeline.extract_document, job.document, job.file_hash)
+                    except Exception as e:
+                        fail(job, e)
+                        continue
+
+                    if isinstance(outcome, IngestResult):
+                        # Duplicate or failed extraction: the file is finished
+                        finish(job.path, outcome)
+                        continue
+                    job.document = outcome
+                    await embed_queue.put(job)
+
+            async def embed_worker() -> None:
+                while True:
+                    batch, done = await self._next_batch(embed_queue, self.embed_batch_size)
+                    if batch:
+                        try:
+                            with self.metrics.timer("ingest_stage_seconds", stage="embed"):
+                                embedded = await in_thread(dual_embedder.embed_documents, [job.document for job in batch])
+                            await in_thread(dual_embedder.record_stage, embedded, "embedded")
+                        except Exception as e:
+                            for job in batch:
+                                fail(job, e)
+                        else:
+                            for job, item in zip(batch, embedded):
+                                job.embedded = item
+                                await write_queue.put(job)
+                    if done:
+                        return
+
+            async def write(batch: List[_Job]) -> None:
+                embedded = [job.embedded for job in batch]
+                with self.metrics.timer("ingest_stage_seconds", stage="write"):
+                    duplicates = set(await in_thread(dual_embedder.store_documents, embedded))
+                await in_thread(dual_embedder.record_stage, embedded, "stored")
+                for job in batch:
+                    if job.embedded.document.id in duplicates:
+                        # Stored meanwhile under another id (CLI and daemon racing on the same file)
+                        try:
+                            finish(job.path, await in_thread(self.pipeline.load_duplicate_result, job.file_hash))
+                        except Exception as e:
+                            fail(job, e)
+                    else:
+                        complete(job)
+
+            async def write_worker() -> None:
+                while True:
+                    batch, done = await self._next_batch(write_queue, self.write_batch_size)
+                    if batch:
+                        try:
+                            await write(batch)
+                        except Exception as e:
+                            if len(batch) == 1:
+                                # Embeddings stay journaled, so a rerun only repeats the write
+                                fail(batch[0], e)
+                            else:
+                                # One bad row fails the whole upsert: retry row by row to isolate it
+                                logger.warning(f"Bulk write of {len(batch)} documents failed ({e}), writing one by one")
+                                for job in batch:
+                                    try:
+                                        await write([job])
+                                    except Exception as row_error:
+                                        fail(job, row_error)
+                    if done:
+                        return
+
+            feeder = asyncio.create_task(feed())
+            parsers = [asyncio.create_task(parse_worker()) for _ in range(self.parse_workers)]
+            extractors = [asyncio.create_task(extract_worker()) for _ in range(self.llm_workers)]
+            embedder = asyncio.create_task(embed_worker())
+            writer = asyncio.create_task(write_worker())
+
+            # Close each stage once everything upstream of it has finished
+            await feeder
+            await self._close(parse_queue, parsers)
+            await self._close(extract_queue, extractors)
+            await self._close(embed_queue, [embedder])
+            await self._close(write_queue, [writer])
+
+        self.metrics.unregister_collector("ingest_queue_depth")
+        self._queues = {}
+
+    @staticmethod
+    async def _close(queue: asyncio.Queue, workers: List[asyncio.Task]) -> None:
+        """Send one end marker per worker and wait for the workers to drain the queue."""
+        for _ in workers:
+            await queue.put(_DONE)
+        await asyncio.gather(*workers)
+
+    async def _next_batch(self, queue: asyncio.Queue, max_size: int) -> Tuple[List[_Job], bool]:
+        """
+        Collect a micro-batch: block for the first job, then take more until the
+        batch is full or ``batch_wait_seconds`` have passed.
+
+        Returns:
+            (jobs, done) where done means the end marker was reached
+        """
+        first = await queue.get()
+        if first is _DONE:
+            return [], True
+
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        deadline = loop.time() + self.batch_wait_seconds
+
+        while len(batch) < max_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if job is _DONE:
+                return batch, True
+            batch.append(job)
+
+        return batch, False
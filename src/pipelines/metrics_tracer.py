@@ -0,0 +1,106 @@
+"""
+Haystack tracer that times every component and pipeline run.
+Durations go to MetricsRegistry as component_seconds{component=...} and pipeline_run_seconds.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from infrastructure.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_enable_lock = threading.Lock()
+
+
+class _NullSpan:
+    """Span handed out when no other tracer is installed."""
+
+    def set_tag(self, key: str, value: Any) -> None:
+        pass
+
+    def set_tags(self, tags: Dict[str, Any]) -> None:
+        pass
+
+    def raw_span(self) -> Any:
+        return self
+
+    def set_content_tag(self, key: str, value: Any) -> None:
+        pass
+
+    def get_correlation_data_for_logs(self) -> Dict[str, Any]:
+        return {}
+
+
+class ComponentMetricsTracer:
+    """
+    Records the duration of Haystack's component and pipeline spans.
+
+    Haystack opens a span around every component run (whether the pipeline
+    is run directly or by the staged executor), so wrapping its tracer
+    instruments all nodes without touching them. An already installed tracer
+    (e.g. OpenTelemetry) keeps receiving every span.
+    """
+
+    def __init__(self, inner: Optional[Any] = None):
+        """
+        Initialize component metrics tracer.
+
+        Args:
+            inner: Tracer that was active before (spans are forwarded to it)
+        """
+        self.inner = inner
+        self.metrics = MetricsRegistry()
+
+    @contextmanager
+    def trace(self, operation_name: str, tags: Optional[Dict[str, Any]] = None, parent_span: Optional[Any] = None) -> Iterator[Any]:
+        """Time one span and forward it to the inner tracer."""
+        start = time.perf_counter()
+        try:
+            if self.inner is None:
+                yield _NullSpan()
+            elif parent_span is None:
+                with self.inner.trace(operation_name, tags=tags) as span:
+                    yield span
+            else:
+                with self.inner.trace(operation_name, tags=tags, parent_span=parent_span) as span:
+                    yield span
+        finally:
+            elapsed = time.perf_counter() - start
+            if operation_name == "haystack.component.run":
+                name = (tags or {}).get("haystack.component.name", "unknown")
+                self.metrics.observe("component_seconds", elapsed, component=name)
+            elif operation_name == "haystack.pipeline.run":
+                self.metrics.observe("pipeline_run_seconds", elapsed)
+
+    def current_span(self) -> Optional[Any]:
+        """Current span of the inner tracer (None without one)."""
+        return self.inner.current_span() if self.inner is not None else None
+
+
+def enable_component_metrics() -> bool:
+    """
+    Install ComponentMetricsTracer as Haystack's tracer (once per process).
+
+    Returns:
+        True if component timing is active
+    """
+    global _enabled
+    with _enable_lock:
+        if _enabled:
+            return True
+        try:
+            from haystack import tracing
+        except ImportError:
+            logger.warning("This Haystack version has no tracing support; component timings are disabled")
+            return False
+
+        inner = getattr(tracing.tracer, "actual_tracer", None)
+        tracing.enable_tracing(ComponentMetricsTracer(inner))
+        _enabled = True
+        logger.info("Component metrics enabled")
+        return True
@@ -3,23 +3,29 @@ Pure Haystack-based Similarity Search Pipeline.
 Uses only native Haystack components - no wrappers.
 """
 
+import asyncio
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from haystack import Pipeline, Document
-from haystack.components.embedders import SentenceTransformersTextEmbedder
-from haystack.components.rankers import TransformersSimilarityRanker
 from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 
 from core.config import Config
-from core.models import SimilaritySearchResult, SimilarCase, IngestResult, ProcessingStatus
+from core.models import SimilaritySearchResult, SimilarCase, IngestResult, ProcessingStatus, CaseMetadata
 from pipelines.haystack_ingestion_pipeline import HaystackIngestionPipeline
-from pipelines.haystack_custom_nodes import ThresholdFilterNode, FactsEmbeddingRetriever
+from infrastructure.model_registry import ModelRegistry
+from pipelines.haystack_custom_nodes import (
+    ThresholdFilterNode, FactsEmbeddingRetriever, QueryEmbedderNode, CrossEncoderRankerNode, EmbeddedDocument
+)
 
 logger = logging.getLogger(__name__)
 
+# Ephemeral query documents kept for an explicit save (oldest dropped first)
+MAX_PENDING_QUERIES = 32
+
 
 class PureHaystackSimilarityPipeline:
     """
@@ -27,18 +33,29 @@ class PureHaystackSimilarityPipeline:
     
     Pipeline Flow:
     1. Query PDF → HaystackIngestionPipeline → Embedding
+       (query cases are searched with their facts vector, built like the
+       stored ones; only free text is embedded; new query PDFs stay in
+       memory unless persisted)
     2. Query Embedding → PgvectorEmbeddingRetriever (cosine similarity)
-    3. Retrieved Docs → TransformersSimilarityRanker (cross-encoder)
+    3. Retrieved Docs → CrossEncoderRankerNode (cross-encoder)
     4. Ranked Docs → ThresholdFilterNode (filter by score)
     5. Filtered Docs → Format as SimilarCase objects
     """
     
-    def __init__(self):
-        """Initialize pure Haystack similarity pipeline."""
+    def __init__(self, ingestion_pipeline: Optional[HaystackIngestionPipeline] = None):
+        """
+        Initialize pure Haystack similarity pipeline.
+        
+        Args:
+            ingestion_pipeline: Ingestion pipeline for query documents
+                (defaults to the process-wide shared instance)
+        """
         self.config = Config()
         
-        # Initialize ingestion pipeline for query documents
-        self.ingestion_pipeline = HaystackIngestionPipeline()
+        # Reuse the ingestion pipeline (and its models, store and pool) for query documents
+        self.ingestion_pipeline = ingestion_pipeline or ModelRegistry().get_shared(
+            "ingestion_pipeline", HaystackIngestionPipeline
+        )
         
         # Get document store from ingestion pipeline (same instance)
         self.document_store = self.ingestion_pipeline.document_store
@@ -47,6 +64,10 @@ class PureHaystackSimilarityPipeline:
         self.top_k_retrieval = self.config.top_k   # Retrieve 3x for reranking
         self.top_k_final = self.config.top_k
         self.threshold = self.config.cross_encoder_threshold
+        self.persist_queries = self.config.search_persist_queries
+        
+        # Ephemeral query documents by document ID, with the model their vectors were built with
+        self._pending_queries: OrderedDict[str, Tuple[EmbeddedDocument, str]] = OrderedDict()
         
         # Build retrieval pipeline
         self._build_retrieval_pipeline()
@@ -56,35 +77,33 @@ class PureHaystackSimilarityPipeline:
     def _build_retrieval_pipeline(self):
         """Build Haystack pipeline for similarity search using facts embeddings."""
         
-        # 1. Text Embedder (for query)
-        text_embedder = SentenceTransformersTextEmbedder(
-            model="sentence-transformers/all-mpnet-base-v2",
-            progress_bar=False
-        )
+        # 1. Text Embedder (for query, same model as the stored vectors)
+        self.text_embedder = QueryEmbedderNode(model=self.ingestion_pipeline.embedding_model)
         
         # 2. Facts Embedding Retriever (searches on 'embedding' column with facts)
-        retriever = FactsEmbeddingRetriever(
+        self.retriever = FactsEmbeddingRetriever(
             document_store=self.document_store,
-            top_k=self.top_k_retrieval
+            top_k=self.top_k_retrieval,
+            db_pool=self.ingestion_pipeline.db_pool
         )
         
         # 3. Reranker (cross-encoder)
-        ranker = TransformersSimilarityRanker(
-            model="cross-encoder/ms-marco-MiniLM-L-6-v2",
+        self.ranker = CrossEncoderRankerNode(
+            model=self.config.ranker_model,
             top_k=self.top_k_final
         )
         
         # 4. Threshold Filter
-        threshold_filter = ThresholdFilterNode(threshold=self.threshold)
+        self.threshold_filter = ThresholdFilterNode(threshold=self.threshold)
         
         # Build pipeline
         self.retrieval_pipeline = Pipeline()
         
         # Add components
-        self.retrieval_pipeline.add_component("text_embedder", text_embedder)
-        self.retrieval_pipeline.add_component("retriever", retriever)
-        self.retrieval_pipeline.add_component("ranker", ranker)
-        self.retrieval_pipeline.add_component("threshold_filter", threshold_filter)
+        self.retrieval_pipeline.add_component("text_embedder", self.text_embedder)
+        self.retrieval_pipeline.add_component("retriever", self.retriever)
+        self.retrieval_pipeline.add_component("ranker", self.ranker)
+        self.retrieval_pipeline.add_component("threshold_filter", self.threshold_filter)
         
         # Connect components
         self.retrieval_pipeline.connect("text_embedder.embedding", "retriever.query_embedding")
@@ -96,15 +115,22 @@ class PureHaystackSimilarityPipeline:
     async def search_similar(
         self,
         file_path: Path,
-        use_metadata_query: bool = False
+        use_metadata_query: bool = False,
+        persist: Optional[bool] = None
     ) -> SimilaritySearchResult:
         """
         Search for similar cases using pure Haystack pipeline.
         
+        Without ``persist`` the query document is extracted and embedded in
+        memory only: nothing is written to the corpus, and the document can be
+        stored afterwards with ``save_query_to_corpus``.
+        
         Args:
             file_path: Path to query PDF file
             use_metadata_query: If True, search by metadata instead of facts
-            
+            persist: Whether to add the query document to the corpus
+                (defaults to SEARCH_PERSIST_QUERIES)
+        
         Returns:
             SimilaritySearchResult with similar cases
         """
@@ -115,9 +141,17 @@ class PureHaystackSimilarityPipeline:
         
         logger.info(f"Starting similarity search for: {file_path.name}")
         
-        # Phase 1: Ingest query document
-        logger.info("Phase 1: Ingesting query document")
-        ingest_result = await self.ingestion_pipeline.ingest_single(file_path)
+        # Phase 1: Ingest query document (or only extract and embed it)
+        if persist is None:
+            persist = self.persist_queries
+        if persist:
+            logger.info("Phase 1: Ingesting query document")
+            ingest_result = await self.ingestion_pipeline.ingest_single(file_path)
+        else:
+            logger.info("Phase 1: Analyzing query document (ephemeral)")
+            ingest_result, embedded = await self.ingestion_pipeline.analyze_single(file_path)
+            if embedded is not None:
+                self._remember_query(embedded)
         
         # Handle failed ingestion
         if ingest_result.status == ProcessingStatus.FAILED:
@@ -132,7 +166,143 @@ class PureHaystackSimilarityPipeline:
         
         # Log if document was a duplicate (but continue with similarity search)
         if ingest_result.status == ProcessingStatus.SKIPPED_DUPLICATE:
-            logger.info("Query document is a duplicate, using existing data for similarity search")
+            logger.info("Query document is a duplicate, using its stored vector for similarity search")
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._search_case, str(file_path), ingest_result, use_metadata_query
+        )
+    
+    def _remember_query(self, embedded: EmbeddedDocument) -> None:
+        """Keep an ephemeral query document for ``save_query_to_corpus``."""
+        document_id = embedded.document.id
+        self._pending_queries.pop(document_id, None)
+        self._pending_queries[document_id] = (embedded, self.ingestion_pipeline.embedding_model)
+        while len(self._pending_queries) > MAX_PENDING_QUERIES:
+            self._pending_queries.popitem(last=False)
+    
+    def pending_queries(self) -> List[str]:
+        """Document IDs of ephemeral query documents that can still be saved, oldest first."""
+        return list(self._pending_queries)
+    
+    async def save_query_to_corpus(self, document_id: str) -> IngestResult:
+        """
+        Add an ephemeral query document to the corpus.
+        
+        The extracted metadata, facts and vectors of the earlier search are
+        stored as they are (no PDF parsing or LLM calls).
+        
+        Args:
+            document_id: ``input_case.document_id`` of an ephemeral search result
+        
+        Returns:
+            IngestResult of the stored document (FAILED if the document is no longer pending)
+        """
+        pending = self._pending_queries.pop(document_id, None)
+        if pending is None:
+            return self.ingestion_pipeline.failed_result(None, f"No pending query document: {document_id}")
+        
+        embedded, embedding_model = pending
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None, self.ingestion_pipeline.save_document, embedded, embedding_model
+        )
+        if result.status == ProcessingStatus.FAILED:
+            # Keep it for another attempt
+            self._pending_queries[document_id] = pending
+        return result
+    
+    async def search_by_document_id(
+        self,
+        document_id: str,
+        use_metadata_query: bool = False
+    ) -> SimilaritySearchResult:
+        """
+        Search for cases similar to an already-indexed case ("more like this").
+        
+        The stored facts vector is used as the query, so nothing is parsed,
+        extracted or embedded.
+        
+        Args:
+            document_id: ID of the stored query case
+            use_metadata_query: If True, search by metadata instead of facts
+        
+        Returns:
+            SimilaritySearchResult with similar cases (the query case itself excluded)
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.ingestion_pipeline.sync_embedding_model)
+        
+        error_message = f"Document not found: {document_id}"
+        try:
+            stored = await loop.run_in_executor(None, self.ingestion_pipeline.load_document, document_id)
+        except Exception as e:
+            logger.error(f"Failed to load document {document_id}: {e}")
+            stored = None
+            error_message = f"Failed to load document: {str(e)}"
+        
+        if stored is None:
+            return SimilaritySearchResult(
+                query_file=document_id,
+                input_case=None,
+                similar_cases=[],
+                total_above_threshold=0,
+                search_mode="facts" if not use_metadata_query else "metadata",
+                error_message=error_message
+            )
+        
+        return await loop.run_in_executor(
+            None, self._search_case, document_id, stored, use_metadata_query
+        )
+    
+    async def search_by_text(self, text: str) -> SimilaritySearchResult:
+        """
+        Search for cases similar to free text (only the text is embedded).
+        
+        Args:
+            text: Query text, e.g. a description of the facts
+        
+        Returns:
+            SimilaritySearchResult with similar cases
+        """
+        if not text or not text.strip():
+            return SimilaritySearchResult(
+                query_file="",
+                input_case=None,
+                similar_cases=[],
+                total_above_threshold=0,
+                search_mode="text",
+                error_message="Empty query text"
+            )
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.ingestion_pipeline.sync_embedding_model)
+        return await loop.run_in_executor(None, lambda: self._search("", None, text, "text"))
+    
+    @staticmethod
+    def _metadata_query(metadata: CaseMetadata) -> str:
+        """Query text built from case metadata (sections, court, title)."""
+        sections = ' '.join(metadata.sections_invoked) if metadata.sections_invoked else ''
+        return f"{sections} {metadata.court_name} {metadata.case_title}"
+    
+    def _search_case(
+        self,
+        query_file: str,
+        ingest_result: IngestResult,
+        use_metadata_query: bool
+    ) -> SimilaritySearchResult:
+        """
+        Search for cases similar to an ingested or stored case.
+        
+        Args:
+            query_file: Query file path (or document ID) reported in the result
+            ingest_result: The query case
+            use_metadata_query: If True, search by metadata instead of facts
+        
+        Returns:
+            SimilaritySearchResult with similar cases
+        """
+        search_mode = "metadata" if use_metadata_query else "facts"
         
         # Phase 2: Prepare query text
         logger.info("Phase 2: Preparing query for retrieval")
@@ -141,71 +311,127 @@ class PureHaystackSimilarityPipeline:
         if ingest_result.metadata is None:
             logger.error("Metadata is None, cannot build query")
             return SimilaritySearchResult(
-                query_file=str(file_path),
+                query_file=query_file,
                 input_case=ingest_result,
                 similar_cases=[],
                 total_above_threshold=0,
-                search_mode="facts" if not use_metadata_query else "metadata",
+                search_mode=search_mode,
                 error_message="No metadata available for query"
             )
         
+        # Facts searches query with the case's facts vector (formatted facts
+        # template, as stored for every row): the stored one for stored and
+        # duplicate cases, the freshly built one for new query PDFs
+        query_embedding = None
         if use_metadata_query:
             # Build metadata query from case metadata
-            meta = ingest_result.metadata
-            sections = ' '.join(meta.sections_invoked) if meta.sections_invoked else ''
-            search_text = f"{sections} {meta.court_name} {meta.case_title}"
+            search_text = self._metadata_query(ingest_result.metadata)
         else:
             # Use facts summary for query (fallback to metadata if no facts)
             search_text = ingest_result.facts_summary
             if not search_text or len(search_text.strip()) == 0:
                 logger.warning("No facts summary available, using metadata for search")
-                meta = ingest_result.metadata
-                sections = ' '.join(meta.sections_invoked) if meta.sections_invoked else ''
-                search_text = f"{sections} {meta.court_name} {meta.case_title}"
+                search_text = self._metadata_query(ingest_result.metadata)
+            else:
+                query_embedding = ingest_result.embedding_facts
         
+        return self._search(
+            query_file, ingest_result, search_text, search_mode,
+            query_embedding, ingest_result.document_id or None
+        )
+    
+    def _search(
+        self,
+        query_file: str,
+        input_case: Optional[IngestResult],
+        search_text: str,
+        search_mode: str,
+        query_embedding: Optional[List[float]] = None,
+        exclude_id: Optional[str] = None
+    ) -> SimilaritySearchResult:
+        """
+        Retrieve, re-rank and filter similar cases.
+        
+        Args:
+            query_file: Query file path (or document ID) reported in the result
+            input_case: The query case, if any
+            search_text: Query text (embedded unless ``query_embedding`` is given; always used by the ranker)
+            search_mode: Search mode reported in the result
+            query_embedding: Facts vector of the query case
+            exclude_id: Document ID excluded from the results (the query case itself)
+        
+        Returns:
+            SimilaritySearchResult with similar cases
+        """
         logger.info(f"Query text length: {len(search_text)} characters")
         
         # Phase 3: Run Haystack retrieval pipeline
         logger.info("Phase 3: Running Haystack retrieval pipeline")
         
+        # Build filters to exclude query document
+        filters = None
+        if exclude_id:
+            filters = {
+                "field": "id",
+                "operator": "!=",
+                "value": exclude_id
+            }
+        
         try:
-            # Build filters to exclude query document
-            filters = None
-            if ingest_result.case_id:
-                filters = {
-                    "field": "id",
-                    "operator": "!=",
-                    "value": ingest_result.document_id
-                }
-            
-            # Run pipeline
-            pipeline_result = self.retrieval_pipeline.run({
-                "text_embedder": {"text": search_text},
-                "retriever": {"filters": filters},
-                "ranker": {"query": search_text}
-            })
-            
-            # Get filtered documents
-            filtered_documents = pipeline_result["threshold_filter"]["documents"]
+            if query_embedding is not None:
+                # Facts vector given: skip the embedder and run the remaining components directly
+                documents = self.retriever.run(query_embedding=list(query_embedding), filters=filters)["documents"]
+                documents = self.ranker.run(query=search_text, documents=documents)["documents"]
+                filtered_documents = self.threshold_filter.run(documents=documents)["documents"]
+            else:
+                # Query with the model of the stored vectors (ingest_single follows model switches)
+                self.text_embedder.use_model(self.ingestion_pipeline.embedding_model)
+                
+                # Run pipeline
+                pipeline_result = self.retrieval_pipeline.run({
+                    "text_embedder": {"text": search_text},
+                    "retriever": {"filters": filters},
+                    "ranker": {"query": search_text}
+                })
+                
+                # Get filtered documents
+                filtered_documents = pipeline_result["threshold_filter"]["documents"]
             
             logger.info(f"Retrieved {len(filtered_documents)} similar cases above threshold")
-            
+        
         except Exception as e:
             logger.error(f"Pipeline execution failed: {e}")
             return SimilaritySearchResult(
-                query_file=str(file_path),
-                input_case=ingest_result,
+                query_file=query_file,
+                input_case=input_case,
                 similar_cases=[],
                 total_above_threshold=0,
-                search_mode="facts" if not use_metadata_query else "metadata",
+                search_mode=search_mode,
                 error_message=f"Retrieval failed: {str(e)}"
             )
         
         # Phase 4: Convert to SimilarCase objects
         logger.info("Phase 4: Formatting results")
+        similar_cases = self._to_similar_cases(filtered_documents)
         
+        # Create result
+        result = SimilaritySearchResult(
+            query_file=query_file,
+            input_case=input_case,
+            similar_cases=similar_cases,
+            total_above_threshold=len(similar_cases),
+            search_mode=search_mode,
+            error_message=None
+        )
+        
+        logger.info(f"Similarity search completed: {len(similar_cases)} cases found")
+        return result
+    
+    @staticmethod
+    def _to_similar_cases(documents: List[Document]) -> List[SimilarCase]:
+        """Format ranked documents as SimilarCase objects."""
         similar_cases = []
-        for doc in filtered_documents:
+        for doc in documents:
             meta = doc.meta or {}
             
             # Extract scores
@@ -226,19 +452,7 @@ class PureHaystackSimilarityPipeline:
                 sections_invoked=meta.get('sections_invoked', [])
             )
             similar_cases.append(similar_case)
-        
-        # Create result
-        result = SimilaritySearchResult(
-            query_file=str(file_path),
-            input_case=ingest_result,
-            similar_cases=similar_cases,
-            total_above_threshold=len(similar_cases),
-            search_mode="metadata" if use_metadata_query else "metadata",
-            error_message=None
-        )
-        
-        logger.info(f"Similarity search completed: {len(similar_cases)} cases found")
-        return result
+        return similar_cases
     
     def visualize_pipeline(self) -> str:
         """Get visual representation of the retrieval pipeline."""
@@ -5,17 +5,25 @@ Main entry point for user interaction.
 
 import asyncio
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, TYPE_CHECKING
 
 from rich.prompt import Prompt, Confirm
 from rich import print as rprint
 from rich.panel import Panel
 
 from presentation.formatters import RichFormatter, console
-from pipelines import HaystackIngestionPipeline, PureHaystackSimilarityPipeline
 from core.config import Config
 from core.exceptions import CaseMindException
+from core.models import ProcessingStatus
+from infrastructure.database import DatabasePool
+from infrastructure.metrics import MetricsRegistry, serve_metrics
+from utils.file_discovery import iter_pdf_files
+
+if TYPE_CHECKING:
+    # Heavy imports (haystack, torch, sentence-transformers) happen during warm-up
+    from pipelines import HaystackIngestionPipeline, PureHaystackSimilarityPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +35,17 @@ class CLIApp:
         """Initialize CLI application."""
         self.config = Config()
         self.formatter = RichFormatter()
-        self.ingestion_pipeline: Optional[HaystackIngestionPipeline] = None
-        self.similarity_pipeline: Optional[PureHaystackSimilarityPipeline] = None
+        self.db_pool: Optional[DatabasePool] = None
+        self.ingestion_pipeline: Optional['HaystackIngestionPipeline'] = None
+        self.similarity_pipeline: Optional['PureHaystackSimilarityPipeline'] = None
         self.running = False
         
+        # Background warm-up of the pipelines (and the models they load)
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_lock = threading.Lock()
+        self._backend_ready = threading.Event()
+        self._warmup_error: Optional[Exception] = None
+        
         logger.info("CLI Application initialized")
     
     async def start(self):
@@ -48,17 +63,21 @@ class CLIApp:
         while self.running:
             try:
                 self.formatter.display_menu()
-                choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5"])
+                choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6"])
                 
                 if choice == "1":
-                    await self._ingest_cases_batch()
+                    if await self._ensure_backend():
+                        await self._ingest_cases_batch()
                 elif choice == "2":
-                    await self._find_similar_cases()
+                    if await self._ensure_backend():
+                        await self._find_similar_cases()
                 elif choice == "3":
                     await self._show_statistics()
                 elif choice == "4":
                     await self._health_check()
                 elif choice == "5":
+                    await self._show_performance()
+                elif choice == "6":
                     await self._shutdown()
                 
             except KeyboardInterrupt:
@@ -73,22 +92,31 @@ class CLIApp:
         """
         Initialize backend services.
         
+        Only the database pool is opened here; the Haystack pipelines and their
+        models are built lazily (in the background if warm-up is enabled).
+        
         Returns:
             True if successful, False otherwise
         """
         try:
             console.print("\n[bold cyan]Initializing backend services...[/bold cyan]")
             
-            # Initialize pure Haystack pipelines
-            console.print("  • Loading ingestion pipeline...")
-            self.ingestion_pipeline = HaystackIngestionPipeline()
+            # Connection pool shared with the pipelines once they are built
+            console.print("  • Testing database connection...")
+            self.db_pool = DatabasePool(
+                self.config.db_connection_string,
+                min_connections=self.config.db_pool_min_connections,
+                max_connections=self.config.db_pool_max_connections
+            )
+            doc_count = self._count_documents()
             
-            console.print("  • Loading similarity pipeline...")
-            self.similarity_pipeline = PureHaystackSimilarityPipeline()
+            if self.config.metrics_port:
+                console.print(f"  • Serving metrics on port {self.config.metrics_port}...")
+                serve_metrics(self.config.metrics_port, self.config.metrics_host)
             
-            # Check database connection via document store
-            console.print("  • Testing database connection...")
-            doc_count = self.similarity_pipeline.document_store.count_documents()
+            if self.config.background_warmup:
+                console.print("  • Loading pipelines in the background...")
+                self._start_warmup()
             
             self.formatter.print_success("Backend initialized successfully")
             self.formatter.print_info(f"Database: {doc_count} cases indexed")
@@ -102,10 +130,76 @@ class CLIApp:
             self.formatter.print_error(f"Backend initialization failed: {str(e)}")
             return False
     
+    def _start_warmup(self) -> None:
+        """Start building the pipelines in a daemon thread (no-op if already started)."""
+        with self._warmup_lock:
+            if self._warmup_thread is not None:
+                return
+            self._warmup_thread = threading.Thread(
+                target=self._warm_up,
+                name="casemind-warmup",
+                daemon=True
+            )
+            self._warmup_thread.start()
+    
+    def _warm_up(self) -> None:
+        """Import and build the Haystack pipelines; runs on the warm-up thread."""
+        try:
+            from pipelines import HaystackIngestionPipeline, PureHaystackSimilarityPipeline
+            
+            ingestion_pipeline = HaystackIngestionPipeline(db_pool=self.db_pool)
+            similarity_pipeline = PureHaystackSimilarityPipeline(ingestion_pipeline)
+            
+            self.ingestion_pipeline = ingestion_pipeline
+            self.similarity_pipeline = similarity_pipeline
+            logger.info("Backend warm-up complete")
+        except Exception as e:
+            import traceback
+            logger.error(f"Backend warm-up failed: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            self._warmup_error = e
+        finally:
+            self._backend_ready.set()
+    
+    async def _ensure_backend(self) -> bool:
+        """
+        Wait until the pipelines are built, starting the warm-up if needed.
+        
+        Returns:
+            True if the pipelines are ready, False if building them failed
+        """
+        self._start_warmup()
+        
+        if not self._backend_ready.is_set():
+            loop = asyncio.get_running_loop()
+            with console.status("[bold green]Loading models..."):
+                await loop.run_in_executor(None, self._backend_ready.wait)
+        
+        if self._warmup_error is not None:
+            self.formatter.print_error(f"Backend initialization failed: {str(self._warmup_error)}")
+            return False
+        
+        return True
+    
+    def _count_documents(self) -> int:
+        """Count stored documents directly (0 if the table is not created yet)."""
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('haystack_documents') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                return 0
+            cursor.execute("SELECT COUNT(*) FROM haystack_documents")
+            return cursor.fetchone()[0]
+    
     async def _ingest_cases_batch(self):
         """Ingest cases from a folder (batch processing)."""
         console.print("\n[bold cyan]═══ Batch Case Ingestion ═══[/bold cyan]\n")
         
+        # Finish files an interrupted run left behind (resumed at their last completed stage),
+        # then go on to the folder prompt
+        pending_files = self.ingestion_pipeline.pending_files()
+        if pending_files and Confirm.ask(f"Resume {len(pending_files)} file(s) left unfinished by an earlier run?"):
+            await self._run_batch(pending_files)
+        
         # Get folder path
         folder_path = Prompt.ask("Enter folder path containing PDF files")
         folder_path = Path(folder_path)
@@ -114,8 +208,8 @@ class CLIApp:
             self.formatter.print_error(f"Folder not found: {folder_path}")
             return
         
-        # Count PDF files
-        pdf_files = list(folder_path.glob("*.pdf"))
+        # Find PDF files (including nested folders such as Cases/Dacoity/HC)
+        pdf_files = [entry.path for entry in iter_pdf_files(folder_path)]
         if not pdf_files:
             self.formatter.print_warning("No PDF files found in folder")
             return
@@ -127,36 +221,26 @@ class CLIApp:
             self.formatter.print_info("Batch ingestion cancelled")
             return
         
-        # Process batch
+        await self._run_batch(pdf_files)
+    
+    async def _run_batch(self, pdf_files: List[Path]):
+        """Ingest files with a progress bar and print the batch summary."""
         try:
-            completed = 0
-            skipped = 0
-            failed = 0
-            
             with self.formatter.display_progress_bar(len(pdf_files), "Ingesting cases") as progress:
                 task = progress.add_task("Processing...", total=len(pdf_files))
                 
-                for pdf_file in pdf_files:
-                    try:
-                        result = await self.ingestion_pipeline.ingest_single(pdf_file, display_summary=False)
-                        if result.status.value == "completed":
-                            completed += 1
-                        elif result.status.value == "skipped_duplicate":
-                            skipped += 1
-                        else:
-                            failed += 1
-                    except Exception as e:
-                        logger.error(f"Failed to ingest {pdf_file.name}: {e}")
-                        failed += 1
-                    
-                    progress.update(task, advance=1)
+                batch_result = await self.ingestion_pipeline.ingest_batch(
+                    pdf_files,
+                    concurrency=self.config.ingest_concurrency,
+                    progress_callback=lambda path, result: progress.update(task, advance=1)
+                )
             
             # Display results
             console.print()
             self.formatter.print_success(f"Batch ingestion complete")
-            console.print(f"  • Completed: {completed}")
-            console.print(f"  • Skipped (duplicates): {skipped}")
-            console.print(f"  • Failed: {failed}")
+            console.print(f"  • Completed: {batch_result.processed}")
+            console.print(f"  • Skipped (duplicates): {batch_result.skipped_duplicates}")
+            console.print(f"  • Failed: {batch_result.failed}")
             
         except Exception as e:
             logger.error(f"Batch ingestion error: {e}")
@@ -225,6 +309,16 @@ class CLIApp:
             else:
                 self.formatter.print_warning("No similar cases found")
             
+            # Ephemeral query: offer to add it to the corpus (reuses the extracted facts and vectors)
+            if result.input_case and result.input_case.status == ProcessingStatus.PENDING:
+                console.print()
+                if Confirm.ask("Add the query case to the database?", default=False):
+                    saved = await self.similarity_pipeline.save_query_to_corpus(result.input_case.document_id)
+                    if saved.status == ProcessingStatus.FAILED:
+                        self.formatter.print_error(f"Could not save query case: {saved.error_message}")
+                    else:
+                        self.formatter.print_success(f"Query case saved: {saved.case_id}")
+        
         except Exception as e:
             logger.error(f"Similarity search error: {e}")
             self.formatter.print_error(f"Similarity search failed: {str(e)}")
@@ -234,14 +328,14 @@ class CLIApp:
         console.print("\n[bold cyan]═══ Database Statistics ═══[/bold cyan]\n")
         
         try:
-            # Get document count from document store
-            doc_count = self.similarity_pipeline.document_store.count_documents()
+            # Count directly through the pool (does not wait for model warm-up)
+            doc_count = self._count_documents()
             
             stats = {
                 "total_documents": doc_count,
                 "database": "PostgreSQL + pgvector",
-                "embedding_model": "sentence-transformers/all-mpnet-base-v2",
-                "ranker_model": "cross-encoder/ms-marco-MiniLM-L-6-v2"
+                "embedding_model": self.config.embedding_model,
+                "ranker_model": self.config.ranker_model
             }
             
             console.print(self.formatter.format_statistics(stats))
@@ -250,6 +344,28 @@ class CLIApp:
             logger.error(f"Statistics retrieval error: {e}")
             self.formatter.print_error(f"Failed to retrieve statistics: {str(e)}")
     
+    async def _show_performance(self):
+        """Display latency histograms, counters and queue depths recorded so far."""
+        console.print("\n[bold cyan]═══ Performance ═══[/bold cyan]\n")
+        
+        snapshot = MetricsRegistry().snapshot()
+        if not any(snapshot.values()):
+            self.formatter.print_info("No measurements yet - ingest or search first")
+            return
+        
+        for table in self.formatter.format_performance(snapshot):
+            console.print(table)
+        
+        if self.config.metrics_port:
+            self.formatter.print_info(
+                f"Also served at http://{self.config.metrics_host}:{self.config.metrics_port}/metrics (and /metrics.json)"
+            )
+        
+        if Confirm.ask("Save a JSON snapshot?", default=False):
+            path = Path(Prompt.ask("File", default="metrics_snapshot.json"))
+            path.write_text(MetricsRegistry().to_json(), encoding="utf-8")
+            self.formatter.print_success(f"Saved {path}")
+    
     async def _health_check(self):
         """Perform health check on all components."""
         console.print("\n[bold cyan]═══ System Health Check ═══[/bold cyan]\n")
@@ -258,22 +374,25 @@ class CLIApp:
         
         # Check database connection
         try:
-            doc_count = self.similarity_pipeline.document_store.count_documents()
+            self._count_documents()
             health_status["PostgreSQL Database"] = True
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             health_status["PostgreSQL Database"] = False
         
-        # Check pgvector (implicit in document store)
+        # Check pgvector extension
         try:
-            # If document store works, pgvector is working
-            health_status["pgvector Extension"] = health_status["PostgreSQL Database"]
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
+                health_status["pgvector Extension"] = cursor.fetchone() is not None
         except Exception as e:
             logger.error(f"pgvector health check failed: {e}")
             health_status["pgvector Extension"] = False
         
-        # Check Haystack pipelines
+        # Check Haystack pipelines (reported as not ready while still warming up)
         try:
+            if self._warmup_thread is not None and not self._backend_ready.is_set():
+                self.formatter.print_info("Pipelines are still loading in the background")
             health_status["Ingestion Pipeline"] = self.ingestion_pipeline is not None
             health_status["Similarity Pipeline"] = self.similarity_pipeline is not None
         except Exception as e:
@@ -295,8 +414,10 @@ class CLIApp:
         """Shutdown the application."""
         console.print("\n[bold cyan]Shutting down CaseMind...[/bold cyan]")
         
-        # Cleanup (Haystack handles connections internally)
+        # Cleanup (Haystack handles its own connections; close the shared pool)
         logger.info("Cleaning up resources...")
+        if self.db_pool is not None:
+            self.db_pool.close()
         
         self.formatter.print_success("Goodbye!")
         self.running = False
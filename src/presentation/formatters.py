@@ -75,7 +75,8 @@ class RichFormatter:
         menu_table.add_row("2", "Find Similar Cases")
         menu_table.add_row("3", "Database Statistics")
         menu_table.add_row("4", "Health Check")
-        menu_table.add_row("5", "Exit")
+        menu_table.add_row("5", "Performance")
+        menu_table.add_row("6", "Exit")
         
         console.print("\n")
         console.print(menu_table)
@@ -272,6 +273,44 @@ class RichFormatter:
         
         return table
     
+    @staticmethod
+    def format_performance(snapshot: Dict[str, List[Dict[str, Any]]]) -> List[Table]:
+        """
+        Format a metrics snapshot.
+        
+        Args:
+            snapshot: MetricsRegistry.snapshot()
+        
+        Returns:
+            Rich Tables (latencies, then counters and gauges)
+        """
+        def label_text(labels: Dict[str, str]) -> str:
+            return ", ".join(f"{key}={value}" for key, value in labels.items())
+        
+        latency = Table(title="⏱ Latency (ms)", show_header=True)
+        latency.add_column("Metric", style="cyan bold")
+        latency.add_column("Labels", style="white")
+        for column in ("Count", "p50", "p95", "p99", "Max"):
+            latency.add_column(column, justify="right")
+        
+        for entry in snapshot.get("histograms", []):
+            latency.add_row(
+                entry["name"],
+                label_text(entry["labels"]),
+                str(entry["count"]),
+                *(f"{entry[field] * 1000:.1f}" for field in ("p50", "p95", "p99", "max"))
+            )
+        
+        totals = Table(title="📈 Counters and Gauges", show_header=True)
+        totals.add_column("Metric", style="cyan bold")
+        totals.add_column("Labels", style="white")
+        totals.add_column("Value", justify="right")
+        
+        for entry in snapshot.get("counters", []) + snapshot.get("gauges", []):
+            totals.add_row(entry["name"], label_text(entry["labels"]), f"{entry['value']:g}")
+        
+        return [latency, totals]
+    
     @staticmethod
     def display_progress_bar(total: int, description: str = "Processing"):
         """
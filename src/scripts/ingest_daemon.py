@@ -0,0 +1,210 @@
+"""
+Watch-folder ingestion daemon.
+Polls the case directories and feeds only new or changed PDFs into the ingestion pipeline.
+
+Usage:
+    python src/scripts/ingest_daemon.py [ROOT ...] [--interval SECONDS] [--once]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import Config
+from core.models import IngestResult
+from infrastructure.ingest_manifest import IngestManifest
+from utils.file_discovery import DirectoryScanner, FileEntry
+from utils.helpers import compute_file_hash
+
+logger = logging.getLogger(__name__)
+
+
+class IngestDaemon:
+    """
+    Incremental ingestion of watched directories.
+
+    Each poll lists only directories that changed (a full rescan runs every
+    ``full_rescan_seconds``), keeps files whose (size, mtime) differ from the
+    manifest, waits until a file has not been modified for ``settle_seconds``
+    (so half-copied files are not ingested), hashes it, and sends the delta to
+    ``ingest_batch``. Files that were only touched (same hash) are not re-ingested.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        manifest: IngestManifest,
+        roots: List[Path],
+        poll_seconds: float = 2.0,
+        settle_seconds: float = 2.0,
+        full_rescan_seconds: float = 3600.0
+    ):
+        """
+        Initialize ingest daemon.
+
+        Args:
+            pipeline: HaystackIngestionPipeline
+            manifest: Manifest of files already seen
+            roots: Directories to watch (recursively)
+            poll_seconds: Delay between polls
+            settle_seconds: Minimum age of a file's mtime before it is ingested
+            full_rescan_seconds: Interval between full rescans (catch in-place rewrites, retry failures)
+        """
+        self.pipeline = pipeline
+        self.manifest = manifest
+        self.scanner = DirectoryScanner(roots)
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.full_rescan_seconds = full_rescan_seconds
+        self._last_full_scan: Optional[float] = None
+        # Changed files still being written, re-checked on every poll
+        self._pending: Dict[Path, FileEntry] = {}
+
+    def _restat(self, path: Path) -> Optional[FileEntry]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return FileEntry(path, stat.st_size, stat.st_mtime_ns)
+
+    def _collect_ready(self) -> List[FileEntry]:
+        """Scan for changes and return the changed files that have settled."""
+        now = time.time()
+        full = self._last_full_scan is None or now - self._last_full_scan >= self.full_rescan_seconds
+        if full:
+            self._last_full_scan = now
+
+        for entry in self.scanner.scan(full=full):
+            if self.manifest.needs_ingest(str(entry.path), entry.size, entry.mtime_ns, retry_failed=full):
+                self._pending[entry.path] = entry
+
+        ready = []
+        for path in list(self._pending):
+            entry = self._restat(path)
+            if entry is None:
+                del self._pending[path]
+            elif now - entry.mtime_ns / 1e9 >= self.settle_seconds:
+                ready.append(entry)
+                del self._pending[path]
+        return ready
+
+    async def poll_once(self) -> int:
+        """
+        Run one poll: discover, hash and ingest the delta.
+
+        Returns:
+            Number of files sent to the pipeline
+        """
+        loop = asyncio.get_running_loop()
+        ready = await loop.run_in_executor(None, self._collect_ready)
+        if not ready:
+            return 0
+
+        entries = {entry.path: entry for entry in ready}
+        hashes = {}
+        for entry in ready:
+            try:
+                file_hash = await loop.run_in_executor(None, compute_file_hash, entry.path)
+            except OSError as e:
+                logger.warning(f"Cannot hash {entry.path}: {e}")
+                continue
+
+            known = self.manifest.get(str(entry.path))
+            if known is not None and known.file_hash == file_hash and known.status != "failed":
+                # Touched but unchanged
+                self.manifest.record(str(entry.path), entry.size, entry.mtime_ns, file_hash, known.status)
+                continue
+            hashes[entry.path] = file_hash
+
+        if not hashes:
+            return 0
+
+        recorded = set()
+
+        def record(path: Path, result: IngestResult) -> None:
+            entry = entries[path]
+            self.manifest.record(str(path), entry.size, entry.mtime_ns, hashes[path], result.status.value)
+            recorded.add(path)
+
+        logger.info(f"Ingesting {len(hashes)} new or changed file(s)")
+        try:
+            result = await self.pipeline.ingest_batch(list(hashes), progress_callback=record, file_hashes=hashes)
+        except Exception:
+            # Retry the files without a manifest entry on the next poll, not only at the next full rescan
+            for path in hashes:
+                if path not in recorded:
+                    self._pending.setdefault(path, entries[path])
+            raise
+        logger.info(
+            f"Delta ingested: {result.processed} completed, "
+            f"{result.skipped_duplicates} duplicates, {result.failed} failed"
+        )
+        return len(hashes)
+
+    async def run_forever(self) -> None:
+        """Poll until cancelled."""
+        logger.info(f"Watching {', '.join(str(root) for root in self.scanner.roots)}")
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Poll failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+
+async def run(roots: List[Path], interval: float, once: bool, metrics_port: int = 0) -> None:
+    """Build the pipeline and run the daemon."""
+    from infrastructure.metrics import serve_metrics
+    from pipelines.haystack_ingestion_pipeline import HaystackIngestionPipeline
+
+    config = Config()
+    if metrics_port:
+        serve_metrics(metrics_port, config.metrics_host)
+    daemon = IngestDaemon(
+        HaystackIngestionPipeline(),
+        IngestManifest(str(config.ingest_manifest_path.resolve())),
+        [root.resolve() for root in roots],
+        poll_seconds=interval,
+        settle_seconds=config.ingest_settle_seconds,
+        full_rescan_seconds=config.ingest_full_rescan_seconds
+    )
+
+    if once:
+        # A single full pass (nothing is treated as still being written)
+        daemon.settle_seconds = 0
+        await daemon.poll_once()
+    else:
+        await daemon.run_forever()
+
+
+def main():
+    """Parse arguments and start the daemon."""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Ingest new or changed case PDFs from watched directories")
+    parser.add_argument("roots", nargs="*", type=Path, help="Directories to watch (default: CASES_DIR)")
+    parser.add_argument("--interval", type=float, default=config.ingest_poll_seconds, help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Ingest the current delta and exit")
+    parser.add_argument("--metrics-port", type=int, default=config.metrics_port, help="Serve /metrics on this port (0 = off)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(run(args.roots or [config.cases_dir], args.interval, args.once, args.metrics_port))
+    except KeyboardInterrupt:
+        logger.info("Ingest daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.core.config import Config
+from src.infrastructure.embedding_versions import CREATE_TABLE_SQL as EMBEDDING_VERSIONS_TABLE_SQL
 from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 from haystack.utils import Secret
 from rich.console import Console
@@ -129,6 +130,99 @@ def add_metadata_embedding_column(config: Config) -> bool:
         return False
 
 
+def add_file_hash_column(config: Config) -> bool:
+    """
+    Promote meta->>'file_hash' to an indexed generated column.
+    
+    Duplicate checks then become a unique-index probe instead of a
+    sequential scan over the JSONB meta of every row.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        console.print("[bold cyan]Adding indexed file_hash column...[/bold cyan]")
+        
+        conn_str = get_connection_string(config)
+        conn = psycopg2.connect(conn_str)
+        cursor = conn.cursor()
+        
+        # Check if column already exists
+        cursor.execute("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name='haystack_documents' AND column_name='file_hash';
+        """)
+        
+        if cursor.fetchone():
+            console.print("[bold yellow]![/bold yellow] file_hash column already exists")
+        else:
+            # Generated column stays in sync with meta on every insert/update
+            cursor.execute("""
+                ALTER TABLE haystack_documents 
+                ADD COLUMN file_hash TEXT GENERATED ALWAYS AS (meta->>'file_hash') STORED;
+            """)
+            console.print("[bold green]✓[/bold green] file_hash column added")
+        
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS haystack_documents_file_hash_idx 
+            ON haystack_documents (file_hash);
+        """)
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        console.print("[bold green]✓[/bold green] Unique index on file_hash ready")
+        return True
+        
+    except Exception as e:
+        console.print(f"[bold red]✗[/bold red] Failed to add file_hash column: {str(e)}")
+        console.print("[bold yellow]If the unique index failed, remove duplicate rows sharing a file_hash and re-run.[/bold yellow]")
+        return False
+
+
+def add_embedding_versions_table(config: Config) -> bool:
+    """
+    Create the embedding_versions table and record the configured model.
+    
+    Existing vectors are assumed to come from EMBEDDING_MODEL; the re-embed
+    script (src/scripts/reembed.py) switches the active model later.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        console.print("[bold cyan]Recording embedding model version...[/bold cyan]")
+        
+        conn_str = get_connection_string(config)
+        conn = psycopg2.connect(conn_str)
+        cursor = conn.cursor()
+        
+        cursor.execute(EMBEDDING_VERSIONS_TABLE_SQL)
+        cursor.execute("""
+            INSERT INTO embedding_versions (model, dimension, status, activated_at)
+            SELECT %s, %s, 'active', now()
+            WHERE NOT EXISTS (SELECT 1 FROM embedding_versions WHERE status = 'active')
+            ON CONFLICT (model) DO NOTHING;
+        """, (config.embedding_model, config.embedding_dim))
+        cursor.execute("SELECT model FROM embedding_versions WHERE status = 'active';")
+        active = cursor.fetchone()[0]
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        console.print(f"[bold green]✓[/bold green] Active embedding model: {active}")
+        if active != config.embedding_model:
+            console.print(f"[bold yellow]![/bold yellow] EMBEDDING_MODEL is {config.embedding_model}; run src/scripts/reembed.py to switch")
+        return True
+    
+    except Exception as e:
+        console.print(f"[bold red]✗[/bold red] Failed to create embedding_versions table: {str(e)}")
+        return False
+
+
 def create_schema(config: Config) -> bool:
     """
     Create database schema using Haystack's PgvectorDocumentStore.
@@ -194,7 +288,7 @@ def verify_setup(config: Config) -> bool:
             SELECT column_name 
             FROM information_schema.columns 
             WHERE table_name='haystack_documents' 
-            AND column_name IN ('embedding', 'embedding_metadata')
+            AND column_name IN ('embedding', 'embedding_metadata', 'file_hash')
             ORDER BY column_name;
         """)
         columns = [row[0] for row in cursor.fetchall()]
@@ -205,10 +299,12 @@ def verify_setup(config: Config) -> bool:
         console.print(f"  • Total documents: {doc_count}")
         console.print(f"  • Table: haystack_documents")
         console.print(f"  • Embedding dimension: 768")
-        console.print(f"  • Embedding columns: {', '.join(columns)}")
+        console.print(f"  • Indexed columns: {', '.join(columns)}")
         
         if 'embedding_metadata' not in columns:
             console.print("[bold yellow]![/bold yellow] Warning: embedding_metadata column not found")
+        if 'file_hash' not in columns:
+            console.print("[bold yellow]![/bold yellow] Warning: file_hash column not found")
         
         return True
         
@@ -257,6 +353,16 @@ def main():
         console.print("\n[bold red]Initialization failed at adding metadata embedding column.[/bold red]")
         return False
     
+    # Step 3.6: Add indexed file_hash column
+    if not add_file_hash_column(config):
+        console.print("\n[bold red]Initialization failed at adding file_hash column.[/bold red]")
+        return False
+    
+    # Step 3.7: Record the embedding model of the stored vectors
+    if not add_embedding_versions_table(config):
+        console.print("\n[bold red]Initialization failed at recording the embedding model.[/bold red]")
+        return False
+    
     # Step 4: Verify setup
     if not verify_setup(config):
         console.print("\n[bold red]Initialization failed at verification.[/bold red]")
@@ -0,0 +1,307 @@
+"""
+Re-embed every stored case with another sentence-transformer model.
+Vectors are rebuilt from the extracted facts and metadata already in meta (no LLM calls),
+written into shadow columns, indexed, and swapped in with one transaction.
+
+Usage:
+    python src/scripts/reembed.py --model MODEL [--batch-size N] [--no-switch]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import Config
+from infrastructure.database import DatabasePool, to_vector_literal
+from infrastructure.embedding_versions import EmbeddingVersions
+
+logger = logging.getLogger(__name__)
+
+# Live vector column -> shadow column being backfilled
+SHADOW_COLUMNS = {
+    "embedding": "embedding_next",
+    "embedding_metadata": "embedding_metadata_next",
+}
+
+# HNSW index names of the live columns (as created by init_database.py)
+INDEX_NAMES = {
+    "embedding": "haystack_hnsw_index",
+    "embedding_metadata": "haystack_documents_embedding_metadata_idx",
+}
+
+# Rows inserted while the backfill runs are picked up by a few extra passes
+MAX_CATCH_UP_PASSES = 3
+
+
+def _prev(column: str) -> str:
+    return f"{column}_prev"
+
+
+def _shadow_index(column: str) -> str:
+    return f"haystack_documents_{SHADOW_COLUMNS[column]}_idx"
+
+
+class Reembedder:
+    """
+    Rebuilds both vectors of every row for a new model without downtime.
+
+    1. Shadow columns (``embedding_next``, ``embedding_metadata_next``) sized
+       for the new model are added and tagged with its name.
+    2. Rows are streamed through a server-side cursor, re-encoded in large
+       batches and written to the shadow columns. Rows already filled are
+       skipped, so an interrupted run resumes where it stopped.
+    3. HNSW indexes are built on the shadow columns without blocking writes.
+    4. One transaction fills any rows inserted in the meantime, renames the
+       shadow columns (and indexes) to the live names, keeps the old ones as
+       ``*_prev`` and marks the model active in embedding_versions. Running
+       pipelines pick up the new model on their next ingestion or search.
+    """
+
+    def __init__(self, db_pool: DatabasePool, model_name: str, batch_size: int = 512, encode_batch_size: int = 32):
+        """
+        Initialize re-embedder.
+
+        Args:
+            db_pool: DatabasePool with at least two connections (one streams, one writes)
+            model_name: Sentence transformer model to switch to
+            batch_size: Rows fetched, encoded and written per round trip
+            encode_batch_size: Encoder mini-batch size
+        """
+        from infrastructure.model_registry import ModelRegistry
+
+        self.db_pool = db_pool
+        self.versions = EmbeddingVersions(db_pool)
+        self.model_name = model_name
+        self.model = ModelRegistry().get_sentence_transformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+        self.encode_batch_size = encode_batch_size
+
+    def prepare_shadow_columns(self) -> bool:
+        """
+        Create (or reuse) the shadow columns for this model.
+
+        Returns:
+            True if a build of the same model is resumed
+        """
+        with self.db_pool.cursor() as cursor:
+            if self.versions.building_model(cursor) == self.model_name and self._shadow_dimension(cursor) == self.dimension:
+                return True
+
+            for shadow in SHADOW_COLUMNS.values():
+                cursor.execute(f"ALTER TABLE haystack_documents DROP COLUMN IF EXISTS {shadow}")
+                cursor.execute(f"ALTER TABLE haystack_documents ADD COLUMN {shadow} vector({self.dimension})")
+                cursor.execute(f"COMMENT ON COLUMN haystack_documents.{shadow} IS %s", (self.model_name,))
+            self.versions.mark_building(cursor, self.model_name, self.dimension)
+        return False
+
+    def _shadow_dimension(self, cursor: Any) -> int:
+        """Dimension of the existing facts shadow column (0 if missing)."""
+        cursor.execute("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = 'haystack_documents'::regclass AND attname = %s AND NOT attisdropped
+        """, (SHADOW_COLUMNS["embedding"],))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def backfill(self) -> int:
+        """
+        Fill the shadow columns of every row that has none yet.
+
+        Returns:
+            Number of rows re-embedded
+        """
+        total = 0
+        for _ in range(MAX_CATCH_UP_PASSES):
+            done = self._backfill_pass()
+            total += done
+            if done == 0:
+                break
+        return total
+
+    def _backfill_pass(self) -> int:
+        """Stream the unfilled rows once through a server-side cursor."""
+        done = 0
+        started = time.monotonic()
+
+        with self.db_pool.connection() as conn:
+            rows = conn.cursor(name="reembed_rows")
+            rows.itersize = self.batch_size
+            rows.execute(f"SELECT id, content, meta FROM haystack_documents WHERE {SHADOW_COLUMNS['embedding']} IS NULL")
+            try:
+                while True:
+                    batch = rows.fetchmany(self.batch_size)
+                    if not batch:
+                        break
+                    with self.db_pool.cursor() as cursor:
+                        self._write(cursor, batch)
+                    done += len(batch)
+                    logger.info(f"Re-embedded {done} rows ({done / max(time.monotonic() - started, 1e-9):.0f} rows/s)")
+            finally:
+                rows.close()
+
+        return done
+
+    def _write(self, cursor: Any, batch: Sequence[tuple]) -> None:
+        """Encode a batch of (id, content, meta) rows and write their shadow vectors."""
+        from pipelines.haystack_custom_nodes import DualEmbedderNode
+        from psycopg2.extras import execute_values
+
+        facts_texts: List[str] = []
+        metadata_texts: List[str] = []
+        for _, content, meta in batch:
+            facts_text, metadata_text = DualEmbedderNode.embedding_texts(meta or {}, content)
+            facts_texts.append(facts_text)
+            metadata_texts.append(metadata_text)
+
+        embeddings = self.model.encode(
+            facts_texts + metadata_texts,
+            batch_size=self.encode_batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        count = len(batch)
+        values = [
+            (row[0], to_vector_literal(embeddings[i]), to_vector_literal(embeddings[count + i]))
+            for i, row in enumerate(batch)
+        ]
+
+        execute_values(cursor, f"""
+            UPDATE haystack_documents AS d
+            SET {SHADOW_COLUMNS['embedding']} = v.facts::vector,
+                {SHADOW_COLUMNS['embedding_metadata']} = v.metadata::vector
+            FROM (VALUES %s) AS v(id, facts, metadata)
+            WHERE d.id = v.id
+        """, values, page_size=count)
+
+    def build_indexes(self) -> None:
+        """Build HNSW indexes on the shadow columns without blocking writes."""
+        import psycopg2
+
+        conn = psycopg2.connect(self.db_pool.connection_string)
+        conn.autocommit = True  # CREATE INDEX CONCURRENTLY cannot run in a transaction
+        try:
+            cursor = conn.cursor()
+            for column, shadow in SHADOW_COLUMNS.items():
+                index = _shadow_index(column)
+                # An interrupted concurrent build leaves an invalid index behind
+                cursor.execute("""
+                    SELECT NOT x.indisvalid FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+                    WHERE i.relname = %s
+                """, (index,))
+                row = cursor.fetchone()
+                if row and row[0]:
+                    cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+
+                logger.info(f"Building index {index}")
+                cursor.execute(f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {index}
+                    ON haystack_documents
+                    USING hnsw ({shadow} vector_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """)
+            cursor.close()
+        finally:
+            conn.close()
+
+    def switch(self) -> int:
+        """
+        Swap the shadow columns in and activate the model, atomically.
+
+        Returns:
+            Number of rows that were inserted after the backfill and embedded under the lock
+        """
+        with self.db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SET LOCAL lock_timeout = '30s'")
+            cursor.execute("LOCK TABLE haystack_documents IN ACCESS EXCLUSIVE MODE")
+
+            cursor.execute(f"SELECT id, content, meta FROM haystack_documents WHERE {SHADOW_COLUMNS['embedding']} IS NULL")
+            stragglers = cursor.fetchall()
+            for start in range(0, len(stragglers), self.batch_size):
+                self._write(cursor, stragglers[start:start + self.batch_size])
+
+            for column, shadow in SHADOW_COLUMNS.items():
+                cursor.execute(f"ALTER TABLE haystack_documents DROP COLUMN IF EXISTS {_prev(column)}")
+                cursor.execute(f"ALTER INDEX IF EXISTS {INDEX_NAMES[column]} RENAME TO {_prev(INDEX_NAMES[column])}")
+                cursor.execute(f"ALTER TABLE haystack_documents RENAME COLUMN {column} TO {_prev(column)}")
+                cursor.execute(f"ALTER TABLE haystack_documents RENAME COLUMN {shadow} TO {column}")
+                cursor.execute(f"ALTER INDEX IF EXISTS {_shadow_index(column)} RENAME TO {INDEX_NAMES[column]}")
+
+            self.versions.activate(cursor, self.model_name)
+            cursor.close()
+
+        return len(stragglers)
+
+    def stats(self) -> Dict[str, int]:
+        """Row counts of the shadow backfill."""
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT COUNT(*), COUNT({SHADOW_COLUMNS['embedding']}) FROM haystack_documents
+            """)
+            total, filled = cursor.fetchone()
+        return {"total": total, "filled": filled}
+
+
+def run(model_name: str, batch_size: int, switch: bool) -> bool:
+    """Re-embed every row with ``model_name`` and (optionally) switch search over to it."""
+    config = Config()
+    db_pool = DatabasePool(config.db_connection_string, min_connections=2, max_connections=2)
+    try:
+        active = EmbeddingVersions(db_pool).ensure(config.embedding_model, config.embedding_dim)
+        if active == model_name:
+            logger.info(f"{model_name} is already the active embedding model")
+            return True
+
+        reembedder = Reembedder(db_pool, model_name, batch_size=batch_size, encode_batch_size=config.embedding_batch_size)
+        resumed = reembedder.prepare_shadow_columns()
+        logger.info(
+            f"{'Resuming' if resumed else 'Starting'} re-embed: {active} -> {model_name} (dim {reembedder.dimension})"
+        )
+
+        started = time.monotonic()
+        count = reembedder.backfill()
+        logger.info(f"Backfilled {count} rows in {time.monotonic() - started:.1f}s: {reembedder.stats()}")
+
+        reembedder.build_indexes()
+        if not switch:
+            logger.info("Shadow columns ready; run again without --no-switch to activate them")
+            return True
+
+        stragglers = reembedder.switch()
+        logger.info(f"Switched search to {model_name} ({stragglers} late rows embedded during the swap)")
+        logger.info("Previous vectors kept as embedding_prev / embedding_metadata_prev until the next re-embed")
+        return True
+    except Exception as e:
+        logger.error(f"Re-embed failed: {e}")
+        return False
+    finally:
+        db_pool.close()
+
+
+def main():
+    """Parse arguments and run the re-embed."""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Re-embed stored cases with another model (no LLM calls)")
+    parser.add_argument("--model", required=True, help="Sentence transformer model to switch to")
+    parser.add_argument("--batch-size", type=int, default=config.reembed_batch_size, help="Rows per fetch/encode/write batch")
+    parser.add_argument("--no-switch", action="store_true", help="Build the shadow columns and indexes but keep the current model active")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    success = run(args.model, args.batch_size, switch=not args.no_switch)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,11 @@ PDF document loader implementation using Adapter pattern.
 
 import logging
 from pathlib import Path
-import fitz  # PyMuPDF
+from typing import Iterator
 
 from core.interfaces import IDocumentLoader
 from core.exceptions import DocumentLoadError
+from utils.pdf_pages import PARALLEL_MIN_PAGES, iter_page_texts
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,17 @@ class PDFLoader(IDocumentLoader):
     Adapts PyMuPDF functionality to IDocumentLoader interface.
     """
     
+    def __init__(self, page_workers: int = 1, parallel_min_pages: int = PARALLEL_MIN_PAGES):
+        """
+        Initialize PDF loader.
+        
+        Args:
+            page_workers: Processes extracting page ranges of long PDFs (1 = serial)
+            parallel_min_pages: Page count from which page ranges are extracted in parallel
+        """
+        self.page_workers = page_workers
+        self.parallel_min_pages = parallel_min_pages
+    
     def validate(self, file_path: Path) -> bool:
         """
         Validate if file can be loaded.
@@ -55,16 +67,12 @@ class PDFLoader(IDocumentLoader):
             raise DocumentLoadError(f"Invalid PDF file: {file_path}")
         
         try:
-            # Open PDF with PyMuPDF
-            doc = fitz.open(file_path)
-            
-            # Extract text from all pages
-            text_parts = []
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text_parts.append(page.get_text())
-            
-            doc.close()
+            # Extract text from all pages (page ranges in parallel for long documents)
+            text_parts = iter_page_texts(
+                str(file_path),
+                workers=self.page_workers,
+                min_pages=self.parallel_min_pages
+            )
             
             # Join all pages
             raw_text = "\n\n".join(text_parts)
@@ -79,6 +87,35 @@ class PDFLoader(IDocumentLoader):
             logger.error(f"Failed to load PDF {file_path}: {e}")
             raise DocumentLoadError(f"PDF loading failed: {e}")
     
+    def iter_pages(self, file_path: Path) -> Iterator[str]:
+        """
+        Stream the cleaned text of a PDF page by page.
+        
+        Args:
+            file_path: Path to PDF file
+        
+        Yields:
+            Cleaned text of each non-empty page, in order
+        
+        Raises:
+            DocumentLoadError: If the file is not a readable PDF
+        """
+        if not self.validate(file_path):
+            raise DocumentLoadError(f"Invalid PDF file: {file_path}")
+        
+        try:
+            for text in iter_page_texts(
+                str(file_path),
+                workers=self.page_workers,
+                min_pages=self.parallel_min_pages,
+                clean=self._clean_text
+            ):
+                if text:
+                    yield text
+        except Exception as e:
+            logger.error(f"Failed to load PDF {file_path}: {e}")
+            raise DocumentLoadError(f"PDF loading failed: {e}")
+    
     def _clean_text(self, text: str) -> str:
         """
         Clean extracted text.
@@ -0,0 +1,148 @@
+"""
+Chunking and merging helpers for map-reduce fact extraction.
+Long judgments are split into token-bounded chunks along section boundaries,
+extracted chunk by chunk, and the partial results merged back into one template.
+"""
+
+import json
+from typing import Any, Callable, List, Sequence, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _split_block(block: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Split an oversized block on paragraph breaks, hard-splitting paragraphs that are still too long."""
+    pieces = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in block.split("\n\n"):
+        paragraph_tokens = count_tokens(paragraph)
+
+        if paragraph_tokens > max_tokens:
+            if current:
+                pieces.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            step = max(1, len(paragraph) * max_tokens // paragraph_tokens)
+            pieces.extend(paragraph[i:i + step] for i in range(0, len(paragraph), step))
+            continue
+
+        if current and current_tokens + paragraph_tokens > max_tokens:
+            pieces.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += paragraph_tokens
+
+    if current:
+        pieces.append("\n\n".join(current))
+    return pieces
+
+
+def chunk_sections(
+    sections: Sequence[Tuple[str, str]],
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> List[str]:
+    """
+    Pack (section_title, section_content) pairs into chunks of at most max_tokens.
+
+    Sections are kept whole where possible and consecutive small sections share
+    a chunk; sections larger than a chunk are split on paragraph breaks.
+
+    Args:
+        sections: Output of PDFToMarkdownConverter._identify_sections
+        max_tokens: Token budget per chunk
+        count_tokens: Token counter
+
+    Returns:
+        List of chunk texts in document order
+    """
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for title, content in sections:
+        block = f"## {title}\n{content}".strip()
+        pieces = [block] if count_tokens(block) <= max_tokens else _split_block(block, max_tokens, count_tokens)
+
+        for piece in pieces:
+            piece_tokens = count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip() or value.strip().lower() == "null"
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def _merge_values(existing: Any, new: Any) -> Any:
+    """Merge two values for the same field; ``existing`` comes from an earlier chunk."""
+    if _is_empty(new):
+        return existing
+    if _is_empty(existing):
+        return new
+
+    if isinstance(existing, dict) and isinstance(new, dict):
+        merged = dict(existing)
+        for key, value in new.items():
+            merged[key] = _merge_values(merged.get(key), value)
+        return merged
+
+    if isinstance(existing, list) or isinstance(new, list):
+        # Ordered union (first occurrence wins)
+        items = (existing if isinstance(existing, list) else [existing]) + (new if isinstance(new, list) else [new])
+        seen = set()
+        union = []
+        for item in items:
+            marker = json.dumps(item, sort_keys=True, default=str)
+            if marker not in seen:
+                seen.add(marker)
+                union.append(item)
+        return union
+
+    if isinstance(existing, str) and isinstance(new, str):
+        # Distinct sentences from different parts of the judgment are concatenated
+        if new.strip() in existing:
+            return existing
+        if existing.strip() in new:
+            return new
+        return f"{existing.rstrip()} {new.strip()}"
+
+    # Numbers, booleans and mismatched types: the earliest chunk wins
+    return existing
+
+
+def merge_partial_facts(partials: Sequence[dict]) -> dict:
+    """
+    Deterministically merge per-chunk fact dictionaries (in chunk order).
+
+    Nested objects are merged key by key, lists become an ordered union,
+    distinct strings are concatenated, and null/empty values never overwrite data.
+
+    Args:
+        partials: Fact dictionaries, one per chunk
+
+    Returns:
+        Merged fact dictionary
+    """
+    merged: dict = {}
+    for partial in partials:
+        if isinstance(partial, dict):
+            merged = _merge_values(merged, partial)
+    return merged
@@ -0,0 +1,135 @@
+"""
+Recursive, streaming discovery of case files.
+Uses os.scandir so file sizes and mtimes come with the directory listing.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directories modified this recently are listed again next scan (coarse mtimes on network shares)
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+class FileEntry(NamedTuple):
+    """A discovered file with the stat fields used for change detection."""
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+def _is_match(name: str, extensions: Sequence[str]) -> bool:
+    return not name.startswith(".") and name.lower().endswith(tuple(extensions))
+
+
+def iter_pdf_files(root: Path, extensions: Sequence[str] = (".pdf",)) -> Iterator[FileEntry]:
+    """
+    Yield every matching file below ``root`` (recursively), as it is found.
+
+    Hidden files and directories are skipped and symlinked directories are not followed.
+
+    Args:
+        root: Directory to search
+        extensions: Lower-case file extensions to include
+
+    Yields:
+        FileEntry per file
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith("."):
+                                stack.append(entry.path)
+                        elif entry.is_file() and _is_match(entry.name, extensions):
+                            stat = entry.stat()
+                            yield FileEntry(Path(entry.path), stat.st_size, stat.st_mtime_ns)
+                    except OSError as e:
+                        logger.warning(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+
+
+class DirectoryScanner:
+    """
+    Incremental recursive scanner for a set of root directories.
+
+    A directory's mtime changes whenever a file is added, removed or renamed
+    in it, so after the first (full) scan only directories whose mtime moved
+    are listed again; unchanged directories cost one stat() each. Files
+    rewritten in place under the same name are only seen by a full scan.
+    """
+
+    def __init__(self, roots: Iterable[Path], extensions: Sequence[str] = (".pdf",)):
+        """
+        Initialize directory scanner.
+
+        Args:
+            roots: Directories to watch
+            extensions: Lower-case file extensions to include
+        """
+        self.roots = [Path(root) for root in roots]
+        self.extensions = tuple(extensions)
+        # directory -> (mtime_ns, subdirectories)
+        self._directories: Dict[str, Tuple[int, List[str]]] = {}
+
+    def scan(self, full: bool = False) -> Iterator[FileEntry]:
+        """
+        Yield the files of every directory that is new or changed since the last scan.
+
+        Args:
+            full: List every directory regardless of its mtime
+
+        Yields:
+            FileEntry per file in the listed directories
+        """
+        stack = [str(root) for root in self.roots]
+        seen = set()
+
+        while stack:
+            directory = stack.pop()
+            seen.add(directory)
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = self._directories.get(directory)
+            if not full and cached is not None and cached[0] == mtime_ns:
+                stack.extend(cached[1])
+                continue
+
+            subdirectories = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not entry.name.startswith("."):
+                                    subdirectories.append(entry.path)
+                            elif entry.is_file() and _is_match(entry.name, self.extensions):
+                                stat = entry.stat()
+                                yield FileEntry(Path(entry.path), stat.st_size, stat.st_mtime_ns)
+                        except OSError as e:
+                            logger.warning(f"Skipping {entry.path}: {e}")
+            except OSError as e:
+                logger.warning(f"Cannot list {directory}: {e}")
+                continue
+
+            if time.time_ns() - mtime_ns < MTIME_GRANULARITY_NS:
+                mtime_ns = -1
+            self._directories[directory] = (mtime_ns, subdirectories)
+            stack.extend(subdirectories)
+
+        # Forget directories that disappeared
+        for directory in list(self._directories):
+            if directory not in seen:
+                del self._directories[directory]
@@ -4,34 +4,69 @@ Utility functions and helper classes.
 
 import hashlib
 import logging
+import mmap
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def hash_bytes(data: bytes) -> str:
+    """
+    Compute SHA-256 hash of an in-memory file buffer.
+    
+    Args:
+        data: File content (bytes, bytearray, memoryview or mmap)
+    
+    Returns:
+        Hexadecimal hash string (same as compute_file_hash of the file)
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
 def compute_file_hash(file_path: Path) -> str:
     """
     Compute SHA-256 hash of file content.
     
+    The file is memory-mapped and hashed in one call, without copying it
+    into Python buffers chunk by chunk.
+    
     Args:
         file_path: Path to file
         
     Returns:
         Hexadecimal hash string
     """
-    sha256 = hashlib.sha256()
-    
     try:
         with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return hash_bytes(mapped)
+            except ValueError:
+                # Empty files cannot be mapped
+                return hash_bytes(f.read())
     except Exception as e:
         logger.error(f"Failed to compute hash for {file_path}: {e}")
         raise
 
 
+def read_file_with_hash(file_path: Path) -> Tuple[bytes, str]:
+    """
+    Read a file once and hash the buffer.
+    
+    The returned bytes can be handed straight to a parser (e.g.
+    ``fitz.open(stream=...)``), so the file is not read a second time.
+    
+    Args:
+        file_path: Path to file
+    
+    Returns:
+        (content, hexadecimal hash)
+    """
+    data = Path(file_path).read_bytes()
+    return data, hash_bytes(data)
+
+
 def generate_case_id(metadata: Dict[str, Any]) -> str:
     """
     Generate unique case ID from metadata.
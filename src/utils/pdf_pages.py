@@ -0,0 +1,159 @@
+"""
+Page-level PDF text extraction.
+Large PDFs are split into page ranges extracted by a process pool; pages are
+streamed back in order so callers never hold more than a few ranges at once.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Documents shorter than this are extracted in-process (pool round trips cost more than they save)
+PARALLEL_MIN_PAGES = 64
+
+# Pages per task; small enough to balance uneven pages, large enough to amortize the round trip
+PAGES_PER_RANGE = 16
+
+# Ranges in flight per worker (bounds the pages buffered ahead of the consumer)
+RANGES_IN_FLIGHT_PER_WORKER = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# Worker side: the document opened by the previous task, reused by the next range of the same file
+_open_doc: Optional[Tuple[Tuple[str, int, int], object]] = None
+
+
+def page_ranges(page_count: int, pages_per_range: int = PAGES_PER_RANGE) -> List[Tuple[int, int]]:
+    """Split ``page_count`` pages into consecutive (start, stop) ranges."""
+    step = max(1, pages_per_range)
+    return [(start, min(page_count, start + step)) for start in range(0, page_count, step)]
+
+
+def _document(pdf_path: str):
+    """Open ``pdf_path`` in a worker, reusing the previous task's document if the file is unchanged."""
+    global _open_doc
+    import fitz
+
+    stat = os.stat(pdf_path)
+    key = (pdf_path, stat.st_mtime_ns, stat.st_size)
+    if _open_doc is not None and _open_doc[0] == key:
+        return _open_doc[1]
+    if _open_doc is not None:
+        _open_doc[1].close()
+    _open_doc = (key, fitz.open(pdf_path))
+    return _open_doc[1]
+
+
+def extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of pages ``start``..``stop - 1`` (picklable, for ProcessPoolExecutor).
+
+    Args:
+        pdf_path: Path to the PDF file
+        start: First page (0-based)
+        stop: Page after the last one
+
+    Returns:
+        Text of each page in the range
+    """
+    doc = _document(pdf_path)
+    return [doc[number].get_text() for number in range(start, stop)]
+
+
+def _shared_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all extractions of this process (recreated if the size changes)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+@atexit.register
+def shutdown_page_pool() -> None:
+    """Stop the shared extraction pool (called automatically at exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def iter_page_texts(
+    pdf_path: str,
+    workers: int = 1,
+    min_pages: int = PARALLEL_MIN_PAGES,
+    clean: Optional[Callable[[str], str]] = None,
+    stream: Optional[bytes] = None
+) -> Iterator[str]:
+    """
+    Yield the text of every page in order.
+
+    Documents with at least ``min_pages`` pages are split into page ranges
+    extracted by ``workers`` processes; at most a few ranges per worker are
+    in flight, so memory stays bounded however long the document is. Smaller
+    documents (or ``workers=1``) are read page by page in this process.
+
+    With ``stream`` (the file content already read by the caller) the
+    in-process path parses that buffer instead of reading the file again;
+    pool workers always open the file by path.
+
+    Args:
+        pdf_path: Path to the PDF file
+        workers: Extraction processes (1 = in-process)
+        min_pages: Page count from which the pool is used
+        clean: Optional per-page cleaner applied as pages are yielded
+        stream: Content of ``pdf_path`` if the caller has already read it
+
+    Yields:
+        Page text (cleaned if ``clean`` is given)
+    """
+    import fitz
+
+    pdf_path = str(pdf_path)
+    finish = clean or (lambda text: text)
+
+    with (fitz.open(stream=stream, filetype="pdf") if stream is not None else fitz.open(pdf_path)) as doc:
+        total = doc.page_count
+        if workers <= 1 or total < min_pages:
+            for page in doc:
+                yield finish(page.get_text())
+            return
+
+    pool = _shared_pool(workers)
+    ranges = iter(page_ranges(total))
+    pending: Deque[Future] = deque()
+    limit = workers * RANGES_IN_FLIGHT_PER_WORKER
+
+    def submit_next() -> None:
+        next_range = next(ranges, None)
+        if next_range is not None:
+            pending.append(pool.submit(extract_page_range, pdf_path, *next_range))
+
+    try:
+        for _ in range(limit):
+            submit_next()
+        while pending:
+            texts = pending.popleft().result()
+            submit_next()
+            for text in texts:
+                yield finish(text)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def extract_page_texts(pdf_path: str, workers: int = 1, min_pages: int = PARALLEL_MIN_PAGES) -> List[str]:
+    """Text of every page in order (see ``iter_page_texts``)."""
+    return list(iter_page_texts(pdf_path, workers=workers, min_pages=min_pages))
@@ -0,0 +1,35 @@
+"""
+PDF text extraction for worker processes.
+Kept free of pipeline imports so process-pool workers start quickly.
+"""
+
+import os
+import sys
+from typing import Any, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'raw_code', 'bg_creation'))
+
+# One converter per worker process
+_converter: Optional[Any] = None
+
+
+def parse_pdf(pdf_path: str, converter_config: Optional[dict] = None) -> str:
+    """
+    Extract and clean the text of a PDF (picklable, for ProcessPoolExecutor).
+
+    Args:
+        pdf_path: Path to the PDF file
+        converter_config: PDFToMarkdownConverter configuration
+
+    Returns:
+        Cleaned markdown text
+    """
+    global _converter
+    if _converter is None:
+        from convert_pdf_to_md import PDFToMarkdownConverter
+        # Files are already parsed in parallel; page ranges stay in this worker
+        config = dict(converter_config or {})
+        config['processing_settings'] = {**config.get('processing_settings', {}), 'page_workers': 1}
+        _converter = PDFToMarkdownConverter(config)
+
+    return _converter.clean_text(_converter.extract_text_from_pdf(pdf_path))
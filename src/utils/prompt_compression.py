@@ -0,0 +1,185 @@
+"""
+Prompt compression for the extraction prompts.
+Strips page furniture (page markers, running headers/footers, signature boilerplate)
+and cuts the metadata input down to the front matter plus section citations.
+"""
+
+import logging
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional
+
+from utils.chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PAGE_MARKER_PATTERN = re.compile(r"^\s*-{2,}\s*Page\s+\d+\s*-{2,}\s*$", re.IGNORECASE | re.MULTILINE)
+
+# Lines that never carry case information (e-signature stamps, download banners)
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^Indian Kanoon\s*-\s*https?://", re.IGNORECASE),
+    re.compile(r"^Signature Not Verified", re.IGNORECASE),
+    re.compile(r"^Digitally signed by", re.IGNORECASE),
+]
+
+# Lines citing legal provisions; kept in the metadata input even outside the front matter
+CITATION_LINE_PATTERN = re.compile(
+    r"\b(?:sections?|u/s|IPC|I\.\s*P\.\s*C|Penal Code|POCSO|Cr\.?\s*P\.?\s*C|NDPS)\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens with tiktoken when installed, otherwise estimate (about 4 characters per token)."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class CompressionResult(NamedTuple):
+    """Compressed text with token counts before and after compression."""
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of input tokens removed."""
+        if not self.tokens_before:
+            return 0.0
+        return 1 - self.tokens_after / self.tokens_before
+
+
+class PromptCompressor:
+    """
+    Removes text that costs tokens but carries no case information.
+
+    Running headers and footers are detected per page: a short line (digits
+    normalized) that appears among the first or last ``edge_lines`` lines of
+    at least ``min_page_share`` of the pages is dropped from those positions.
+    """
+
+    def __init__(
+        self,
+        edge_lines: int = 3,
+        min_page_share: float = 0.25,
+        min_pages: int = 3,
+        max_line_chars: int = 100,
+        front_matter_chars: int = 6000,
+        max_citation_lines: int = 40,
+        model: str = "gpt-4o"
+    ):
+        """
+        Initialize prompt compressor.
+
+        Args:
+            edge_lines: Lines at the top and bottom of each page checked for headers/footers
+            min_page_share: Share of pages a line must repeat on to be treated as a header/footer
+            min_pages: Minimum number of pages before header/footer detection applies
+            max_line_chars: Longer lines are never treated as headers/footers
+            front_matter_chars: Characters kept from the start of the document for metadata
+            max_citation_lines: Citation lines from the rest of the document added to the front matter
+            model: Model whose tokenizer is used for reporting
+        """
+        self.edge_lines = edge_lines
+        self.min_page_share = min_page_share
+        self.min_pages = min_pages
+        self.max_line_chars = max_line_chars
+        self.front_matter_chars = front_matter_chars
+        self.max_citation_lines = max_citation_lines
+        self.model = model
+
+    @staticmethod
+    def _normalize(line: str) -> str:
+        return re.sub(r"\d+", "#", line.strip().lower())
+
+    def _edge_indices(self, lines: List[str]) -> List[int]:
+        """Indices of the first and last ``edge_lines`` non-empty lines of a page."""
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        return sorted(set(non_empty[:self.edge_lines] + non_empty[-self.edge_lines:]))
+
+    def strip_page_furniture(self, text: str) -> str:
+        """Remove page markers, running headers/footers and boilerplate lines."""
+        pages = [page.split("\n") for page in PAGE_MARKER_PATTERN.split(text)]
+
+        furniture = set()
+        if len(pages) >= self.min_pages:
+            counts = Counter()
+            for lines in pages:
+                counts.update({
+                    self._normalize(lines[i]) for i in self._edge_indices(lines)
+                    if len(lines[i].strip()) <= self.max_line_chars
+                })
+            threshold = max(self.min_pages, self.min_page_share * len(pages))
+            furniture = {line for line, count in counts.items() if count >= threshold}
+
+        kept_pages = []
+        for lines in pages:
+            edges = set(self._edge_indices(lines)) if furniture else set()
+            kept = [
+                line for i, line in enumerate(lines)
+                if not (i in edges and self._normalize(line) in furniture)
+                and not any(pattern.match(line.strip()) for pattern in BOILERPLATE_PATTERNS)
+            ]
+            kept_pages.append("\n".join(kept).strip())
+
+        return "\n\n".join(page for page in kept_pages if page)
+
+    def front_matter(self, text: str) -> str:
+        """
+        Metadata input: the opening of the judgment (parties, court, coram, dates)
+        plus the lines citing legal provisions from the rest of the document.
+        """
+        if len(text) <= self.front_matter_chars:
+            return text
+
+        cut = text.rfind("\n\n", 0, self.front_matter_chars)
+        if cut < self.front_matter_chars // 2:
+            cut = self.front_matter_chars
+        head, rest = text[:cut].rstrip(), text[cut:]
+
+        citations = []
+        seen = set()
+        for line in rest.split("\n"):
+            line = line.strip()
+            if line and CITATION_LINE_PATTERN.search(line) and line not in seen:
+                seen.add(line)
+                citations.append(line)
+                if len(citations) >= self.max_citation_lines:
+                    break
+
+        if not citations:
+            return head
+        return head + "\n\n[Provisions cited later in the judgment]\n" + "\n".join(citations)
+
+    def compress(self, text: str) -> CompressionResult:
+        """
+        Strip page furniture and report token counts.
+
+        Args:
+            text: Cleaned document text
+
+        Returns:
+            CompressionResult
+        """
+        compressed = self.strip_page_furniture(text)
+        return CompressionResult(
+            text=compressed,
+            tokens_before=count_tokens(text, self.model),
+            tokens_after=count_tokens(compressed, self.model)
+        )
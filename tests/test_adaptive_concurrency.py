@@ -0,0 +1,69 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "raw_code"))
+
+from adaptive_concurrency import AdaptiveConcurrencyController, is_overload_error, retry_after_seconds
+
+
+def test_error_classification():
+    assert is_overload_error(Exception("429 Resource has been exhausted (e.g. check quota)."))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert not is_overload_error(ValueError("invalid page"))
+    assert retry_after_seconds(Exception("429 ... Please retry in 7.5s")) == 7.5
+    assert retry_after_seconds(Exception("429")) is None
+
+
+def test_limit_ramps_up_while_calls_succeed():
+    controller = AdaptiveConcurrencyController(initial=2, maximum=8)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, controller.in_flight)
+        await asyncio.sleep(0.001)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(controller.run(call) for _ in range(100)))
+
+    assert asyncio.run(main()) == ["ok"] * 100
+    assert controller.limit == 8
+    assert peak <= 8
+
+
+def test_burst_of_rate_limits_halves_once_and_retries():
+    controller = AdaptiveConcurrencyController(initial=8, maximum=8, base_backoff=0.01)
+    failures = {"left": 4}
+
+    async def call():
+        await asyncio.sleep(0.005)
+        if failures["left"] > 0:
+            failures["left"] -= 1
+            raise RuntimeError("429 Too Many Requests")
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(controller.run(call) for _ in range(8)))
+
+    assert asyncio.run(main()) == ["ok"] * 8
+    # The four concurrent 429s are one congestion signal: 8 -> 4, then additive increase
+    assert 4 <= controller.limit < 6
+
+
+def test_non_overload_errors_are_not_retried():
+    controller = AdaptiveConcurrencyController(initial=2)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(controller.run(call))
+    assert calls == 1
+    assert controller.limit == 2
@@ -0,0 +1,76 @@
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from benchmarks.compare import compare
+from benchmarks.corpus import field_pools, synthetic_meta
+from benchmarks.fake_openai_server import COMBINED_MARKER, FakeOpenAI, load_canned_records, serve
+
+
+@pytest.fixture(scope="module")
+def records():
+    return load_canned_records()
+
+
+def test_canned_records_have_metadata_and_facts(records):
+    assert records
+    for record in records:
+        assert record["metadata"]["case_title"]
+        assert "template_id" in record["facts"]
+
+
+def test_reply_routing_is_deterministic(records):
+    backend = FakeOpenAI(records, latency_ms=0, jitter_ms=0)
+    metadata_prompt = [{"role": "user", "content": "Extract metadata from: case text"}]
+    combined_prompt = [{"role": "user", "content": f"case text\n{COMBINED_MARKER}"}]
+
+    assert backend.reply_for(metadata_prompt) == backend.reply_for(metadata_prompt)
+    assert "case_title" in backend.reply_for(metadata_prompt)
+    assert set(backend.reply_for(combined_prompt)) == {"metadata", "facts"}
+
+
+def test_server_round_trip_and_injected_errors(records):
+    backend = FakeOpenAI(records, latency_ms=0, jitter_ms=0)
+    server = serve(backend)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    body = json.dumps({"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "case"}]}).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST")) as response:
+            payload = json.loads(response.read())
+        assert json.loads(payload["choices"][0]["message"]["content"])["case_title"]
+        assert payload["usage"]["total_tokens"] > 0
+
+        backend.error_rate = 1.0
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST"))
+        assert error.value.code == 429
+        assert backend.requests == 2
+    finally:
+        server.shutdown()
+
+
+def test_synthetic_meta_is_deterministic_and_unique(records):
+    pools = field_pools(records)
+    first = synthetic_meta(5, records, seed=1, pools=pools)
+
+    assert first == synthetic_meta(5, records, seed=1)
+    assert first["synthetic"] is True
+    assert first["file_hash"] != synthetic_meta(5 + len(records), records, seed=1, pools=pools)["file_hash"]
+    assert first["file_hash"] != synthetic_meta(5, records, seed=2, pools=pools)["file_hash"]
+
+
+def test_compare_flags_regressions():
+    old = {"scenarios": {"ingest": {"docs_per_sec": 10.0, "documents": 32}, "search": {"10000": {"vector_search_seconds": {"p99": 0.010}}}}}
+    new = {"scenarios": {"ingest": {"docs_per_sec": 8.0, "documents": 64}, "search": {"10000": {"vector_search_seconds": {"p99": 0.0105}}}}}
+
+    rows = {key: regressed for key, _, _, _, regressed in compare(old, new, threshold=0.1)}
+
+    assert rows == {"ingest.docs_per_sec": True, "search.10000.vector_search_seconds.p99": False}
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.chunking import chunk_sections, estimate_tokens, merge_partial_facts
+
+
+def test_small_sections_share_a_chunk_and_order_is_kept():
+    sections = [("Coram", "A" * 40), ("Facts", "B" * 40), ("Held", "C" * 40)]
+    chunks = chunk_sections(sections, max_tokens=30)
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith("## Coram") and "## Facts" in chunks[0]
+    assert chunks[1].startswith("## Held")
+
+
+def test_oversized_section_is_split_within_budget():
+    content = "\n\n".join(f"Paragraph {i} " + "x" * 200 for i in range(20))
+    chunks = chunk_sections([("Judgment", content)], max_tokens=150)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 150 for chunk in chunks)
+    assert "".join(chunks).count("Paragraph") == 20
+
+
+def test_merge_is_deterministic():
+    partials = [
+        {"tier_1": {"offense": "The accused stabbed the victim.", "weapon": None},
+         "witnesses": ["PW1", "PW2"], "age": 30},
+        {"tier_1": {"offense": "The victim died in hospital.", "weapon": "knife"},
+         "witnesses": ["PW2", "PW3"], "age": None},
+        {"tier_1": {"offense": "null"}, "residual": "Appeal dismissed."},
+    ]
+
+    merged = merge_partial_facts(partials)
+
+    assert merged == {
+        "tier_1": {"offense": "The accused stabbed the victim. The victim died in hospital.", "weapon": "knife"},
+        "witnesses": ["PW1", "PW2", "PW3"],
+        "age": 30,
+        "residual": "Appeal dismissed.",
+    }
+    assert merge_partial_facts(partials) == merged
+
+
+def test_merge_does_not_repeat_identical_strings():
+    merged = merge_partial_facts([{"court": "High Court of Delhi"}, {"court": "High Court of Delhi"}])
+    assert merged == {"court": "High Court of Delhi"}
@@ -0,0 +1,73 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure import duplicate_gate as gate_module  # noqa: E402
+from infrastructure.duplicate_gate import DuplicateGate  # noqa: E402
+
+
+class FakePool:
+    """Answers duplicate_gate_lookup from a dict and counts queried hashes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queried = []
+        self._last = []
+
+    def prepare(self, name, sql):
+        pass
+
+    @contextmanager
+    def cursor(self):
+        yield self
+
+    def execute_prepared(self, cursor, name, params):
+        hashes = params[0]
+        self.queried.extend(hashes)
+        self._last = [(h, self.rows[h]) for h in hashes if h in self.rows]
+
+    def fetchall(self):
+        return self._last
+
+
+def test_answers_are_cached_until_they_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(gate_module.time, "monotonic", lambda: now[0])
+    pool = FakePool({"a": "doc-a"})
+    gate = DuplicateGate(pool, ttl_seconds=10)
+
+    assert gate.prefetch(["a", "b"]) == {"a": "doc-a"}
+    assert gate.contains("a") and not gate.contains("b")
+    assert sorted(pool.queried) == ["a", "b"]
+
+    # Deleted and written by another process: seen once the TTL has passed
+    pool.rows = {"b": "doc-b"}
+    now[0] += 11
+    assert not gate.contains("a")
+    assert gate.lookup("b") == "doc-b"
+
+
+def test_refresh_and_invalidate_bypass_the_cache():
+    pool = FakePool({"a": "doc-a"})
+    gate = DuplicateGate(pool, ttl_seconds=60)
+    assert gate.contains("a")
+
+    pool.rows = {}
+    assert gate.contains("a")
+    assert gate.prefetch(["a"], refresh=True) == {}
+
+    gate.add("a", "doc-a")
+    gate.invalidate(["a"])
+    assert not gate.contains("a")
+
+
+def test_cache_size_is_bounded():
+    pool = FakePool({})
+    gate = DuplicateGate(pool, ttl_seconds=60, max_entries=3)
+    gate.prefetch(["a", "b", "c", "d", "e"])
+    gate.add("f", "doc-f")
+
+    assert len(gate._entries) == 3
+    assert gate.contains("f")
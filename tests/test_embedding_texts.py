@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+pytest.importorskip("haystack")
+
+from pipelines.haystack_custom_nodes import DualEmbedderNode  # noqa: E402
+
+
+def test_embedding_texts_use_only_stored_meta():
+    meta = {
+        "case_title": "State v. Ram",
+        "court_name": "High Court",
+        "sections_invoked": ["IPC 395", "IPC 397"],
+        "extracted_facts": {"tier_1": {"incident": "robbery at night", "weapons": ["knife"]}, "empty": None},
+    }
+
+    facts_text, metadata_text = DualEmbedderNode.embedding_texts(meta, "stored summary")
+
+    assert facts_text == "tier_1.incident: robbery at night | tier_1.weapons[0]: knife"
+    assert metadata_text == "State v. Ram High Court IPC 395 IPC 397"
+
+
+def test_embedding_texts_fall_back_to_content_without_facts():
+    facts_text, metadata_text = DualEmbedderNode.embedding_texts({"extracted_facts": None}, "stored summary")
+
+    assert facts_text == "stored summary"
+    assert metadata_text == ""
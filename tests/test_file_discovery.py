@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.models import ProcessingStatus
+from infrastructure.ingest_manifest import IngestManifest
+from scripts.ingest_daemon import IngestDaemon
+from utils.file_discovery import DirectoryScanner, iter_pdf_files
+
+
+def _touch(path: Path, content: bytes = b"%PDF-1.4", age_seconds: int = 60) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    old = path.stat().st_mtime - age_seconds
+    os.utime(path, (old, old))
+    return path
+
+
+def _age_directories(root: Path, age_seconds: int = 60) -> None:
+    for directory in [root, *[p for p in root.rglob("*") if p.is_dir()]]:
+        old = directory.stat().st_mtime - age_seconds
+        os.utime(directory, (old, old))
+
+
+def test_iter_pdf_files_is_recursive_and_skips_hidden(tmp_path):
+    _touch(tmp_path / "Cases" / "Dacoity" / "HC" / "a.pdf")
+    _touch(tmp_path / "Cases" / "Murder" / "b.PDF")
+    _touch(tmp_path / "Cases" / "notes.txt")
+    _touch(tmp_path / ".trash" / "c.pdf")
+
+    names = sorted(entry.path.name for entry in iter_pdf_files(tmp_path))
+
+    assert names == ["a.pdf", "b.PDF"]
+
+
+def test_scanner_only_lists_changed_directories(tmp_path):
+    _touch(tmp_path / "Dacoity" / "HC" / "a.pdf")
+    _touch(tmp_path / "Murder" / "b.pdf")
+    _age_directories(tmp_path)
+    scanner = DirectoryScanner([tmp_path])
+
+    assert len(list(scanner.scan())) == 2
+    assert list(scanner.scan()) == []
+
+    _touch(tmp_path / "Dacoity" / "HC" / "c.pdf")
+    assert sorted(entry.path.name for entry in scanner.scan()) == ["a.pdf", "c.pdf"]
+    assert len(list(scanner.scan(full=True))) == 3
+
+
+def test_manifest_delta(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite3"))
+
+    assert manifest.needs_ingest("a.pdf", 10, 100)
+    manifest.record("a.pdf", 10, 100, "h1", "completed")
+    assert not manifest.needs_ingest("a.pdf", 10, 100)
+    assert manifest.needs_ingest("a.pdf", 11, 100)
+    assert manifest.needs_ingest("a.pdf", 10, 200)
+
+    manifest.record("b.pdf", 5, 100, "h2", "failed")
+    assert not manifest.needs_ingest("b.pdf", 5, 100)
+    assert manifest.needs_ingest("b.pdf", 5, 100, retry_failed=True)
+    assert manifest.stats() == {"completed": 1, "failed": 1}
+
+
+class FlakyPipeline:
+    """Stores the first file of a batch, then fails the batch once."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def ingest_batch(self, paths, progress_callback=None, file_hashes=None):
+        self.batches.append(sorted(path.name for path in paths))
+        if len(self.batches) == 1:
+            first = sorted(paths)[0]
+            progress_callback(first, type("Result", (), {"status": ProcessingStatus.COMPLETED})())
+            raise ConnectionError("database went away")
+        for path in paths:
+            progress_callback(path, type("Result", (), {"status": ProcessingStatus.COMPLETED})())
+        return type("Batch", (), {"processed": len(paths), "skipped_duplicates": 0, "failed": 0})()
+
+
+def test_daemon_retries_files_of_a_failed_batch(tmp_path):
+    _touch(tmp_path / "cases" / "a.pdf", b"%PDF-1.4 a")
+    _touch(tmp_path / "cases" / "b.pdf", b"%PDF-1.4 b")
+    _age_directories(tmp_path)
+    pipeline = FlakyPipeline()
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite3"))
+    daemon = IngestDaemon(pipeline, manifest, [tmp_path / "cases"], settle_seconds=0)
+
+    try:
+        asyncio.run(daemon.poll_once())
+    except ConnectionError:
+        pass
+
+    # The recorded file is done; the other one is retried without a full rescan
+    assert asyncio.run(daemon.poll_once()) == 1
+    assert pipeline.batches == [["a.pdf", "b.pdf"], ["b.pdf"]]
+    assert manifest.stats() == {"completed": 2}
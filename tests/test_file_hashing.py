@@ -0,0 +1,25 @@
+import hashlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.helpers import compute_file_hash, hash_bytes, read_file_with_hash
+
+
+def test_single_read_hash_matches_file_hash(tmp_path):
+    path = tmp_path / "case.pdf"
+    path.write_bytes(b"%PDF-1.7\n" + bytes(range(256)) * 4096)
+
+    content, file_hash = read_file_with_hash(path)
+
+    assert content == path.read_bytes()
+    assert file_hash == compute_file_hash(path) == hash_bytes(content)
+    assert file_hash == hashlib.sha256(content).hexdigest()
+
+
+def test_empty_file_hash(tmp_path):
+    path = tmp_path / "empty.pdf"
+    path.write_bytes(b"")
+
+    assert compute_file_hash(path) == hashlib.sha256(b"").hexdigest()
@@ -0,0 +1,136 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+pytest.importorskip("haystack")
+
+from haystack import Document  # noqa: E402
+
+from core.models import IngestResult, ProcessingStatus  # noqa: E402
+from pipelines.haystack_custom_nodes import EmbeddedDocument  # noqa: E402
+from pipelines.ingestion_executor import IngestionExecutor  # noqa: E402
+
+
+def _result(status, document_id="", error=None):
+    return IngestResult(
+        case_id=document_id, document_id=document_id, status=status, metadata=None,
+        facts_summary="", embedding_facts=None, embedding_metadata=None, error_message=error
+    )
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.embed_batches = []
+        self.write_batches = []
+
+    def embed_documents(self, documents):
+        self.embed_batches.append(len(documents))
+        return [EmbeddedDocument(doc, [0.0], [0.0]) for doc in documents]
+
+    def store_documents(self, embedded):
+        self.write_batches.append(len(embedded))
+        return [item.document.id for item in embedded if item.document.meta.get("stored_elsewhere")]
+
+    def record_stage(self, embedded, stage):
+        pass
+
+
+class FakePipeline:
+    """Every file resumes with journaled text, so no PDF is parsed."""
+
+    def __init__(self):
+        self.dual_embedder = FakeEmbedder()
+        self.pdf_converter = type("Converter", (), {"config": {}})()
+
+    def resume_point(self, path, file_hash):
+        meta = {"file_hash": file_hash, "stored_elsewhere": path.name.startswith("raced")}
+        return Document(id=file_hash, content=path.name, meta=meta)
+
+    def extract_document(self, doc, file_hash):
+        if doc.content == "broken.pdf":
+            return self.failed_result(file_hash, "Fact extraction failed")
+        return doc
+
+    def failed_result(self, file_hash, error):
+        return _result(ProcessingStatus.FAILED, error=error)
+
+    def completed_result(self, doc, file_hash):
+        return _result(ProcessingStatus.COMPLETED, document_id=doc.id)
+
+    def load_duplicate_result(self, file_hash):
+        return _result(ProcessingStatus.SKIPPED_DUPLICATE, document_id="stored-" + file_hash)
+
+
+def test_every_file_finishes_and_embeddings_are_batched():
+    pipeline = FakePipeline()
+    executor = IngestionExecutor(pipeline, parse_workers=1, llm_workers=3, embed_batch_size=8,
+                                 write_batch_size=8, queue_size=2, batch_wait_seconds=0.05)
+    jobs = [(Path(f"case_{i}.pdf"), f"h{i}") for i in range(20)] + [(Path("broken.pdf"), "hx")]
+    results = {}
+
+    asyncio.run(executor.run(jobs, lambda path, result: results.__setitem__(path.name, result)))
+
+    assert len(results) == 21
+    assert results["broken.pdf"].status == ProcessingStatus.FAILED
+    assert sum(r.status == ProcessingStatus.COMPLETED for r in results.values()) == 20
+    assert sum(pipeline.dual_embedder.embed_batches) == 20
+    assert sum(pipeline.dual_embedder.write_batches) == 20
+    assert max(pipeline.dual_embedder.embed_batches) > 1
+    assert executor.queue_depths() == {}
+
+
+class BadRowEmbedder(FakeEmbedder):
+    """Rejects any write containing the document of case_3."""
+
+    def store_documents(self, embedded):
+        if any(item.document.id == "h3" for item in embedded):
+            raise ValueError("bad row")
+        return super().store_documents(embedded)
+
+
+def test_bad_row_fails_only_its_file():
+    pipeline = FakePipeline()
+    pipeline.dual_embedder = BadRowEmbedder()
+    executor = IngestionExecutor(pipeline, parse_workers=1, llm_workers=2, embed_batch_size=8,
+                                 write_batch_size=8, queue_size=2, batch_wait_seconds=0.05)
+    jobs = [(Path(f"case_{i}.pdf"), f"h{i}") for i in range(10)]
+    results = {}
+
+    asyncio.run(executor.run(jobs, lambda path, result: results.__setitem__(path.name, result)))
+
+    assert results["case_3.pdf"].status == ProcessingStatus.FAILED
+    assert sum(r.status == ProcessingStatus.COMPLETED for r in results.values()) == 9
+
+
+def test_failing_callback_does_not_stall_the_batch():
+    pipeline = FakePipeline()
+    executor = IngestionExecutor(pipeline, parse_workers=1, llm_workers=2, embed_batch_size=4,
+                                 write_batch_size=4, queue_size=1, batch_wait_seconds=0.01)
+    jobs = [(Path(f"case_{i}.pdf"), f"h{i}") for i in range(12)] + [(Path("broken.pdf"), "hx")]
+    seen = []
+
+    def on_result(path, result):
+        seen.append(path.name)
+        raise RuntimeError("callback failed")
+
+    asyncio.run(asyncio.wait_for(executor.run(jobs, on_result), timeout=10))
+
+    assert len(seen) == 13
+
+
+def test_file_stored_concurrently_is_a_duplicate():
+    pipeline = FakePipeline()
+    executor = IngestionExecutor(pipeline, parse_workers=1, llm_workers=2, embed_batch_size=4,
+                                 write_batch_size=4, queue_size=2, batch_wait_seconds=0.05)
+    jobs = [(Path("case_0.pdf"), "h0"), (Path("raced.pdf"), "h1")]
+    results = {}
+
+    asyncio.run(executor.run(jobs, lambda path, result: results.__setitem__(path.name, result)))
+
+    assert results["case_0.pdf"].status == ProcessingStatus.COMPLETED
+    assert results["raced.pdf"].status == ProcessingStatus.SKIPPED_DUPLICATE
+    assert results["raced.pdf"].document_id == "stored-h1"
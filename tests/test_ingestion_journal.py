@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure.ingestion_journal import IngestionJournal
+
+
+def test_stages_and_artifacts_survive_reopen(tmp_path):
+    path = tmp_path / "journal.sqlite3"
+    journal = IngestionJournal(str(path))
+    journal.record("h1", "hashed", file_path="cases/a.pdf")
+    journal.record("h1", "text_extracted", artifact={"content": "judgment text"})
+    journal.record("h1", "metadata", artifact={"meta": {"case_title": "State v. Ram"}})
+    journal.close()
+
+    reopened = IngestionJournal(str(path))
+    assert reopened.stage("h1") == "metadata"
+    assert reopened.reached("h1", "text_extracted")
+    assert not reopened.reached("h1", "facts")
+    assert reopened.artifact("h1", "text_extracted") == {"content": "judgment text"}
+    assert reopened.artifact("h1", "metadata")["meta"]["case_title"] == "State v. Ram"
+    assert [entry.file_path for entry in reopened.pending()] == ["cases/a.pdf"]
+    reopened.close()
+
+
+def test_stage_never_moves_backwards(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.sqlite3"))
+    journal.record("h1", "facts", file_path="cases/a.pdf")
+    journal.record("h1", "metadata", artifact={"meta": {}})
+
+    assert journal.stage("h1") == "facts"
+    assert journal.artifact("h1", "metadata") is None
+
+
+def test_stored_drops_artifacts_and_clears_pending(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.sqlite3"))
+    journal.record("h1", "embedded", artifact={"facts_embedding": [0.1]}, file_path="cases/a.pdf")
+    journal.record_error("h1", "connection reset")
+    assert journal.pending(include_failed=True)[0].error == "connection reset"
+
+    journal.record("h1", "stored")
+
+    assert journal.artifact("h1", "embedded") is None
+    assert journal.pending() == []
+    assert journal.stats()["stored"] == 1
+
+
+def test_new_entry_requires_path_and_known_stage(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.sqlite3"))
+
+    with pytest.raises(ValueError):
+        journal.record("h1", "hashed")
+    with pytest.raises(ValueError):
+        journal.record("h1", "parsed", file_path="cases/a.pdf")
+
+
+def test_failed_files_are_not_pending_until_retried(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.sqlite3"))
+    journal.record("h1", "text_extracted", file_path="cases/a.pdf")
+    journal.record("h2", "hashed", file_path="cases/b.pdf")
+    journal.record_error("h1", "Fact extraction failed")
+
+    assert [entry.file_hash for entry in journal.pending()] == ["h2"]
+    assert {entry.file_hash for entry in journal.pending(include_failed=True)} == {"h1", "h2"}
+
+    # Ingested again: the next completed stage clears the error
+    journal.record("h1", "metadata", artifact={"meta": {}})
+    assert {entry.file_hash for entry in journal.pending()} == {"h1", "h2"}
+
+
+def test_forgotten_files_are_not_pending(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.sqlite3"))
+    journal.record("h1", "hashed", file_path="cases/a.pdf")
+    journal.forget("h1")
+
+    assert journal.pending() == []
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure.llm_cache import LLMResponseCache
+
+
+def test_key_depends_on_every_input():
+    base = dict(text="facts", prompt_version="v1", model="gpt-4o", template_id="t1",
+                generation_kwargs={"temperature": 0.5})
+    key = LLMResponseCache.make_key(**base)
+
+    assert key == LLMResponseCache.make_key(**base)
+    for field, value in [("text", "other"), ("prompt_version", "v2"), ("model", "gpt-4o-mini"),
+                         ("template_id", "t2"), ("generation_kwargs", {"temperature": 0.0})]:
+        assert LLMResponseCache.make_key(**{**base, field: value}) != key
+
+
+def test_get_put_roundtrip_and_persistence(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(str(path))
+    key = LLMResponseCache.make_key("doc", "v1", "gpt-4o")
+
+    assert cache.get(key) is None
+    cache.put(key, '{"a": 1}')
+    assert cache.get(key) == '{"a": 1}'
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+    reopened = LLMResponseCache(str(path))
+    assert reopened.get(key) == '{"a": 1}'
+    assert reopened.stats()["bytes"] == len('{"a": 1}')
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=250)
+    keys = [LLMResponseCache.make_key(str(i), "v1", "m") for i in range(3)]
+
+    cache.put(keys[0], "a" * 100)
+    cache.put(keys[1], "b" * 100)
+    cache.get(keys[0])  # keys[1] is now least recently used
+    cache.put(keys[2], "c" * 100)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a" * 100
+    assert cache.get(keys[2]) == "c" * 100
+    assert cache.stats()["bytes"] <= 250
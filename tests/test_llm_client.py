@@ -0,0 +1,65 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure.llm_client import TokenBucket, backoff_delay, retry_after_seconds
+
+
+def test_bucket_allows_burst_then_waits_for_refill():
+    bucket = TokenBucket(per_minute=600)  # 10 tokens/second
+
+    async def scenario():
+        start = time.monotonic()
+        await bucket.acquire(600)
+        burst = time.monotonic() - start
+        await bucket.acquire(2)
+        return burst, time.monotonic() - start
+
+    burst, total = asyncio.run(scenario())
+    assert burst < 0.05
+    assert 0.15 <= total < 1.0
+
+
+def test_bucket_adjust_refunds_over_estimate():
+    bucket = TokenBucket(per_minute=60)
+
+    async def scenario():
+        await bucket.acquire(60)
+        bucket.adjust(30)
+        start = time.monotonic()
+        await bucket.acquire(30)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.05
+
+
+def test_pause_blocks_callers():
+    bucket = TokenBucket(per_minute=6000)
+
+    async def scenario():
+        bucket.pause(0.2)
+        start = time.monotonic()
+        await bucket.acquire(1)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.19
+
+
+def test_retry_after_headers():
+    def error(headers):
+        return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+    assert retry_after_seconds(error({"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(error({})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(10, base=1.0, cap=5.0) for _ in range(50)]
+    assert all(0 <= d <= 5.0 for d in delays)
+    assert len(set(delays)) > 1
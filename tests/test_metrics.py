@@ -0,0 +1,85 @@
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure.metrics import Histogram, MetricsRegistry, serve_metrics
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.observe(value / 1000)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 100
+    assert summary["p50"] == pytest.approx(0.050)
+    assert summary["p95"] == pytest.approx(0.095)
+    assert summary["p99"] == pytest.approx(0.099)
+    assert summary["max"] == pytest.approx(0.100)
+
+
+def test_histogram_percentiles_follow_recent_window():
+    histogram = Histogram(window=10)
+    for _ in range(100):
+        histogram.observe(5.0)
+    for _ in range(10):
+        histogram.observe(1.0)
+
+    assert histogram.count == 110
+    assert histogram.percentile(99) == 1.0
+
+
+def test_snapshot_and_prometheus_export(registry):
+    with registry.timer("component_seconds", component="fact_extractor"):
+        pass
+    registry.inc("llm_tokens_total", 120, model="gpt-4o-mini", kind="prompt")
+    registry.inc("llm_tokens_total", 30, model="gpt-4o-mini", kind="prompt")
+    registry.register_collector("ingest_queue_depth", "stage", lambda: {"parse": 3, "write": 0})
+
+    try:
+        snapshot = registry.snapshot()
+        text = registry.to_prometheus()
+    finally:
+        registry.unregister_collector("ingest_queue_depth")
+
+    assert snapshot["histograms"][0]["labels"] == {"component": "fact_extractor"}
+    assert snapshot["counters"][0]["value"] == 150
+    assert {"name": "ingest_queue_depth", "labels": {"stage": "parse"}, "value": 3.0} in snapshot["gauges"]
+
+    assert "# TYPE casemind_component_seconds summary" in text
+    assert 'casemind_component_seconds{component="fact_extractor",quantile="0.95"}' in text
+    assert 'casemind_component_seconds_count{component="fact_extractor"} 1' in text
+    assert 'casemind_llm_tokens_total{kind="prompt",model="gpt-4o-mini"} 150.0' in text
+    assert 'casemind_ingest_queue_depth{stage="parse"} 3.0' in text
+
+
+def test_metrics_endpoint(registry):
+    registry.observe("db_query_seconds", 0.002, statement="facts_embedding_search")
+    server = serve_metrics(0)
+    port = server.server_address[1]
+
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            text = response.read().decode("utf-8")
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+            snapshot = json.loads(response.read().decode("utf-8"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'casemind_db_query_seconds_count{statement="facts_embedding_search"} 1' in text
+    assert snapshot["histograms"][0]["name"] == "db_query_seconds"
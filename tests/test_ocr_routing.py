@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "raw_code"))
+
+from ocr_routing import OCRPageCache, has_usable_text_layer, page_content_hash, text_layer_stats
+
+
+def test_text_layer_probe():
+    judgment = "IN THE HIGH COURT OF JUDICATURE AT BOMBAY. The appellant was convicted under Section 302. " * 3
+
+    assert has_usable_text_layer(judgment)
+    # Scanned page: no text layer, or only a stamp/page number
+    assert not has_usable_text_layer("")
+    assert not has_usable_text_layer("  12  \n")
+    # Broken font mapping: mostly replacement and private-use glyphs
+    broken = "\ufffd\ue001\ue002 ab " * 40
+    chars, garbage_ratio = text_layer_stats(broken)
+    assert chars == 200 and garbage_ratio == 0.6
+    assert not has_usable_text_layer(broken)
+
+
+def test_page_hash_depends_on_content():
+    assert page_content_hash([b"ab", b"c"]) == page_content_hash([b"ab", b"c"])
+    assert page_content_hash([b"ab", b"c"]) != page_content_hash([b"a", b"bc"])
+
+
+def test_ocr_cache_round_trip(tmp_path):
+    cache = OCRPageCache(str(tmp_path / "ocr.sqlite3"))
+    key = OCRPageCache.make_key("pagehash", "gemini", "gemini-2.5-flash", "1")
+
+    assert cache.get(key) is None
+    cache.put(key, "## Order sheet", strategy="gemini")
+    assert cache.get(key) == "## Order sheet"
+    assert key != OCRPageCache.make_key("pagehash", "gemini", "gemini-2.5-pro", "1")
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    reopened = OCRPageCache(str(tmp_path / "ocr.sqlite3"))
+    assert reopened.get(key) == "## Order sheet"
+    reopened.close()
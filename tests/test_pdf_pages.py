@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.pdf_pages import iter_page_texts, page_ranges
+
+
+def test_page_ranges_cover_every_page_once():
+    ranges = page_ranges(70, pages_per_range=16)
+
+    assert ranges[0] == (0, 16)
+    assert ranges[-1] == (64, 70)
+    assert [page for start, stop in ranges for page in range(start, stop)] == list(range(70))
+    assert page_ranges(0) == []
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "long.pdf"
+    doc = fitz.open()
+    for number in range(40):
+        doc.new_page().insert_text((72, 72), f"Page body {number}")
+    doc.save(str(pdf_path))
+    doc.close()
+
+    serial = list(iter_page_texts(str(pdf_path), workers=1))
+    parallel = list(iter_page_texts(str(pdf_path), workers=2, min_pages=10))
+
+    assert parallel == serial
+    assert "Page body 39" in parallel[-1]
+    assert list(iter_page_texts(str(pdf_path), clean=str.upper))[0].strip() == "PAGE BODY 0"
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.prompt_compression import PromptCompressor
+
+
+def _judgment(pages: int = 5) -> str:
+    parts = []
+    for page in range(1, pages + 1):
+        parts.append(f"--- Page {page} ---")
+        parts.append("IN THE HIGH COURT OF DELHI AT NEW DELHI")
+        parts.append(f"Crl.A. 123/2020 Page {page} of {pages}")
+        parts.append(f"Paragraph {page}: " + " ".join(["evidence"] * page) + ".")
+        parts.append("Signature Not Verified")
+    return "\n".join(parts)
+
+
+def test_page_markers_headers_and_boilerplate_are_stripped():
+    result = PromptCompressor().compress(_judgment())
+
+    assert "--- Page" not in result.text
+    assert "HIGH COURT OF DELHI" not in result.text
+    assert "Signature Not Verified" not in result.text
+    assert all(f"Paragraph {page}:" in result.text for page in range(1, 6))
+    assert result.tokens_after < result.tokens_before
+    assert 0 < result.reduction < 1
+
+
+def test_short_documents_keep_repeated_lines():
+    text = "--- Page 1 ---\nSTATE v. RAM\nFirst page\n--- Page 2 ---\nSTATE v. RAM\nSecond page"
+
+    assert "STATE v. RAM" in PromptCompressor(min_pages=3).strip_page_furniture(text)
+
+
+def test_front_matter_keeps_later_citations():
+    head = "Appellant: Ram\nRespondent: State\n\n" + "Narrative of the case. " * 20
+    tail = "\n\n".join([
+        "The witness turned hostile.",
+        "The appellant was convicted under Section 302 IPC.",
+        "The appeal is dismissed."
+    ])
+    compressor = PromptCompressor(front_matter_chars=len(head) + 5)
+
+    front = compressor.front_matter(head + "\n\n" + "Filler text. " * 50 + "\n\n" + tail)
+
+    assert front.startswith("Appellant: Ram")
+    assert "Section 302 IPC" in front
+    assert "turned hostile" not in front
+    assert "appeal is dismissed" not in front
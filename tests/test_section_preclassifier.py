@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+pytest.importorskip("haystack")
+
+from pipelines.haystack_custom_nodes import SectionPreClassifierNode  # noqa: E402
+
+TEMPLATES = {"ipc_302": {}, "ipc_304_p2": {}, "ipc_376": {}, "ipc_316": {}, "legal_case": {}}
+
+
+def test_find_sections_handles_common_citation_styles():
+    text = (
+        "charged under Sections 302/34 IPC and u/s 201 I.P.C. "
+        "Section 376(2)(n) and 506 of the Indian Penal Code; IPC 354A"
+    )
+    sections = SectionPreClassifierNode.find_sections(text)
+    assert sections == ["IPC 302", "IPC 34", "IPC 201", "IPC 376", "IPC 506", "IPC 354A"]
+
+
+def test_confident_when_one_template_dominates():
+    classifier = SectionPreClassifierNode(TEMPLATES)
+    text = "Appeal against conviction under Section 302 IPC. " * 3 + "Section 34 IPC was also invoked."
+    result = classifier.classify(text)
+    assert result["template_id"] == "ipc_302"
+    assert result["confidence"] == 1.0
+
+
+def test_ambiguous_documents_are_not_preclassified():
+    classifier = SectionPreClassifierNode(TEMPLATES)
+    from haystack import Document
+
+    doc = Document(content="Convicted under Section 302 IPC, altered to Section 304 IPC. " * 2)
+    classifier.run(documents=[doc])
+    assert "preclassified_template_id" not in doc.meta
+
+
+def test_ontology_section_map_extends_mappings():
+    classifier = SectionPreClassifierNode(TEMPLATES, section_to_node_map={"IPC 316": ["ipc_316"]})
+    result = classifier.classify("Section 316 IPC. Section 316 IPC.")
+    assert result["template_id"] == "ipc_316"
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from infrastructure.database import parse_vector_literal, to_vector_literal
+
+
+def test_round_trip():
+    values = [0.25, -1.5, 3e-05, 0.0]
+    assert parse_vector_literal(to_vector_literal(values)) == values
+
+
+def test_parses_pgvector_text_output():
+    assert parse_vector_literal("[0.1,-0.2,0.3]") == [0.1, -0.2, 0.3]
+
+
+def test_missing_vector():
+    assert parse_vector_literal(None) is None
+    assert parse_vector_literal("") is None